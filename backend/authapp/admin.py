@@ -1,3 +1,11 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import RevokedToken
+
+
+@admin.register(RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    """Admin interface for revoked token families"""
+    
+    list_display = ['family', 'user', 'expires_at', 'created_at']
+    search_fields = ['family', 'user__username']
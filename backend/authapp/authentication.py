@@ -0,0 +1,42 @@
+from rest_framework import authentication, exceptions, status
+
+from .tokens import TokenError, user_from_access_token
+
+
+class InvalidToken(exceptions.APIException):
+    """
+    401 for a bad Bearer token. AuthenticationFailed would be turned into a
+    403 because SessionAuthentication, listed first, sends no challenge.
+    """
+    status_code = status.HTTP_401_UNAUTHORIZED
+    default_detail = 'Token is invalid.'
+    default_code = 'token_not_valid'
+
+
+class SignedTokenAuthentication(authentication.BaseAuthentication):
+    """
+    ``Authorization: Bearer <access token>`` authentication for scripted and
+    mobile clients (see authapp/tokens.py).
+    
+    The user is rebuilt from the signed token, so authenticating needs no
+    session, CSRF token or database query. Requests without a Bearer header
+    fall through to the other authentication classes.
+    """
+    
+    keyword = 'Bearer'
+    
+    def authenticate(self, request):
+        header = authentication.get_authorization_header(request).split()
+        if not header or header[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(header) != 2:
+            raise InvalidToken('Invalid Authorization header.')
+        
+        try:
+            user = user_from_access_token(header[1].decode())
+        except (TokenError, UnicodeError) as exc:
+            raise InvalidToken(str(exc))
+        return user, None
+    
+    def authenticate_header(self, request):
+        return self.keyword
@@ -1,3 +1,31 @@
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+
+class RevokedToken(models.Model):
+    """
+    A revoked token family (see authapp/tokens.py).
+    
+    Rows are kept until every token of the family would have expired anyway.
+    Refreshes check them here; access-token checks read the cache they are
+    mirrored into.
+    """
+    
+    family = models.CharField(max_length=32, unique=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='revoked_tokens',
+    )
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'authapp_revoked_token'
+        verbose_name = 'Revoked token'
+        verbose_name_plural = 'Revoked tokens'
+    
+    def __str__(self):
+        return f"{self.family} (until {self.expires_at:%Y-%m-%d %H:%M})"
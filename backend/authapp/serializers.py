@@ -38,3 +38,8 @@ class LoginSerializer(serializers.Serializer):
             return attrs
         else:
             raise serializers.ValidationError('Must include "username" and "password".')
+
+
+class RefreshTokenSerializer(serializers.Serializer):
+    """Serializer for token refresh and revoke requests"""
+    refresh = serializers.CharField(required=True)
@@ -0,0 +1,16 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .tokens import revoke_user_access_tokens
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def revoke_access_tokens(sender, instance, update_fields=None, **kwargs):
+    """Access tokens carry the role, so any user change must retire them."""
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    revoke_user_access_tokens(instance.pk)
@@ -1,7 +1,23 @@
-from django.test import TestCase
+import time
+from unittest import mock
+from asgiref.sync import iscoroutinefunction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
 from django.contrib.auth import get_user_model
+from django.http import JsonResponse
+from django.urls import path
 from rest_framework.test import APIClient
 from rest_framework import status
+from core.testing import QueryBudgetMixin
+from tasks.models import Task
+from tasks.serializers import TaskFastReadSerializer
+from . import views
+from .tokens import TokenError, refresh_access_token, user_from_access_token
 
 User = get_user_model()
 
@@ -144,3 +160,356 @@ class LogoutViewTests(TestCase):
         # Verify session was destroyed by checking /auth/me/
         me_response = self.client.get('/api/auth/me/')
         self.assertEqual(me_response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class SlidingSessionTests(TestCase):
+    """Tests for SlidingSessionMiddleware"""
+
+    def setUp(self):
+        self.client = APIClient()
+        User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+        response = self.client.post(
+            '/api/auth/login/',
+            {'username': 'testuser', 'password': 'testpass123'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.session = Session.objects.get()
+
+    def test_login_expiry_covers_cookie_age(self):
+        """Test that a fresh session lives at least SESSION_COOKIE_AGE"""
+        remaining = (self.session.expire_date.timestamp() - time.time())
+        self.assertGreaterEqual(remaining, settings.SESSION_COOKIE_AGE - 5)
+
+    def test_requests_within_refresh_interval_do_not_write_session(self):
+        """Test that ordinary requests neither update the session nor re-send the cookie"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/auth/me/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+        writes = [q['sql'] for q in queries.captured_queries if not q['sql'].startswith('SELECT')]
+        self.assertEqual(writes, [])
+
+    def test_session_is_refreshed_after_interval(self):
+        """Test that the session is re-saved once the refresh interval has passed"""
+        interval = settings.SESSION_COOKIE_AGE * settings.SESSION_REFRESH_FRACTION
+        later = time.time() + interval + 1
+        with mock.patch('core.middleware.time.time', return_value=later):
+            response = self.client.get('/api/auth/me/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(settings.SESSION_COOKIE_NAME, response.cookies)
+        session = Session.objects.get()
+        self.assertGreater(session.expire_date, self.session.expire_date)
+        self.assertIn('_session_refreshed_at', session.get_decoded())
+
+
+class SignedTokenTests(TestCase):
+    """Tests for signed access/refresh tokens"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient(enforce_csrf_checks=True)
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            role=User.Role.MANAGER,
+            email='test@example.com',
+        )
+
+    def _tokens(self):
+        response = self.client.post(
+            '/api/auth/token/',
+            {'username': 'testuser', 'password': 'testpass123'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def _bearer(self, access):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def test_access_token_authenticates_without_database(self):
+        """Test that API calls with an access token run no auth queries"""
+        tokens = self._tokens()
+        self.assertEqual(tokens['token_type'], 'Bearer')
+        self._bearer(tokens['access'])
+        self.client.get('/api/auth/me/')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/auth/me/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user']['username'], 'testuser')
+        self.assertEqual(response.data['user']['role'], User.Role.MANAGER)
+        self.assertEqual(len(queries.captured_queries), 0)
+
+    def test_token_writes_skip_csrf(self):
+        """Test that token-authenticated writes need no CSRF token"""
+        self._bearer(self._tokens()['access'])
+        response = self.client.post('/api/tasks/', {'title': 'From script'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_invalid_and_expired_tokens_are_rejected(self):
+        """Test that tampered and expired access tokens return 401"""
+        access = self._tokens()['access']
+        self._bearer(access[:-2] + 'xx')
+        self.assertEqual(self.client.get('/api/tasks/').status_code, status.HTTP_401_UNAUTHORIZED)
+        self._bearer(access)
+        with mock.patch('django.core.signing.time.time', return_value=time.time() + 3600):
+            response = self.client.get('/api/tasks/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_issues_new_access_token(self):
+        """Test that a refresh token yields a working access token"""
+        tokens = self._tokens()
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self._bearer(response.data['access'])
+        self.assertEqual(self.client.get('/api/tasks/').status_code, status.HTTP_200_OK)
+
+    def test_revoke_rejects_family(self):
+        """Test that revoking a refresh token also rejects its access tokens"""
+        tokens = self._tokens()
+        response = self.client.post('/api/auth/token/revoke/', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self._bearer(tokens['access'])
+        self.assertEqual(self.client.get('/api/tasks/').status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials()
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocations_survive_cache_loss(self):
+        """Test that revocations are reloaded from the database after a cache flush"""
+        tokens = self._tokens()
+        self.client.post('/api/auth/token/revoke/', {'refresh': tokens['refresh']}, format='json')
+        cache.clear()
+        self._bearer(tokens['access'])
+        self.assertEqual(self.client.get('/api/tasks/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(AUTH_TOKEN_REVOCATION_RELOAD=5)
+    def test_revocations_reach_processes_with_their_own_cache(self):
+        """Test that a worker with a separate LocMem cache sees revocations and user changes made by another"""
+        other_worker = LocMemCache('other-worker', {})
+        revoked, changed = self._tokens(), self._tokens()
+        with mock.patch('authapp.tokens.cache', other_worker):
+            # Loads the revocations into the other worker's cache
+            self.assertEqual(user_from_access_token(revoked['access']).pk, self.user.pk)
+        
+        self.client.post('/api/auth/token/revoke/', {'refresh': revoked['refresh']}, format='json')
+        self.user.role = User.Role.MEMBER
+        self.user.save()
+        
+        with mock.patch('authapp.tokens.cache', other_worker):
+            # Refreshes are checked against the database at once
+            with self.assertRaises(TokenError):
+                refresh_access_token(revoked['refresh'])
+            # Access tokens once the other worker's revocations are due for a reload
+            with mock.patch('time.time', return_value=time.time() + 6):
+                with self.assertRaises(TokenError):
+                    user_from_access_token(revoked['access'])
+                with self.assertRaises(TokenError):
+                    user_from_access_token(changed['access'])
+    
+    def test_role_change_and_password_change_retire_tokens(self):
+        """Test that user changes reject old access tokens and password changes old refresh tokens"""
+        tokens = self._tokens()
+        self.user.role = User.Role.MEMBER
+        self.user.save()
+        self._bearer(tokens['access'])
+        self.assertEqual(self.client.get('/api/tasks/').status_code, status.HTTP_401_UNAUTHORIZED)
+        
+        self.user.set_password('newpass456')
+        self.user.save()
+        self.client.credentials()
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_session_flow_still_works(self):
+        """Test that cookie session login is unaffected"""
+        response = self.client.post(
+            '/api/auth/login/',
+            {'username': 'testuser', 'password': 'testpass123'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get('/api/auth/me/').status_code, status.HTTP_200_OK)
+
+
+def list_usernames_one_by_one(request):
+    """A query per user, as an N+1 pattern would do"""
+    pks = User.objects.values_list('pk', flat=True)
+    return JsonResponse({'usernames': [User.objects.get(pk=pk).username for pk in pks]})
+
+
+urlpatterns = [
+    path('api/auth/me/', views.AsyncMeView.as_view()),
+    path('api/usernames/', list_usernames_one_by_one),
+]
+
+
+@override_settings(ROOT_URLCONF='authapp.tests')
+class AsyncMeViewTests(TestCase):
+    """Tests for AsyncMeView served through the async request path"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+
+    def test_view_is_coroutine(self):
+        """Test that AsyncMeView is dispatched as a coroutine view"""
+        self.assertTrue(iscoroutinefunction(views.AsyncMeView.as_view()))
+
+    async def test_me_with_session(self):
+        """Test that the session user is returned through the async middleware chain"""
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get('/api/auth/me/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['user']['username'], 'testuser')
+
+    async def test_me_unauthenticated(self):
+        """Test that anonymous requests get 401"""
+        response = await self.async_client.get('/api/auth/me/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_session_refreshed_after_interval(self):
+        """Test that SlidingSessionMiddleware also refreshes sessions on the async path"""
+        await self.async_client.aforce_login(self.user)
+        interval = settings.SESSION_COOKIE_AGE * settings.SESSION_REFRESH_FRACTION
+        later = time.time() + interval + 1
+        with mock.patch('core.middleware.time.time', return_value=later):
+            response = await self.async_client.get('/api/auth/me/')
+        self.assertIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+
+@override_settings(ROOT_URLCONF='authapp.tests', REQUEST_TIMING=True, REQUEST_TIMING_REPEATED_QUERIES=3)
+class RequestTimingMiddlewareTests(TestCase):
+    """Tests for RequestTimingMiddleware"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+
+    def parse_server_timing(self, response):
+        metrics = {}
+        for entry in response['Server-Timing'].split(', '):
+            name, *params = entry.split(';')
+            metrics[name] = dict(param.split('=', 1) for param in params)
+        return metrics
+
+    def test_disabled_by_default(self):
+        """Test that the middleware leaves the stack when REQUEST_TIMING is off"""
+        with override_settings(REQUEST_TIMING=False):
+            response = self.client.get('/api/auth/me/')
+        self.assertNotIn('Server-Timing', response)
+
+    def test_server_timing_header(self):
+        """Test that SQL, view, render, middleware and total times are reported"""
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as queries, self.assertLogs('core.timing', 'INFO') as logs:
+            response = self.client.get('/api/auth/me/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        metrics = self.parse_server_timing(response)
+        self.assertEqual(list(metrics), ['db', 'view', 'serialize', 'render', 'middleware', 'total'])
+        self.assertEqual(metrics['db']['desc'], f'"{len(queries)} queries"')
+        self.assertGreaterEqual(float(metrics['total']['dur']), float(metrics['view']['dur']))
+
+        record = logs.records[0]
+        self.assertEqual((record.method, record.path, record.status), ('GET', '/api/auth/me/', 200))
+        self.assertEqual(record.queries, len(queries))
+        self.assertIn('db_ms', record.__dict__)
+
+    @override_settings(ROOT_URLCONF='core.urls')
+    def test_serialization_is_reported_apart_from_the_view(self):
+        """Test that time spent producing serializer data is a serialize entry, not part of view"""
+        Task.objects.create(title='Timed', assignee=self.user)
+        representation = TaskFastReadSerializer.to_representation
+
+        def slow_representation(row, tz=None):
+            time.sleep(0.05)
+            return representation(row, tz)
+
+        self.client.force_login(self.user)
+        with mock.patch.object(TaskFastReadSerializer, 'to_representation', staticmethod(slow_representation)), \
+                self.assertLogs('core.timing', 'INFO') as logs:
+            response = self.client.get('/api/tasks/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        metrics = {name: float(params['dur']) for name, params in self.parse_server_timing(response).items()}
+        self.assertGreaterEqual(metrics['serialize'], 50)
+        self.assertLess(metrics['view'], metrics['serialize'])
+        self.assertAlmostEqual(
+            metrics['view'] + metrics['serialize'] + metrics['render'] + metrics['middleware'], metrics['total'],
+            delta=0.1,
+        )
+        self.assertEqual(logs.records[0].serialize_ms, metrics['serialize'])
+
+    def test_warns_about_repeated_queries(self):
+        """Test that a statement run once per row is logged as a likely N+1"""
+        for i in range(3):
+            User.objects.create_user(username=f'user{i}', password='testpass123')
+        with self.assertLogs('core.timing', 'WARNING') as logs:
+            self.client.get('/api/usernames/')
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(logs.records[0].repeated, 4)
+        self.assertIn('users_user', logs.records[0].sql)
+
+    def test_no_warning_without_repeats(self):
+        """Test that ordinary requests only log their timing"""
+        with self.assertLogs('core.timing', 'INFO') as logs:
+            self.client.get('/api/auth/me/')
+        self.assertEqual([record.levelname for record in logs.records], ['INFO'])
+
+    async def test_async_path(self):
+        """Test that queries run by async views in worker threads are counted"""
+        await self.async_client.aforce_login(self.user)
+        with self.assertLogs('core.timing', 'INFO') as logs:
+            response = await self.async_client.get('/api/auth/me/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('view', self.parse_server_timing(response))
+        self.assertGreater(logs.records[0].queries, 0)
+
+
+@override_settings(AUTH_USER_CACHE=False)
+class AuthQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Query budgets for the auth endpoints with real session and token authentication"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.users = {
+            role: User.objects.create_user(username=role.lower(), password='testpass123', role=role)
+            for role in User.Role.values
+        }
+        self.seeded = 0
+
+    def seed(self, count):
+        User.objects.bulk_create([User(username=f'user{self.seeded + i}', password='!') for i in range(count)])
+        self.seeded += count
+
+    def test_me_with_session(self):
+        """Test auth/me for every role when logged in with a session"""
+        for role, user in self.users.items():
+            with self.subTest(role=role):
+                self.client.force_login(user)
+                self.assertQueryBudget(2, lambda: self.client.get('/api/auth/me/'), self.seed)
+
+    def test_me_with_token(self):
+        """Test auth/me with a Bearer token"""
+        tokens = self.client.post('/api/auth/token/', {'username': 'member', 'password': 'testpass123'}, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens.data['access']}")
+        # Access tokens carry the user
+        self.assertQueryBudget(0, lambda: self.client.get('/api/auth/me/'), self.seed)
+
+    def test_login_and_token(self):
+        """Test signing in with a session and exchanging credentials for tokens"""
+        credentials = {'username': 'manager', 'password': 'testpass123'}
+        self.assertQueryBudget(10, lambda: self.client.post('/api/auth/login/', credentials, format='json'), self.seed)
+        self.assertQueryBudget(2, lambda: self.client.post('/api/auth/token/', credentials, format='json'), self.seed)
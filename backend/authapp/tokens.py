@@ -0,0 +1,196 @@
+"""
+Stateless signed access and refresh tokens.
+
+Tokens are ``django.core.signing`` payloads (HMAC-SHA256 with SECRET_KEY,
+timestamped), so verifying an access token needs no database access:
+
+- access tokens (``AUTH_ACCESS_TOKEN_LIFETIME``, default 5 minutes) carry the
+  user's id, username, email and role;
+- refresh tokens (``AUTH_REFRESH_TOKEN_LIFETIME``, default 7 days) carry the
+  user id and a password fingerprint, and are checked against the database
+  when exchanged for a new access token.
+
+Every refresh token starts a token family; access tokens carry the family id.
+Revoking a family (RevokedToken) rejects its refresh token and every access
+token issued from it. Saving a user also rejects that user's access tokens
+issued before the save, so role changes and deactivation apply immediately.
+
+Refreshing checks revocations in the database. Access-token checks read the
+cache, which each process reloads from the database every
+``AUTH_TOKEN_REVOCATION_RELOAD`` seconds: revoked families from RevokedToken,
+and per-user cutoffs from ``users.updated_at``. With a shared cache, writes
+are seen by every process at once; with a per-process cache (LocMem), other
+processes see them within that interval. Deleting a user is only recorded in
+the cache, so without a shared cache the user's access tokens may keep
+working in other processes until they expire.
+"""
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+from .models import RevokedToken
+
+ACCESS_SALT = 'authapp.tokens.access'
+REFRESH_SALT = 'authapp.tokens.refresh'
+
+REVOKED_KEY = 'auth-token-revoked:{}'
+NOT_BEFORE_KEY = 'auth-token-not-before:{}'
+# Present while the cache holds every unexpired revocation from the database
+REVOCATIONS_LOADED_KEY = 'auth-token-revocations-loaded'
+
+# Access token claims that become User fields
+ACCESS_USER_FIELDS = {'uid': 'id', 'usr': 'username', 'eml': 'email', 'rol': 'role'}
+
+
+class TokenError(Exception):
+    pass
+
+
+def access_lifetime():
+    return getattr(settings, 'AUTH_ACCESS_TOKEN_LIFETIME', 300)
+
+
+def refresh_lifetime():
+    return getattr(settings, 'AUTH_REFRESH_TOKEN_LIFETIME', 7 * 86400)
+
+
+def revocation_reload_interval():
+    return getattr(settings, 'AUTH_TOKEN_REVOCATION_RELOAD', 5)
+
+
+def password_fingerprint(user):
+    return user.get_session_auth_hash()[:16]
+
+
+def issue_access_token(user, family):
+    payload = {
+        'uid': user.pk,
+        'usr': user.username,
+        'eml': user.email,
+        'rol': user.role,
+        'fam': family,
+        'iat': time.time(),
+    }
+    return signing.dumps(payload, salt=ACCESS_SALT)
+
+
+def issue_tokens(user):
+    """Start a new token family for ``user`` and return its token pair."""
+    family = uuid.uuid4().hex
+    refresh = signing.dumps(
+        {'uid': user.pk, 'fam': family, 'pwd': password_fingerprint(user)},
+        salt=REFRESH_SALT,
+    )
+    return {
+        'access': issue_access_token(user, family),
+        'refresh': refresh,
+        'token_type': 'Bearer',
+        'expires_in': access_lifetime(),
+    }
+
+
+def _load(token, salt, max_age):
+    try:
+        return signing.loads(token, salt=salt, max_age=max_age)
+    except signing.SignatureExpired:
+        raise TokenError('Token has expired.')
+    except signing.BadSignature:
+        raise TokenError('Token is invalid.')
+
+
+def load_revocations():
+    """
+    Copy unexpired revocations, and the cutoffs of users saved within one
+    access lifetime, from the database into the cache.
+    """
+    now = timezone.now()
+    for family, expires_at in RevokedToken.objects.filter(expires_at__gt=now).values_list('family', 'expires_at'):
+        cache.set(REVOKED_KEY.format(family), True, int((expires_at - now).total_seconds()) + 1)
+
+    # updated_at is left alone by last_login-only saves, like the signal that sets the cutoffs
+    saved = get_user_model().objects.filter(
+        updated_at__gt=now - timedelta(seconds=access_lifetime()),
+    ).values_list('pk', 'updated_at')
+    cutoffs = {NOT_BEFORE_KEY.format(pk): updated_at.timestamp() for pk, updated_at in saved}
+    if cutoffs:
+        cached = cache.get_many(list(cutoffs))
+        cache.set_many(
+            {key: max(cutoff, cached.get(key, cutoff)) for key, cutoff in cutoffs.items()},
+            access_lifetime(),
+        )
+    cache.set(REVOCATIONS_LOADED_KEY, True, revocation_reload_interval())
+
+
+def check_not_revoked(family, user_id=None, issued_at=None):
+    """Raise TokenError if the family, or the user's tokens issued before ``issued_at``, were revoked."""
+    revoked_key = REVOKED_KEY.format(family)
+    not_before_key = NOT_BEFORE_KEY.format(user_id)
+    keys = [revoked_key, not_before_key, REVOCATIONS_LOADED_KEY]
+    values = cache.get_many(keys)
+    if REVOCATIONS_LOADED_KEY not in values:
+        # Due for a reload, or the cache was cleared: two queries restore the lists
+        load_revocations()
+        values = cache.get_many(keys)
+    if values.get(revoked_key):
+        raise TokenError('Token has been revoked.')
+    not_before = values.get(not_before_key)
+    if issued_at is not None and not_before is not None and issued_at < not_before:
+        raise TokenError('Token has been revoked.')
+
+
+def user_from_access_token(token):
+    """Verify an access token and return its user without touching the database."""
+    payload = _load(token, ACCESS_SALT, access_lifetime())
+    check_not_revoked(payload['fam'], payload['uid'], payload['iat'])
+    known = {field: payload[claim] for claim, field in ACCESS_USER_FIELDS.items()}
+    known['is_active'] = True
+    User = get_user_model()
+    # from_db takes values in concrete field order; the rest stay deferred
+    # and are only loaded if a view reads them
+    names = [field.attname for field in User._meta.concrete_fields if field.attname in known]
+    return User.from_db(DEFAULT_DB_ALIAS, names, [known[name] for name in names])
+
+
+def refresh_access_token(token):
+    """Exchange a refresh token for a new access token, checking the user is still valid."""
+    payload = _load(token, REFRESH_SALT, refresh_lifetime())
+    # From the database: this process's cache may not have seen a revocation made elsewhere
+    if RevokedToken.objects.filter(family=payload['fam'], expires_at__gt=timezone.now()).exists():
+        raise TokenError('Token has been revoked.')
+    user = get_user_model().objects.filter(pk=payload['uid'], is_active=True).first()
+    if user is None or password_fingerprint(user) != payload['pwd']:
+        raise TokenError('Token is invalid.')
+    return {
+        'access': issue_access_token(user, payload['fam']),
+        'token_type': 'Bearer',
+        'expires_in': access_lifetime(),
+    }
+
+
+def revoke_refresh_token(token):
+    """Revoke the family of a refresh token: it and its access tokens stop working."""
+    payload = _load(token, REFRESH_SALT, refresh_lifetime())
+    if not get_user_model().objects.filter(pk=payload['uid']).exists():
+        # Deleted users' tokens already fail to refresh or authenticate
+        return
+    now = timezone.now()
+    # Access tokens of the family may outlive it by up to one access lifetime
+    expires_at = now + timedelta(seconds=refresh_lifetime() + access_lifetime())
+    RevokedToken.objects.filter(expires_at__lte=now).delete()
+    RevokedToken.objects.update_or_create(
+        family=payload['fam'],
+        defaults={'user_id': payload['uid'], 'expires_at': expires_at},
+    )
+    cache.set(REVOKED_KEY.format(payload['fam']), True, refresh_lifetime() + access_lifetime())
+
+
+def revoke_user_access_tokens(user_id):
+    """Reject the user's access tokens issued up to now."""
+    cache.set(NOT_BEFORE_KEY.format(user_id), time.time(), access_lifetime())
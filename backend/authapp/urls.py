@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
@@ -7,6 +8,9 @@ urlpatterns = [
     path('csrf-token/', views.csrf_token_view, name='csrf-token'),
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
-    path('me/', views.me, name='me'),
+    path('me/', views.AsyncMeView.as_view() if settings.ASYNC_VIEWS else views.me, name='me'),
+    path('token/', views.token_view, name='token'),
+    path('token/refresh/', views.token_refresh_view, name='token-refresh'),
+    path('token/revoke/', views.token_revoke_view, name='token-revoke'),
 ]
 
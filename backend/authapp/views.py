@@ -1,12 +1,15 @@
 import logging
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from django.contrib.auth import login, logout
 from django.middleware.csrf import get_token
 from django.conf import settings
-from .serializers import UserAuthSerializer, LoginSerializer
+from core.async_views import AsyncViewMixin
+from .serializers import UserAuthSerializer, LoginSerializer, RefreshTokenSerializer
+from .tokens import TokenError, issue_tokens, refresh_access_token, revoke_refresh_token
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +50,10 @@ def me(request):
     Get current authenticated user.
     Returns 401 if not authenticated, otherwise returns user data.
     """
+    return me_response(request)
+
+
+def me_response(request):
     # Log request details for debugging
     logger.info(f"GET /auth/me/ - Origin: {request.META.get('HTTP_ORIGIN')}, "
                 f"CSRF Token: {request.META.get('HTTP_X_CSRFTOKEN', 'None')}, "
@@ -62,6 +69,17 @@ def me(request):
     return Response({'user': serializer.data}, status=status.HTTP_200_OK)
 
 
+class AsyncMeView(AsyncViewMixin, APIView):
+    """
+    Async variant of ``me`` for ASGI deployments (see core/async_views.py).
+    The user was resolved during authentication, so no query runs here.
+    """
+    permission_classes = [AllowAny]
+    
+    async def get(self, request):
+        return me_response(request)
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def login_view(request):
@@ -113,3 +131,47 @@ def logout_view(request):
         {'message': 'Logout successful'},
         status=status.HTTP_200_OK
     )
+
+
+@api_view(['POST'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def token_view(request):
+    """
+    Issue an access/refresh token pair for non-browser clients.
+    
+    Takes the same ``username``/``password`` body as login, but creates no
+    session and needs no CSRF token. Send the access token as
+    ``Authorization: Bearer <access>``.
+    """
+    serializer = LoginSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    return Response(issue_tokens(serializer.validated_data['user']), status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def token_refresh_view(request):
+    """Exchange a refresh token for a new access token."""
+    serializer = RefreshTokenSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    try:
+        tokens = refresh_access_token(serializer.validated_data['refresh'])
+    except TokenError as exc:
+        return Response({'detail': str(exc)}, status=status.HTTP_401_UNAUTHORIZED)
+    return Response(tokens, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def token_revoke_view(request):
+    """Revoke a refresh token together with every access token issued from it."""
+    serializer = RefreshTokenSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    try:
+        revoke_refresh_token(serializer.validated_data['refresh'])
+    except TokenError as exc:
+        return Response({'detail': str(exc)}, status=status.HTTP_401_UNAUTHORIZED)
+    return Response({'message': 'Token revoked'}, status=status.HTTP_200_OK)
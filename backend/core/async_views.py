@@ -0,0 +1,83 @@
+"""
+Coroutine handlers for DRF views served under ASGI.
+
+DRF's request cycle is synchronous. AsyncViewMixin lets a view or ViewSet
+declare some handlers as coroutines: those run on the event loop and use the
+async ORM for their own queries, while the parts of the cycle that may query
+the database (authentication, permission and throttle checks, filter
+backends) are moved to a worker thread. Every other handler goes through
+DRF's usual dispatch in a worker thread, so one view class still serves
+reads and writes at the same URL.
+
+The async views are only routed when ``ASYNC_VIEWS`` is enabled, which
+core/asgi.py does by default: under WSGI each request would need its own
+event loop.
+"""
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.http import Http404
+from django.utils.decorators import classonlymethod
+
+
+class AsyncViewMixin:
+    """Dispatch requests whose handler is a coroutine without blocking the event loop"""
+
+    @classonlymethod
+    def as_view(cls, *args, **initkwargs):
+        view = super().as_view(*args, **initkwargs)
+        if iscoroutinefunction(view):
+            return view
+
+        # ViewSet views are plain functions that return dispatch()'s coroutine
+        async def async_view(request, *args, **kwargs):
+            return await view(request, *args, **kwargs)
+
+        async_view.__dict__.update(view.__dict__)
+        async_view.__name__ = view.__name__
+        return async_view
+
+    async def dispatch(self, request, *args, **kwargs):
+        method = request.method.lower()
+        handler = getattr(self, method, None) if method in self.http_method_names else None
+        if not iscoroutinefunction(handler):
+            return await sync_to_async(super().dispatch)(request, *args, **kwargs)
+
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def afilter_queryset(self, queryset):
+        # django-filter validates model choice parameters with a query
+        return await sync_to_async(self.filter_queryset)(queryset)
+
+    async def apaginate_queryset(self, queryset):
+        """Paginate with the paginator's ``apaginate_queryset`` when it has one"""
+        if self.paginator is None:
+            return None
+        apaginate = getattr(self.paginator, 'apaginate_queryset', None)
+        if apaginate is not None:
+            return await apaginate(queryset, self.request, view=self)
+        return await sync_to_async(self.paginator.paginate_queryset)(queryset, self.request, view=self)
+
+    async def aget_object(self, queryset):
+        """
+        get_object() through the async ORM, for a queryset already narrowed
+        by ``filter_lookup()``; None (an invalid lookup) is a 404 too.
+        """
+        if queryset is None:
+            raise Http404
+        obj = await queryset.afirst()
+        if obj is None:
+            raise Http404('No %s matches the given query.' % queryset.model._meta.object_name)
+        self.check_object_permissions(self.request, obj)
+        return obj
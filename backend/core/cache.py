@@ -0,0 +1,91 @@
+"""
+Versioned cache keys and hit/miss counters on top of Django's cache framework.
+
+Cached entries embed the current version of their namespace in the key.
+Invalidating a namespace bumps its version, so every old entry becomes
+unreachable at once and simply ages out; nothing has to be enumerated or
+deleted.
+"""
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = 'cache-version:{}'
+COUNTER_KEY = 'cache-counter:{}:{}'
+
+# Version keys must outlive every entry that embeds them
+VERSION_TIMEOUT = None
+
+
+def _initial_version():
+    # Start from the clock so a version key that was evicted never comes
+    # back with a number that old entries were written under
+    return time.time_ns() // 1000
+
+
+def get_version(namespace):
+    """Return the current version of ``namespace``."""
+    key = VERSION_KEY.format(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), VERSION_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def _incr_version(namespace):
+    key = VERSION_KEY.format(namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial_version(), VERSION_TIMEOUT)
+
+
+def bump_version(namespace):
+    """
+    Invalidate every key built from ``namespace``.
+
+    The version is bumped right away and again when the surrounding
+    transaction commits, so a reader that cached rows between the write and
+    the commit cannot keep serving them.
+    """
+    _incr_version(namespace)
+    transaction.on_commit(lambda: _incr_version(namespace))
+
+
+def versioned_key(namespace, *parts):
+    """Build a cache key for ``parts`` under the current version of ``namespace``."""
+    return ':'.join([namespace, f'v{get_version(namespace)}', *(str(part) for part in parts)])
+
+
+def incr_counter(namespace, name):
+    key = COUNTER_KEY.format(namespace, name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def get_counters(namespace, names):
+    """Return ``{name: count}`` for the given counters of ``namespace``."""
+    keys = {COUNTER_KEY.format(namespace, name): name for name in names}
+    values = cache.get_many(list(keys))
+    return {name: values.get(key, 0) for key, name in keys.items()}
+
+
+def reset_counters(namespace, names):
+    cache.delete_many([COUNTER_KEY.format(namespace, name) for name in names])
+
+
+def normalize_params(query_params):
+    """Encode a QueryDict in a stable order, dropping empty values, for use in keys."""
+    items = sorted(
+        (name, value)
+        for name in query_params
+        for value in query_params.getlist(name)
+        if value != ''
+    )
+    return urlencode(items)
@@ -0,0 +1,112 @@
+"""
+Conditional GET support for list and retrieve endpoints.
+
+ETags are derived from a single aggregate query over the filtered queryset
+(row count plus the latest modification times) together with the request's
+scope and normalized query string, so they can be checked, and a 304
+returned, before any row is loaded or serialized.
+"""
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import normalize_params
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin that adds strong ETags and ``If-None-Match`` handling.
+
+    Views call ``conditional_response(queryset, build)`` from ``list`` or
+    ``retrieve`` (with ``filter_lookup(queryset)`` for the latter); ``build``
+    is only invoked when the client's copy is stale, and can read the ETag it
+    will be sent with from ``self.current_etag``.
+    """
+
+    def get_etag_aggregates(self):
+        """Aggregates that change whenever any row of the queryset does"""
+        return {
+            'count': Count('pk'),
+            'updated_at': Max('updated_at'),
+        }
+
+    def get_etag_scope(self):
+        """Part of the ETag that depends on who is asking, not on the rows"""
+        return ''
+
+    def filter_lookup(self, queryset):
+        """Narrow ``queryset`` to the object named in the URL, or None if the lookup is invalid"""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            return queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (TypeError, ValueError, ValidationError):
+            return None
+
+    def get_etag(self, queryset):
+        """
+        Return the ETag for ``queryset``, or None when it is empty on a detail
+        route. The aggregate is kept in ``etag_values`` (for ``etag_queryset``),
+        so a paginator can reuse its row count.
+        """
+        if queryset is None:
+            return None
+        return self.set_etag_values(queryset, queryset.order_by().aggregate(**self.get_etag_aggregates()))
+
+    async def aget_etag(self, queryset):
+        """get_etag() with the aggregate run through the async ORM"""
+        if queryset is None:
+            return None
+        return self.set_etag_values(queryset, await queryset.order_by().aaggregate(**self.get_etag_aggregates()))
+
+    def set_etag_values(self, queryset, values):
+        self.etag_queryset, self.etag_values = queryset, values
+        return self.make_etag(values)
+
+    def make_etag(self, values):
+        if self.detail and not values['count']:
+            return None
+
+        request = self.request
+        parts = [
+            self.action,
+            self.get_etag_scope(),
+            request.accepted_renderer.format,
+            request.build_absolute_uri(request.path),
+            normalize_params(request.query_params),
+            *(f'{name}={values[name]}' for name in sorted(values)),
+        ]
+        return '"%s"' % hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+    def etag_matches(self, etag):
+        header = self.request.headers.get('If-None-Match')
+        if etag is None or not header:
+            return False
+        # If-None-Match uses the weak comparison
+        etags = [tag.removeprefix('W/') for tag in parse_etags(header)]
+        return '*' in etags or etag in etags
+
+    def conditional_response(self, queryset, build):
+        """Return 304 if the client's ETag is current, otherwise ``build()`` with an ETag"""
+        etag = self.current_etag = self.get_etag(queryset)
+        if self.etag_matches(etag):
+            return self.not_modified_response(etag)
+        return self.add_etag(build(), etag)
+
+    async def aconditional_response(self, queryset, build):
+        """conditional_response() for coroutine handlers; ``build`` returns an awaitable"""
+        etag = self.current_etag = await self.aget_etag(queryset)
+        if self.etag_matches(etag):
+            return self.not_modified_response(etag)
+        return self.add_etag(await build(), etag)
+
+    def not_modified_response(self, etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+    def add_etag(self, response, etag):
+        if etag is not None and response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+        return response
@@ -0,0 +1,194 @@
+"""
+Minimal HTTP load generator for ``benchmark_serving`` and ``benchmark_api``.
+
+Opens a new connection per request, as Nginx does towards its upstream by
+default, so sync Gunicorn workers (which never keep connections alive) and
+Uvicorn workers are measured the same way. The client uses the standard
+library only.
+"""
+import asyncio
+import itertools
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+
+# Gunicorn arguments and environment, as in deploy/gunicorn.service and deploy/gunicorn-asgi.service
+PROFILES = {
+    'wsgi': {
+        'args': ['core.wsgi:application'],
+        'env': {},
+    },
+    'asgi': {
+        'args': ['core.asgi:application', '--worker-class', 'uvicorn_worker.UvicornWorker'],
+        # Persistent connections are per thread, and ASGI requests run on short-lived threads
+        'env': {'DB_CONN_MAX_AGE': '0'},
+    },
+}
+
+
+class ServerError(RuntimeError):
+    pass
+
+
+@dataclass
+class LoadResult:
+    duration: float = 0.0
+    latencies: list = field(default_factory=list)
+    statuses: dict = field(default_factory=dict)
+    errors: int = 0
+
+    @property
+    def requests(self):
+        return len(self.latencies)
+
+    @property
+    def throughput(self):
+        return self.requests / self.duration if self.duration else 0.0
+
+    def percentile(self, fraction):
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+    def summary(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'statuses': {str(code): count for code, count in sorted(self.statuses.items())},
+            'requests_per_sec': round(self.throughput, 1),
+            'mean_ms': round(statistics.fmean(self.latencies) * 1000, 1) if self.latencies else 0.0,
+            'p50_ms': round(self.percentile(0.50) * 1000, 1),
+            'p95_ms': round(self.percentile(0.95) * 1000, 1),
+            'p99_ms': round(self.percentile(0.99) * 1000, 1),
+        }
+
+
+async def request(host, port, method, path, headers, body=None):
+    """Send one request over a fresh connection and return the status code"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {host}', 'Connection: close']
+        lines += [f'{name}: {value}' for name, value in headers.items()]
+        if body is not None:
+            lines.append(f'Content-Length: {len(body)}')
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + (body or b''))
+        await writer.drain()
+        status_line = await reader.readline()
+        # Read the rest so the server finishes writing the response
+        await reader.read()
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def fetch(host, port, path, headers):
+    """GET ``path`` over a fresh connection and return the status code"""
+    return await request(host, port, 'GET', path, headers)
+
+
+async def run_requests(host, port, next_request, concurrency=50, duration=10.0):
+    """
+    Keep ``concurrency`` requests in flight for ``duration`` seconds.
+    ``next_request()`` returns the ``(method, path, headers, body)`` to send next.
+    """
+    result = LoadResult()
+    deadline = time.perf_counter() + duration
+
+    async def client():
+        while time.perf_counter() < deadline:
+            method, path, headers, body = next_request()
+            started = time.perf_counter()
+            try:
+                status = await request(host, port, method, path, headers, body)
+            except (OSError, ValueError, IndexError):
+                result.errors += 1
+                continue
+            result.latencies.append(time.perf_counter() - started)
+            result.statuses[status] = result.statuses.get(status, 0) + 1
+            if status >= 400:
+                result.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    result.duration = time.perf_counter() - started
+    return result
+
+
+async def run_load(host, port, paths, headers=None, concurrency=50, duration=10.0):
+    """Keep ``concurrency`` GETs in flight for ``duration`` seconds, cycling through ``paths``"""
+    headers = headers or {}
+    next_path = itertools.cycle(paths).__next__
+    return await run_requests(host, port, lambda: ('GET', next_path(), headers, None), concurrency, duration)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(profile, port, workers, cwd, env=None, verbose=False):
+    """Start Gunicorn with a serving profile on 127.0.0.1:``port``"""
+    env = {
+        **os.environ,
+        'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'core.settings'),
+        'DEBUG': 'False',
+        'ALLOWED_HOSTS': '127.0.0.1',
+        **(env or {}),
+        **PROFILES[profile]['env'],
+    }
+    command = [
+        sys.executable, '-m', 'gunicorn', *PROFILES[profile]['args'],
+        '--bind', f'127.0.0.1:{port}',
+        '--workers', str(workers),
+        '--timeout', '120',
+        '--config', 'python:core.loadtest_gunicorn',
+    ]
+    # Per-request logging would dominate the output
+    output = None if verbose else subprocess.DEVNULL
+    return subprocess.Popen(command, cwd=cwd, env=env, stdout=output, stderr=output)
+
+
+def wait_until_ready(host, port, server, path, headers, timeout=30):
+    """Poll ``path`` until it answers 200; raises ServerError if ``server`` exits or fails it"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise ServerError(
+                f'Server exited with code {server.returncode}; is the profile installed? '
+                'Run with -v 2 to see its output.'
+            )
+        try:
+            status = asyncio.run(fetch(host, port, path, headers))
+        except OSError:
+            time.sleep(0.2)
+            continue
+        if status != 200:
+            raise ServerError(f'GET {path} returned {status}')
+        return
+    raise ServerError(f'Server did not start within {timeout}s')
+
+
+def add_query_delay(seconds):
+    """
+    Sleep ``seconds`` before every query on every database connection, to
+    stand in for network round trips or slow queries while the GIL is free.
+    """
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    def delay(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def add_wrapper(sender, connection, **kwargs):
+        connection.execute_wrappers.append(delay)
+
+    connection_created.connect(add_wrapper, weak=False)
+    for connection in connections.all(initialized_only=True):
+        connection.execute_wrappers.append(delay)
@@ -0,0 +1,13 @@
+"""
+Gunicorn config used by ``manage.py benchmark_serving`` for both profiles
+(``-c python:core.loadtest_gunicorn``).
+"""
+import os
+
+
+def post_worker_init(worker):
+    delay_ms = float(os.environ.get('LOADTEST_QUERY_DELAY_MS', '0'))
+    if delay_ms:
+        from core.loadtest import add_query_delay
+
+        add_query_delay(delay_ms / 1000)
@@ -0,0 +1,250 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+REFRESHED_AT_KEY = '_session_refreshed_at'
+
+timing_logger = logging.getLogger('core.timing')
+
+# The RequestTiming of the request being served; sync_to_async copies it into
+# the worker threads that run a request's queries
+_current_timing = ContextVar('request_timing', default=None)
+
+
+class SlidingSessionMiddleware:
+    """
+    Sliding session expiry without a session write on every request.
+
+    Replaces ``SESSION_SAVE_EVERY_REQUEST``: a session is only re-saved once
+    ``SESSION_REFRESH_FRACTION`` of ``SESSION_COOKIE_AGE`` has passed since its
+    last save. Each save sets the expiry to the cookie age plus that refresh
+    interval, so a session still survives at least ``SESSION_COOKIE_AGE`` of
+    idle time, as before, while writes drop to one per refresh interval.
+
+    Must be listed after SessionMiddleware so it runs before the session is
+    saved on the way out.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self.process_session(request)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        # Reading the session may load it from the database
+        await sync_to_async(self.process_session, thread_sensitive=True)(request)
+        return response
+
+    def process_session(self, request):
+        session = getattr(request, 'session', None)
+        if session is not None and not session.is_empty():
+            self.refresh(session)
+
+    @staticmethod
+    def get_refresh_interval():
+        fraction = getattr(settings, 'SESSION_REFRESH_FRACTION', 0.1)
+        return int(settings.SESSION_COOKIE_AGE * fraction)
+
+    def refresh(self, session):
+        interval = self.get_refresh_interval()
+        now = int(time.time())
+        if not session.modified and now - session.get(REFRESHED_AT_KEY, 0) < interval:
+            return
+        # Marks the session modified, so SessionMiddleware saves it and re-sends the cookie
+        session[REFRESHED_AT_KEY] = now
+        if not settings.SESSION_EXPIRE_AT_BROWSER_CLOSE:
+            session.set_expiry(settings.SESSION_COOKIE_AGE + interval)
+
+
+class RequestTiming:
+    """Timestamps and SQL statistics collected for one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = self.render_started = self.render_finished = None
+        self.query_count = 0
+        self.query_time = 0.0
+        self.serialize_time = 0.0
+        self.serializing = False
+        self.statements = Counter()
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.query_time += time.perf_counter() - started
+            self.query_count += 1
+            # Parameters are placeholders here, so a query repeated per row looks the same each time
+            self.statements[sql] += 1
+
+    @contextmanager
+    def record_serialization(self):
+        # Serializers nest; only the outermost one is timed
+        if self.serializing:
+            yield
+            return
+        self.serializing = True
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.serialize_time += time.perf_counter() - started
+            self.serializing = False
+
+    def mark_render_finished(self, response):
+        self.render_finished = time.perf_counter()
+
+    def durations(self):
+        """Milliseconds spent in each part of the request"""
+        total = time.perf_counter() - self.started
+        durations = {'db': self.query_time}
+        if self.view_started is not None:
+            view_finished = self.render_started or time.perf_counter()
+            # Serialization happens inside the view but is reported on its own
+            durations['view'] = view_finished - self.view_started - self.serialize_time
+            durations['serialize'] = self.serialize_time
+            if self.render_started is not None and self.render_finished is not None:
+                durations['render'] = self.render_finished - self.render_started
+            durations['middleware'] = (
+                total - durations['view'] - durations['serialize'] - durations.get('render', 0)
+            )
+        durations['total'] = total
+        return {name: round(seconds * 1000, 2) for name, seconds in durations.items()}
+
+    def repeated_queries(self, threshold):
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+
+def record_query(execute, sql, params, many, context):
+    timing = _current_timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    return timing.record_query(execute, sql, params, many, context)
+
+
+@contextmanager
+def record_serialization():
+    """Count the time spent in the block as serialization of the current request"""
+    timing = _current_timing.get()
+    if timing is None:
+        yield
+        return
+    with timing.record_serialization():
+        yield
+
+
+def install_query_recorder(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install_on_open_connections(**kwargs):
+    # request_started is sent from the thread that runs the request's sync
+    # code, whose persistent connections may predate the middleware
+    for connection in connections.all(initialized_only=True):
+        install_query_recorder(connection)
+
+
+class RequestTimingMiddleware:
+    """
+    Opt-in request timing, enabled with ``REQUEST_TIMING``.
+
+    Records the number of SQL queries and the time spent in SQL, in the view
+    (including its queries), serializing the view's data (see
+    core/serializers.py, not counted in ``view``), rendering the response and
+    the rest of the middleware stack. The results are sent as a ``Server-Timing`` header and
+    logged by ``core.timing`` with one ``extra`` field per metric. Statements
+    run ``REQUEST_TIMING_REPEATED_QUERIES`` times or more in one request are
+    logged as a warning, as they usually come from a query per row (N+1).
+
+    List it first so ``total`` covers the whole stack. When disabled it
+    raises MiddlewareNotUsed and Django leaves it out of the stack entirely.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_TIMING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.repeat_threshold = getattr(settings, 'REQUEST_TIMING_REPEATED_QUERIES', 5)
+        # Database connections are per thread; hook every one the requests use
+        connection_created.connect(install_query_recorder)
+        request_started.connect(install_on_open_connections)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request.timing = RequestTiming()
+        token = _current_timing.set(request.timing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_timing.reset(token)
+        return self.finish(request, response)
+
+    async def __acall__(self, request):
+        request.timing = RequestTiming()
+        token = _current_timing.set(request.timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_timing.reset(token)
+        return self.finish(request, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.timing.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Runs last of the template response hooks, just before render()
+        request.timing.render_started = time.perf_counter()
+        response.add_post_render_callback(request.timing.mark_render_finished)
+        return response
+
+    def finish(self, request, response):
+        timing = request.timing
+        durations = timing.durations()
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={value}' + (f';desc="{timing.query_count} queries"' if name == 'db' else '')
+            for name, value in durations.items()
+        )
+
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': timing.query_count,
+            **{f'{name}_ms': value for name, value in durations.items()},
+        }
+        timing_logger.info(
+            '%(method)s %(path)s %(status)s: %(total_ms)sms, %(queries)s queries in %(db_ms)sms',
+            fields, extra=fields,
+        )
+        for sql, count in timing.repeated_queries(self.repeat_threshold):
+            timing_logger.warning(
+                'Query repeated %d times in %s %s (N+1?): %s', count, request.method, request.path, sql,
+                extra={'method': request.method, 'path': request.path, 'repeated': count, 'sql': sql},
+            )
+        return response
@@ -0,0 +1,39 @@
+"""
+Serializers that report their time to RequestTimingMiddleware.
+
+Producing ``.data`` is where DRF runs every field of every row, so views that
+use these serializers get it reported as ``serialize`` rather than ``view``
+(see core/middleware.py). Nothing is recorded when REQUEST_TIMING is off.
+"""
+from rest_framework import serializers
+
+from .middleware import record_serialization
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    """ListSerializer whose ``.data`` is recorded as serialization"""
+
+    @property
+    def data(self):
+        with record_serialization():
+            return super().data
+
+
+class TimedSerializerMixin:
+    """
+    Serializer mixin whose ``.data`` is recorded as serialization.
+
+    ``many=True`` instances are TimedListSerializers unless the serializer's
+    Meta names another ``list_serializer_class``.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        meta = getattr(cls, 'Meta', None)
+        if meta is not None and not hasattr(meta, 'list_serializer_class'):
+            meta.list_serializer_class = TimedListSerializer
+
+    @property
+    def data(self):
+        with record_serialization():
+            return super().data
@@ -14,6 +14,7 @@ from pathlib import Path
 import os
 from dotenv import load_dotenv
 import dj_database_url
+from corsheaders.defaults import default_headers
 
 # Load environment variables from .env file
 load_dotenv()
@@ -57,9 +58,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestTimingMiddleware',  # First, so it times the whole stack; a no-op unless REQUEST_TIMING
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # CORS must come before other middleware
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'core.middleware.SlidingSessionMiddleware',  # Must come after SessionMiddleware
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -98,7 +101,7 @@ if DATABASE_URL:
     DATABASES = {
         'default': dj_database_url.parse(
             DATABASE_URL,
-            conn_max_age=600,
+            conn_max_age=int(os.getenv('DB_CONN_MAX_AGE', '600')),
             ssl_require=os.getenv('DB_SSL', 'True') == 'True',
         )
     }
@@ -111,6 +114,7 @@ elif os.getenv('DB_NAME'):
             'PASSWORD': os.getenv('DB_PASS'),
             'HOST': os.getenv('DB_HOST', 'localhost'),
             'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '0')),
         }
     }
 else:
@@ -166,16 +170,118 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
 
+AUTHENTICATION_BACKENDS = [
+    'users.backends.CachedModelBackend',
+    # Kept so sessions created before CachedModelBackend stay valid until they expire
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 # Django REST Framework configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
+        # Bearer access tokens from /api/auth/token/ (see authapp/tokens.py)
+        'authapp.authentication.SignedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
 }
 
+# Cache: Redis when REDIS_URL is set (shared by all workers), otherwise per-process memory
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Cache task list/detail responses (see tasks/cache.py). On by default only with a
+# shared cache: per-process caches are not invalidated by writes in other workers.
+TASK_RESPONSE_CACHE = os.getenv('TASK_RESPONSE_CACHE', 'True' if REDIS_URL else 'False') == 'True'
+TASK_RESPONSE_CACHE_TIMEOUT = int(os.getenv('TASK_RESPONSE_CACHE_TIMEOUT', '300'))
+
+# Cache the /api/users/choices/ list with its ETag (see users/choices.py), on the same
+# terms as the task response cache. ?q=<prefix> returns at most the typeahead limit.
+USER_CHOICES_CACHE = os.getenv('USER_CHOICES_CACHE', 'True' if REDIS_URL else 'False') == 'True'
+USER_CHOICES_CACHE_TIMEOUT = int(os.getenv('USER_CHOICES_CACHE_TIMEOUT', '600'))
+USER_CHOICES_TYPEAHEAD_LIMIT = int(os.getenv('USER_CHOICES_TYPEAHEAD_LIMIT', '20'))
+
+# Serve request.user from the cache (see users/backends.py). On by default only with a
+# shared cache, so user changes are seen by every worker immediately.
+AUTH_USER_CACHE = os.getenv('AUTH_USER_CACHE', 'True' if REDIS_URL else 'False') == 'True'
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_TIMEOUT', '60'))
+AUTH_USER_CACHE_LOCAL_TTL = float(os.getenv('AUTH_USER_CACHE_LOCAL_TTL', '1'))
+
+# Lifetimes of the signed tokens issued by /api/auth/token/, in seconds
+AUTH_ACCESS_TOKEN_LIFETIME = int(os.getenv('AUTH_ACCESS_TOKEN_LIFETIME', '300'))
+AUTH_REFRESH_TOKEN_LIFETIME = int(os.getenv('AUTH_REFRESH_TOKEN_LIFETIME', str(7 * 86400)))
+# Seconds between reloads of token revocations from the database into the cache
+# (see authapp/tokens.py). Without a shared cache this is how long other workers
+# take to see a revocation, so keep it short there
+AUTH_TOKEN_REVOCATION_RELOAD = int(os.getenv('AUTH_TOKEN_REVOCATION_RELOAD', '300' if REDIS_URL else '5'))
+
+# Task full-text search engine: 'auto' (by database vendor), 'basic' (icontains),
+# or the dotted path of an engine class (see tasks/search.py)
+TASK_SEARCH_BACKEND = os.getenv('TASK_SEARCH_BACKEND', 'auto')
+
+# User list totals (see users/pagination.py): 'exact', 'estimate' (planner estimate on
+# PostgreSQL, exact below USER_PAGINATION_EXACT_COUNT_BELOW; a count cached for
+# USER_PAGINATION_COUNT_CACHE_TIMEOUT seconds elsewhere) or 'none'. Clients may pass ?count=
+USER_PAGINATION_COUNT = os.getenv('USER_PAGINATION_COUNT', 'exact')
+USER_PAGINATION_EXACT_COUNT_BELOW = int(os.getenv('USER_PAGINATION_EXACT_COUNT_BELOW', '10000'))
+USER_PAGINATION_COUNT_CACHE_TIMEOUT = int(os.getenv('USER_PAGINATION_COUNT_CACHE_TIMEOUT', '60'))
+
+# User directory search engine: 'auto' (trigram indexes by database vendor), 'basic'
+# (icontains), or the dotted path of an engine class (see users/search.py)
+USER_SEARCH_BACKEND = os.getenv('USER_SEARCH_BACKEND', 'auto')
+
+# Serve task list/retrieve through TaskFastReadSerializer (.values() projection)
+TASK_FAST_READ_SERIALIZER = os.getenv('TASK_FAST_READ_SERIALIZER', 'True') == 'True'
+
+# Route the read endpoints (task/user list and retrieve, users/choices, auth/me) to
+# their coroutine views (see core/async_views.py). core/asgi.py turns this on
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False') == 'True'
+
+# Seconds before a deadline that run_task_reminders sends a due_soon reminder
+TASK_REMINDER_LEAD = int(os.getenv('TASK_REMINDER_LEAD', '3600'))
+
+# Server-Sent Events feed of task changes (see tasks/events.py). On by default only
+# with a shared cache, which carries events between worker processes, and the async
+# views, which hold open streams on the event loop rather than in a worker.
+TASK_EVENTS = os.getenv('TASK_EVENTS', 'True' if REDIS_URL and ASYNC_VIEWS else 'False') == 'True'
+# Also stream from sync (WSGI) views. Each open stream then holds a whole worker for up
+# to TASK_EVENTS_STREAM_TIMEOUT, so a few browser tabs can take every worker
+TASK_EVENTS_SYNC = os.getenv('TASK_EVENTS_SYNC', 'False') == 'True'
+# Seconds events stay available for clients resuming with Last-Event-ID
+TASK_EVENTS_TTL = int(os.getenv('TASK_EVENTS_TTL', '300'))
+TASK_EVENTS_POLL_INTERVAL = float(os.getenv('TASK_EVENTS_POLL_INTERVAL', '0.5'))
+TASK_EVENTS_HEARTBEAT = float(os.getenv('TASK_EVENTS_HEARTBEAT', '15'))
+# Streams are closed after this many seconds; clients reconnect and are re-authenticated
+TASK_EVENTS_STREAM_TIMEOUT = float(os.getenv('TASK_EVENTS_STREAM_TIMEOUT', '300'))
+
+# Delta sync at /api/tasks/changes/ (see tasks/sync.py): writes this recent are left
+# for the next sync, and tombstones are kept this many days (prune_task_tombstones)
+TASK_CHANGES_SETTLE = float(os.getenv('TASK_CHANGES_SETTLE', '2'))
+TASK_TOMBSTONE_RETENTION = int(os.getenv('TASK_TOMBSTONE_RETENTION', '30'))
+
+# manage.py archive_tasks moves Done tasks not updated for this many days to the archive
+TASK_ARCHIVE_AFTER_DAYS = int(os.getenv('TASK_ARCHIVE_AFTER_DAYS', '90'))
+
+# Server-Timing headers and core.timing logs for every request (see core/middleware.py).
+# Statements run this many times in one request are logged as likely N+1 queries
+REQUEST_TIMING = os.getenv('REQUEST_TIMING', 'False') == 'True'
+REQUEST_TIMING_REPEATED_QUERIES = int(os.getenv('REQUEST_TIMING_REPEATED_QUERIES', '5'))
+
 # CORS configuration - can be overridden via env var
 default_cors = [
     'http://localhost:5173',
@@ -189,7 +295,8 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 CORS_ALLOW_CREDENTIALS = True  # Required for session cookies
-CORS_EXPOSE_HEADERS = ['Set-Cookie']  # Expose Set-Cookie header to frontend
+CORS_EXPOSE_HEADERS = ['Set-Cookie', 'ETag']  # Expose Set-Cookie and ETag headers to frontend
+CORS_ALLOW_HEADERS = (*default_headers, 'if-none-match')  # Conditional GETs from the frontend
 
 # Session configuration
 # Security: session cookies should be HttpOnly and Secure in production
@@ -199,8 +306,19 @@ SESSION_COOKIE_HTTPONLY = True
 SESSION_COOKIE_SECURE = os.getenv('SESSION_COOKIE_SECURE', 'False') == 'True'
 SESSION_COOKIE_SAMESITE = os.getenv('SESSION_COOKIE_SAMESITE', 'Lax')
 SESSION_COOKIE_AGE = 86400  # 24 hours
-SESSION_SAVE_EVERY_REQUEST = True  # Save session on every request to extend expiry
+# Sliding expiry is handled by core.middleware.SlidingSessionMiddleware, which only
+# re-saves a session after this fraction of SESSION_COOKIE_AGE has passed since its
+# last save, instead of writing it on every request
+SESSION_SAVE_EVERY_REQUEST = False
+SESSION_REFRESH_FRACTION = float(os.getenv('SESSION_REFRESH_FRACTION', '0.1'))
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False  # Keep session after browser closes
+# Session storage: db (default), cached_db (reads served from CACHES) or signed_cookies
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_ENGINES[os.getenv('SESSION_BACKEND', 'db')]
 
 # CSRF configuration
 CSRF_COOKIE_HTTPONLY = False  # Frontend needs to read CSRF token
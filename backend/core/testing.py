@@ -0,0 +1,80 @@
+"""
+Query-count budgets for API tests.
+
+``QueryBudgetMixin.assertQueryBudget`` makes the same request against a
+small dataset and one ``BUDGET_SCALE`` times larger. It fails when the query
+count grows with the data (a query per row, usually a missing
+``select_related``/``prefetch_related`` or a dotted serializer ``source``) or
+goes over the declared budget, and lists the SQL that ran.
+"""
+import re
+from collections import Counter
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+BUDGET_SCALE = 10
+
+# Literals differ between the rows of an N+1, the statement does not
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def _consume(response):
+    # Streaming responses run their queries as the body is read
+    if getattr(response, 'streaming', False):
+        b''.join(response.streaming_content)
+    return response
+
+
+def format_queries(queries):
+    shapes = Counter(_LITERALS.sub('?', query['sql']) for query in queries)
+    lines = [f'{number}. {query["sql"]}' for number, query in enumerate(queries, 1)]
+    repeated = [f'{count}x {sql}' for sql, count in shapes.most_common() if count > 1]
+    if repeated:
+        lines += ['Repeated statements:', *repeated]
+    return '\n'.join(lines)
+
+
+class QueryBudgetMixin:
+    """TestCase mixin; see the module docstring."""
+
+    def count_queries(self, request, *args):
+        with CaptureQueriesContext(connection) as context:
+            response = _consume(request(*args))
+        return response, context.captured_queries
+
+    def assertQueryBudget(self, budget, request, seed, rows=5, setup=None, status_code=None):
+        """
+        Assert that ``request()`` stays within ``budget`` queries whether
+        ``seed(count)`` has added ``rows`` or ``rows * BUDGET_SCALE`` rows.
+
+        ``setup()``, when given, runs before each request outside the count
+        and its result is passed to ``request`` (e.g. a fresh task to delete).
+        The response must have ``status_code``, or any non-error status.
+        """
+        def call():
+            args = (setup(),) if setup is not None else ()
+            response, queries = self.count_queries(request, *args)
+            if status_code is None:
+                self.assertLess(response.status_code, 400, getattr(response, 'content', b'')[:500])
+            else:
+                self.assertEqual(response.status_code, status_code, getattr(response, 'content', b'')[:500])
+            return response, queries
+
+        seed(rows)
+        # Warm up per-process caches (content types, permissions) first
+        call()
+        _, small = call()
+        seed(rows * (BUDGET_SCALE - 1))
+        response, large = call()
+
+        environ = getattr(response, 'request', None) or {}
+        label = f"{environ.get('REQUEST_METHOD', '')} {environ.get('PATH_INFO', '')}".strip() or 'The request'
+        if len(large) != len(small):
+            self.fail(
+                f'{label} ran {len(small)} queries with {rows} rows but {len(large)} with '
+                f'{rows * BUDGET_SCALE}; the count grows with the data (N+1?):\n{format_queries(large)}'
+            )
+        if len(large) > budget:
+            self.fail(f'{label} ran {len(large)} queries, over its budget of {budget}:\n{format_queries(large)}')
+        return len(large)
@@ -0,0 +1,49 @@
+"""
+Archival of old Done tasks.
+
+``manage.py archive_tasks`` moves Done tasks not updated for
+``TASK_ARCHIVE_AFTER_DAYS`` days from tasks_task to tasks_task_archive, one
+batch per transaction, so lists, searches and counts over the hot table stop
+paying for them. Each batch is claimed with ``SELECT ... FOR UPDATE SKIP
+LOCKED`` where the database supports it, so the archiver never waits on
+rows a request is writing.
+
+Archived tasks keep their ids. They are read through TaskWithArchive (a
+UNION ALL view) by task retrieves and by lists and exports with
+``?include_archived=true``; they cannot be updated or deleted.
+
+Rows are removed from tasks_task without Django's per-row delete signals;
+``tasks_archived`` carries the bookkeeping (response cache, status counters,
+tombstones and events) for the whole batch instead.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ArchivedTask, Task
+from .signals import tasks_archived
+
+
+def get_archive_age():
+    return timedelta(days=getattr(settings, 'TASK_ARCHIVE_AFTER_DAYS', 90))
+
+
+def archive_candidates(cutoff):
+    """Done tasks last updated before ``cutoff``, from the partial index on Done tasks"""
+    return Task.objects.filter(status=Task.Status.DONE, updated_at__lt=cutoff).order_by('updated_at')
+
+
+def archive_batch(cutoff, batch_size):
+    """Move up to ``batch_size`` candidates to the archive in one transaction; returns how many"""
+    with transaction.atomic():
+        tasks = list(archive_candidates(cutoff).select_for_update(skip_locked=True)[:batch_size])
+        if not tasks:
+            return 0
+        archived_at = timezone.now()
+        ArchivedTask.objects.bulk_create([ArchivedTask.from_task(task, archived_at) for task in tasks])
+        # Nothing references tasks, so the rows can go without the collector
+        Task.objects.filter(pk__in=[task.pk for task in tasks])._raw_delete(Task.objects.db)
+        tasks_archived.send(sender=Task, instances=tasks)
+    return len(tasks)
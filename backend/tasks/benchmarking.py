@@ -0,0 +1,165 @@
+"""
+Helpers for seeding large synthetic task tables for benchmarks.
+
+These write straight through ``bulk_create`` and are meant for scratch
+databases only; never point them at production data.
+"""
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import CommandError
+from django.db import connection
+from django.utils import timezone
+
+from .models import Task, TaskStatusCounter
+
+User = get_user_model()
+
+# Every account a benchmark command creates is named bench_*
+BENCH_USERNAME_PREFIX = 'bench_'
+BENCH_USER_PREFIX = 'bench_user_'
+BENCH_TASK_DESCRIPTION = 'Synthetic benchmark task'
+
+# Bulk inserts skip hashing; the value below is an unusable password.
+UNUSABLE_PASSWORD = '!benchmark'
+
+# Password set by ``seed_benchmark_data`` so the login benchmark can sign in
+BENCH_PASSWORD = 'benchmark-password'
+
+
+@contextmanager
+def manual_timestamps(model):
+    """Temporarily disable auto_now/auto_now_add so seeded rows keep their spread of dates."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+def seed_users(count, batch_size=5000):
+    """Create ``count`` benchmark members, reusing ones that already exist."""
+    existing = User.objects.filter(username__startswith=BENCH_USER_PREFIX).count()
+    for start in range(existing, count, batch_size):
+        User.objects.bulk_create(
+            [
+                User(
+                    username=f'{BENCH_USER_PREFIX}{i}',
+                    email=f'{BENCH_USER_PREFIX}{i}@example.com',
+                    password=UNUSABLE_PASSWORD,
+                    role=User.Role.MEMBER,
+                )
+                for i in range(start, min(start + batch_size, count))
+            ],
+            batch_size=batch_size,
+        )
+    return list(
+        User.objects.filter(username__startswith=BENCH_USER_PREFIX)
+        .order_by('id')
+        .values_list('id', flat=True)[:count]
+    )
+
+
+def set_benchmark_password(password=BENCH_PASSWORD):
+    """Give every benchmark member ``password``, hashed once and shared, in one UPDATE."""
+    return User.objects.filter(username__startswith=BENCH_USER_PREFIX).update(password=make_password(password))
+
+
+def seed_tasks(count, assignee_ids, seed=0, batch_size=10000, span_days=730, stdout=None):
+    """
+    Insert ``count`` tasks spread over ``span_days`` of history.
+
+    Status and assignee are skewed the way real trackers are: most tasks are
+    Done, and a small share of the team owns a large share of the work.
+    The status counters are rebuilt afterwards, as the inserts bypass the
+    signals that keep them current.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    statuses = [Task.Status.DONE, Task.Status.IN_PROGRESS, Task.Status.TODO]
+    status_weights = [60, 15, 25]
+    span_seconds = span_days * 86400
+
+    created = 0
+    with manual_timestamps(Task):
+        while created < count:
+            batch = []
+            for _ in range(min(batch_size, count - created)):
+                created_at = now - timedelta(seconds=rng.randrange(span_seconds))
+                status = rng.choices(statuses, status_weights)[0]
+                # Pareto-ish skew: low indexes get most of the tasks
+                assignee_id = None
+                if assignee_ids and rng.random() > 0.05:
+                    if rng.random() < 0.5:
+                        index = min(int(rng.paretovariate(1.2)) - 1, len(assignee_ids) - 1)
+                    else:
+                        index = rng.randrange(len(assignee_ids))
+                    assignee_id = assignee_ids[index]
+                deadline = None
+                if rng.random() < 0.7:
+                    deadline = created_at + timedelta(days=rng.randrange(1, 60))
+                batch.append(Task(
+                    title=f'Task {created + len(batch)}',
+                    description=BENCH_TASK_DESCRIPTION,
+                    status=status,
+                    assignee_id=assignee_id,
+                    deadline=deadline,
+                    created_at=created_at,
+                    updated_at=created_at + timedelta(seconds=rng.randrange(86400)),
+                ))
+            Task.objects.bulk_create(batch, batch_size=batch_size)
+            created += len(batch)
+            if stdout is not None:
+                stdout.write(f'  seeded {created}/{count} tasks')
+    TaskStatusCounter.rebuild()
+    analyze()
+    return created
+
+
+def find_real_rows():
+    """Describe the rows that no benchmark seeding created, or return None for a scratch database."""
+    users = User.objects.exclude(username__startswith=BENCH_USERNAME_PREFIX)
+    if users.exists():
+        return f'users such as "{users.order_by("id").values_list("username", flat=True).first()}"'
+    if Task.objects.exclude(description=BENCH_TASK_DESCRIPTION).exists():
+        return 'tasks that were not seeded'
+    return None
+
+
+def add_scratch_database_argument(parser):
+    parser.add_argument(
+        '--scratch-database', action='store_true',
+        help='Confirm that the default database is a scratch database the benchmark may fill.',
+    )
+
+
+def check_scratch_database(options):
+    """
+    Raise CommandError unless ``--scratch-database`` was passed and the
+    default database holds nothing but benchmark rows.
+    """
+    if not options['scratch_database']:
+        raise CommandError(
+            f'This seeds synthetic users and tasks into {connection.settings_dict["NAME"]}. '
+            'Point it at a scratch database and pass --scratch-database.'
+        )
+    real_rows = find_real_rows()
+    if real_rows is not None:
+        raise CommandError(f'The database holds {real_rows}; run the benchmark on a scratch database.')
+
+
+def analyze():
+    """Refresh planner statistics after a bulk load."""
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
@@ -0,0 +1,78 @@
+"""
+Response cache for task list and detail requests.
+
+Responses are cached per role scope: Managers and Admins see every task and
+share one scope, while each Member has their own. Keys also carry the
+normalized query parameters and the ``tasks`` namespace version, which is
+bumped whenever a task or user is written (see tasks/signals.py), so a write
+invalidates every cached response at once.
+
+Each entry stores the response's ETag next to its data, so a hit (and a 304
+for a client that already has it) needs no query at all. Tasks becoming
+overdue change responses without any write, so an entry expires no later
+than the next open deadline among its tasks (see ``get_entry_timeout``).
+"""
+import hashlib
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from core.cache import get_counters, incr_counter, normalize_params, reset_counters, versioned_key
+
+NAMESPACE = 'tasks'
+COUNTERS = ['hits', 'misses']
+
+
+def is_enabled():
+    return getattr(settings, 'TASK_RESPONSE_CACHE', False)
+
+
+def get_timeout():
+    return getattr(settings, 'TASK_RESPONSE_CACHE_TIMEOUT', 300)
+
+
+def user_scope(user):
+    """Cache scope for ``user``: shared for Managers/Admins, per user for Members."""
+    if user.role == user.Role.MEMBER:
+        return f'member:{user.pk}'
+    return 'all'
+
+
+def get_entry_timeout(next_deadline=None):
+    """The cache timeout, cut short so an entry is gone once ``next_deadline`` passes."""
+    timeout = get_timeout()
+    if next_deadline is not None:
+        timeout = min(timeout, max(math.ceil((next_deadline - timezone.now()).total_seconds()), 1))
+    return timeout
+
+
+def response_key(request, action, pk=None):
+    # The absolute path is part of the key because pagination links embed it.
+    params = normalize_params(request.query_params)
+    url = f'{request.build_absolute_uri(request.path)}?{params}'
+    digest = hashlib.sha1(f'{request.accepted_renderer.format}|{url}'.encode()).hexdigest()
+    return versioned_key(NAMESPACE, 'response', user_scope(request.user), action, pk or '-', digest)
+
+
+def get_response_entry(key):
+    """Return the cached ``{'data', 'etag'}`` entry for ``key`` and count the hit or miss."""
+    entry = cache.get(key)
+    incr_counter(NAMESPACE, 'hits' if entry is not None else 'misses')
+    return entry
+
+
+def set_response_entry(key, data, etag, next_deadline=None):
+    cache.set(key, {'data': data, 'etag': etag}, get_entry_timeout(next_deadline))
+
+
+def get_stats():
+    stats = get_counters(NAMESPACE, COUNTERS)
+    total = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = stats['hits'] / total if total else 0.0
+    return stats
+
+
+def reset_stats():
+    reset_counters(NAMESPACE, COUNTERS)
@@ -0,0 +1,388 @@
+"""
+Task change feed behind ``GET /api/tasks/events/`` (Server-Sent Events).
+
+Publishing: the Task signals (see tasks/signals.py) queue ``created``,
+``updated`` and ``deleted`` changes. When the transaction commits, the
+changed rows are read in one query and each event is appended to a log in the
+shared cache under a sequence number, so every worker process can see it.
+
+Fan-out: each process has one TaskEventHub. While streams are open, a
+background thread polls the log, and local publishes wake it straight away.
+The thread keeps recent events in memory and notifies the streams, so each
+event is read from the cache once per process however many streams are
+open. Streams filter events the way TaskViewSet.get_queryset scopes tasks; a
+Member is also sent ``deleted`` when a task is reassigned away from them.
+
+A stream that reconnects with ``Last-Event-ID`` is sent the events it missed
+while the cache still has them. When it does not, the stream gets a
+``reset`` event and the client should refetch.
+
+Like the task response cache, the feed needs a shared cache to reach across
+worker processes, so it is only enabled by default with REDIS_URL, and then
+only with ASYNC_VIEWS. The sync view refuses to stream unless TASK_EVENTS_SYNC
+is set, since each stream would hold a WSGI worker for its whole lifetime.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Task
+from .serializers import TaskFastReadSerializer
+
+logger = logging.getLogger(__name__)
+
+CREATED = 'created'
+UPDATED = 'updated'
+DELETED = 'deleted'
+RESET = 'reset'
+
+SEQUENCE_KEY = 'task-events:seq'
+EVENT_KEY = 'task-events:{}'
+
+# Events kept in memory per process
+RING_SIZE = 1000
+# A sequence number whose event is missing may belong to a publisher between
+# incrementing the sequence and writing the event; wait this long before
+# treating the event as lost
+MISSING_EVENT_GRACE = 5.0
+
+RETRY_MESSAGE = 'retry: 3000\n\n'
+HEARTBEAT_MESSAGE = ': keepalive\n\n'
+
+
+def is_enabled():
+    return getattr(settings, 'TASK_EVENTS', False)
+
+
+def allows_sync_streams():
+    return getattr(settings, 'TASK_EVENTS_SYNC', False)
+
+
+def get_ttl():
+    return getattr(settings, 'TASK_EVENTS_TTL', 300)
+
+
+def get_poll_interval():
+    return getattr(settings, 'TASK_EVENTS_POLL_INTERVAL', 0.5)
+
+
+def get_heartbeat():
+    return getattr(settings, 'TASK_EVENTS_HEARTBEAT', 15)
+
+
+def get_stream_timeout():
+    return getattr(settings, 'TASK_EVENTS_STREAM_TIMEOUT', 300)
+
+
+def _initial_sequence():
+    # From the clock, like core.cache versions: a sequence that was evicted
+    # never comes back with ids clients have already seen
+    return time.time_ns() // 1000
+
+
+def current_sequence():
+    value = cache.get(SEQUENCE_KEY)
+    if value is None:
+        cache.add(SEQUENCE_KEY, _initial_sequence(), None)
+        value = cache.get(SEQUENCE_KEY)
+    return value
+
+
+def _reserve_sequence(count):
+    """Reserve ``count`` consecutive ids and return the last one."""
+    try:
+        return cache.incr(SEQUENCE_KEY, count)
+    except ValueError:
+        cache.add(SEQUENCE_KEY, _initial_sequence(), None)
+        return cache.incr(SEQUENCE_KEY, count)
+
+
+def queue_changes(changes):
+    """Publish ``(type, task_id, previous_assignee_id)`` changes once the transaction commits."""
+    if is_enabled() and changes:
+        transaction.on_commit(lambda: publish_changes(changes))
+
+
+def publish_changes(changes):
+    task_ids = [task_id for kind, task_id, _ in changes if kind != DELETED]
+    rows = {}
+    if task_ids:
+        rows = {row['id']: row for row in TaskFastReadSerializer.project(Task.objects.filter(pk__in=task_ids))}
+
+    tz = timezone.get_current_timezone()
+    events = []
+    for kind, task_id, previous_assignee in changes:
+        if kind == DELETED:
+            task, assignee = {'id': task_id}, previous_assignee
+        elif task_id in rows:
+            task, assignee = TaskFastReadSerializer.to_representation(rows[task_id], tz), rows[task_id]['assignee']
+        else:
+            # Deleted before the commit; its own deleted event follows
+            continue
+        events.append({'type': kind, 'task': task, 'assignee': assignee, 'previous_assignee': previous_assignee})
+    append_events(events)
+
+
+def append_events(events):
+    if not events:
+        return
+    last = _reserve_sequence(len(events))
+    first = last - len(events) + 1
+    cache.set_many(
+        {EVENT_KEY.format(seq): {**event, 'id': seq} for seq, event in zip(range(first, last + 1), events)},
+        get_ttl(),
+    )
+    hub.wake()
+
+
+def fetch_events(first, last):
+    """Read events ``first..last`` from the log, or None if any is gone"""
+    keys = [EVENT_KEY.format(seq) for seq in range(first, last + 1)]
+    found = cache.get_many(keys)
+    if len(found) < len(keys):
+        return None
+    return [found[key] for key in keys]
+
+
+def scope_event(event, user):
+    """The event as ``user`` may see it, or None"""
+    if user.role != user.Role.MEMBER or event['assignee'] == user.pk:
+        return event
+    if event['previous_assignee'] == user.pk:
+        # Reassigned away: gone from the Member's task list
+        return {**event, 'type': DELETED, 'task': {'id': event['task']['id']}}
+    return None
+
+
+def format_event(event):
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['task'])}\n\n"
+
+
+class TaskEventHub:
+    """
+    Per-process fan-out of the event log.
+
+    ``events`` holds every logged event with an id in ``(floor, last_seq]``
+    (older ones are read from the cache on demand).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = set()
+        self.events = deque()
+        self.last_seq = self.floor = None
+        self.missing_since = None
+        self.wakeup = threading.Event()
+        self.thread = None
+
+    def subscribe(self, subscriber):
+        start = current_sequence()
+        with self.lock:
+            self.subscribers.add(subscriber)
+            if self.thread is None:
+                # Whatever was buffered before the hub went idle is stale
+                self.events.clear()
+                self.last_seq = self.floor = start
+                self.missing_since = None
+                self.thread = threading.Thread(target=self.run, name='task-event-hub', daemon=True)
+                self.thread.start()
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def wake(self):
+        self.wakeup.set()
+
+    def run(self):
+        while True:
+            with self.lock:
+                if not self.subscribers:
+                    self.thread = None
+                    return
+                subscribers = list(self.subscribers)
+            try:
+                changed = self.poll()
+            except Exception:
+                logger.exception('Reading the task event log failed')
+                changed = False
+            if changed:
+                for subscriber in subscribers:
+                    subscriber.notify()
+            self.wakeup.wait(get_poll_interval())
+            self.wakeup.clear()
+
+    def poll(self):
+        """Buffer events logged since the last poll; returns whether anything changed"""
+        current = cache.get(SEQUENCE_KEY)
+        last = self.last_seq
+        if current is None or current <= last:
+            return False
+        if current - last > RING_SIZE:
+            # Far behind, or the sequence was evicted and restarted: start over
+            with self.lock:
+                self.events.clear()
+                self.last_seq = self.floor = current
+            return True
+
+        found = cache.get_many([EVENT_KEY.format(seq) for seq in range(last + 1, current + 1)])
+        now = time.monotonic()
+        arrived = []
+        lost = None
+        for seq in range(last + 1, current + 1):
+            event = found.get(EVENT_KEY.format(seq))
+            if event is None:
+                self.missing_since = self.missing_since or now
+                if now - self.missing_since < MISSING_EVENT_GRACE:
+                    break
+                lost = seq
+            else:
+                arrived.append(event)
+            self.missing_since = None
+            last = seq
+
+        with self.lock:
+            for event in arrived:
+                if len(self.events) == RING_SIZE:
+                    self.floor = self.events.popleft()['id']
+                self.events.append(event)
+            if lost is not None:
+                # Streams that had not seen it yet must reset
+                self.floor = max(self.floor, lost)
+            self.last_seq = last
+        return bool(arrived) or lost is not None
+
+    def is_buffered(self, since):
+        return since >= self.floor
+
+    def events_after(self, since):
+        """Events with ids above ``since``, or None if some of them are no longer available"""
+        with self.lock:
+            floor = self.floor
+            newer = []
+            for event in reversed(self.events):
+                if event['id'] <= since:
+                    break
+                newer.append(event)
+        newer.reverse()
+        if since >= floor:
+            return newer
+        if floor - since > RING_SIZE:
+            return None
+        older = fetch_events(since + 1, floor)
+        if older is None:
+            return None
+        return older + [event for event in newer if event['id'] > floor]
+
+
+hub = TaskEventHub()
+
+
+class Subscriber:
+    """One open stream; ``notify()`` is called from the hub thread."""
+
+    def __init__(self, user, since):
+        self.user = user
+        self.since = since
+
+    def take(self):
+        """Format the events this stream has not sent yet"""
+        events = hub.events_after(self.since)
+        if events is None:
+            self.since = hub.last_seq
+            return f'id: {self.since}\nevent: {RESET}\ndata: {{}}\n\n'
+        if not events:
+            return ''
+        self.since = events[-1]['id']
+        visible = (scope_event(event, self.user) for event in events)
+        return ''.join(format_event(event) for event in visible if event is not None)
+
+
+class ThreadSubscriber(Subscriber):
+    def __init__(self, user, since):
+        super().__init__(user, since)
+        self.ready = threading.Event()
+
+    def notify(self):
+        self.ready.set()
+
+    def wait(self, timeout):
+        woken = self.ready.wait(timeout)
+        self.ready.clear()
+        return woken
+
+
+class AsyncSubscriber(Subscriber):
+    def __init__(self, user, since):
+        super().__init__(user, since)
+        self.loop = asyncio.get_running_loop()
+        self.ready = asyncio.Event()
+
+    def notify(self):
+        try:
+            self.loop.call_soon_threadsafe(self.ready.set)
+        except RuntimeError:
+            # The stream's event loop has closed
+            pass
+
+    async def wait(self, timeout):
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.ready.clear()
+
+
+def stream_events(user, since=None):
+    """
+    SSE body for WSGI. Holds a worker thread for as long as the stream is
+    open; serve the feed through the ASGI profile in production.
+    """
+    subscriber = ThreadSubscriber(user, current_sequence() if since is None else since)
+    hub.subscribe(subscriber)
+    deadline = time.monotonic() + get_stream_timeout()
+    try:
+        yield RETRY_MESSAGE
+        while time.monotonic() < deadline:
+            chunk = subscriber.take()
+            if chunk:
+                yield chunk
+            if not subscriber.wait(get_heartbeat()):
+                yield HEARTBEAT_MESSAGE
+    finally:
+        hub.unsubscribe(subscriber)
+
+
+async def astream_events(user, since=None):
+    """SSE body for ASGI: waiting for events does not hold a thread."""
+    from asgiref.sync import sync_to_async
+
+    if since is None:
+        since = await sync_to_async(current_sequence, thread_sensitive=False)()
+    subscriber = AsyncSubscriber(user, since)
+    await sync_to_async(hub.subscribe, thread_sensitive=False)(subscriber)
+    deadline = time.monotonic() + get_stream_timeout()
+    try:
+        yield RETRY_MESSAGE
+        while time.monotonic() < deadline:
+            if hub.is_buffered(subscriber.since):
+                chunk = subscriber.take()
+            else:
+                # Catching up reads the cache
+                chunk = await sync_to_async(subscriber.take, thread_sensitive=False)()
+            if chunk:
+                yield chunk
+            if not await subscriber.wait(get_heartbeat()):
+                yield HEARTBEAT_MESSAGE
+    finally:
+        hub.unsubscribe(subscriber)
@@ -0,0 +1,100 @@
+"""
+Streaming task export.
+
+Rows are read with a chunked server-side cursor and written out one at a
+time, so memory use does not grow with the size of the table.
+"""
+import csv
+import json
+
+from django.utils import timezone
+
+from .serializers import format_datetime
+
+EXPORT_FIELDS = [
+    ('id', 'id'),
+    ('title', 'title'),
+    ('description', 'description'),
+    ('status', 'status'),
+    ('deadline', 'deadline'),
+    ('is_overdue', 'overdue'),
+    ('assignee', 'assignee_id'),
+    ('assignee_username', 'assignee__username'),
+    ('assignee_email', 'assignee__email'),
+    ('assignee_role', 'assignee__role'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+]
+
+DATETIME_FIELDS = {'deadline', 'created_at', 'updated_at'}
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Flush output in blocks of about this many characters rather than per row
+STREAM_BUFFER_SIZE = 64 * 1024
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield each task as a dict of the EXPORT_FIELDS columns: TaskReadSerializer's
+    fields and values, except that the ``assignee_*`` columns are always
+    present (None for unassigned tasks).
+    """
+    names = [name for name, _ in EXPORT_FIELDS]
+    lookups = [lookup for _, lookup in EXPORT_FIELDS]
+    tz = timezone.get_current_timezone()
+    if 'overdue' not in queryset.query.annotations:
+        queryset = queryset.with_overdue()
+    for values in queryset.values_list(*lookups).iterator(chunk_size=chunk_size):
+        row = dict(zip(names, values))
+        for name in DATETIME_FIELDS:
+            row[name] = format_datetime(row[name], tz)
+        yield row
+
+
+def buffered(lines, size=STREAM_BUFFER_SIZE):
+    """Join small pieces of output into larger chunks for the WSGI server."""
+    buffer = []
+    length = 0
+    for line in lines:
+        buffer.append(line)
+        length += len(line)
+        if length >= size:
+            yield ''.join(buffer)
+            buffer = []
+            length = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([name for name, _ in EXPORT_FIELDS])
+    for row in rows:
+        yield writer.writerow(['' if value is None else value for value in row.values()])
+
+
+def _ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row) + '\n'
+
+
+def stream_csv(rows):
+    return buffered(_csv_lines(rows))
+
+
+def stream_ndjson(rows):
+    return buffered(_ndjson_lines(rows))
+
+
+STREAMERS = {
+    'csv': stream_csv,
+    'ndjson': stream_ndjson,
+}
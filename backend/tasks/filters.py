@@ -0,0 +1,75 @@
+import django_filters
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import filters
+
+from .models import Task, TaskWithArchive
+from .search import get_search_engine
+
+
+class TaskFilter(django_filters.FilterSet):
+    """
+    ``?status=``, ``?assignee=`` and ``?overdue=true|false``.
+
+    Overdue is evaluated in SQL against the database clock; ``overdue=true``
+    is served by the partial index on open tasks' deadlines.
+    """
+
+    overdue = django_filters.BooleanFilter(method='filter_overdue')
+
+    class Meta:
+        model = Task
+        fields = ['status', 'assignee']
+
+    def filter_overdue(self, queryset, name, value):
+        return queryset.overdue(value)
+
+
+class TaskWithArchiveFilter(TaskFilter):
+    """TaskFilter for reads that include archived tasks."""
+
+    class Meta(TaskFilter.Meta):
+        model = TaskWithArchive
+
+
+class TaskFilterBackend(DjangoFilterBackend):
+    """Applies the view's filterset, or TaskWithArchiveFilter to TaskWithArchive querysets."""
+
+    def get_filterset_class(self, view, queryset=None):
+        if queryset is not None and queryset.model is TaskWithArchive:
+            return TaskWithArchiveFilter
+        return super().get_filterset_class(view, queryset)
+
+
+class TaskSearchFilter(filters.SearchFilter):
+    """
+    ``?search=`` backed by the database's full-text index.
+
+    Matching rows are annotated with ``search_rank`` so that results come
+    back in relevance order, and with ``search_snippet`` when
+    ``?highlight=true`` is given. Falls back to the stock icontains
+    ``SearchFilter`` when no full-text engine is available.
+    """
+
+    highlight_param = 'highlight'
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+
+        engine = get_search_engine(queryset)
+        if engine is None:
+            return super().filter_queryset(request, queryset, view)
+
+        highlight = request.query_params.get(self.highlight_param, '').lower() in ('true', '1', 'yes')
+        return engine.search(queryset, search_terms, highlight=highlight)
+
+
+class TaskOrderingFilter(filters.OrderingFilter):
+    """OrderingFilter that defaults to relevance order for full-text searches."""
+
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        if not params and 'search_rank' in queryset.query.annotations:
+            return ['-search_rank']
+        return super().get_ordering(request, queryset, view)
@@ -0,0 +1,229 @@
+"""
+Streaming bulk import of tasks from CSV or NDJSON uploads.
+
+The upload is read one line at a time and processed in fixed-size batches:
+each batch resolves its assignees with one query (cached across batches),
+validates rows in plain Python and inserts the valid ones with a single
+``bulk_create``. Memory use is bounded by the batch size, not the file size.
+"""
+import csv
+import io
+import json
+from datetime import datetime, time
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.backends.base.operations import BaseDatabaseOperations
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Task
+from .signals import tasks_bulk_saved
+
+User = get_user_model()
+
+TITLE_MAX_LENGTH = Task._meta.get_field('title').max_length
+STATUS_LOOKUP = {value.lower(): value for value in Task.Status.values}
+# Ids outside this range cannot exist, and some databases reject them in a query
+PK_MIN, PK_MAX = BaseDatabaseOperations.integer_field_ranges[User._meta.pk.get_internal_type()]
+
+
+def read_csv(fileobj):
+    """Yield ``(line_number, row, error)`` for each record of a CSV upload."""
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    try:
+        for row in reader:
+            yield reader.line_num, row, None
+    except (csv.Error, UnicodeDecodeError) as exc:
+        yield reader.line_num, None, {'non_field_errors': [f'Could not parse CSV: {exc}']}
+    finally:
+        text.detach()
+
+
+def read_ndjson(fileobj):
+    """Yield ``(line_number, row, error)`` for each line of an NDJSON upload."""
+    for line_number, line in enumerate(fileobj, start=1):
+        try:
+            line = line.decode('utf-8-sig').strip()
+        except UnicodeDecodeError:
+            yield line_number, None, {'non_field_errors': ['Line is not valid UTF-8.']}
+            continue
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_number, None, {'non_field_errors': ['Line is not valid JSON.']}
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, {'non_field_errors': ['Expected a JSON object.']}
+            continue
+        yield line_number, row, None
+
+
+READERS = {
+    'csv': read_csv,
+    'ndjson': read_ndjson,
+}
+
+
+class TaskImporter:
+    """Validate and insert rows from a reader in batches."""
+
+    batch_size = 1000
+    max_reported_errors = 100
+
+    def __init__(self, dry_run=False, batch_size=None):
+        self.dry_run = dry_run
+        if batch_size:
+            self.batch_size = batch_size
+        # Assignee lookups by 'id:<pk>' / 'username:<name>', shared across batches
+        self.assignees = {}
+        self.rows = 0
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def run(self, records):
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                self.process_batch(batch)
+                batch = []
+        if batch:
+            self.process_batch(batch)
+        return self.report()
+
+    def report(self):
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'failed': self.failed,
+            'dry_run': self.dry_run,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+        }
+
+    def process_batch(self, batch):
+        self.resolve_assignees(row for _, row, _ in batch if row is not None)
+
+        tasks = []
+        for line_number, row, error in batch:
+            self.rows += 1
+            if error is None:
+                task, error = self.build_task(row)
+            if error:
+                self.add_error(line_number, error)
+            else:
+                tasks.append(task)
+
+        if tasks and not self.dry_run:
+            with transaction.atomic():
+                created = Task.objects.bulk_create(tasks)
+                tasks_bulk_saved.send(sender=Task, instances=created, created=True)
+        self.created += len(tasks)
+
+    def add_error(self, line_number, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_reported_errors:
+            self.errors.append({'row': line_number, 'errors': errors})
+
+    @staticmethod
+    def assignee_key(row):
+        """Return the lookup key for a row's assignee, or None when unassigned."""
+        username = str(row.get('assignee_username') or '').strip()
+        if username:
+            return f'username:{username}'
+        value = str(row.get('assignee') or '').strip()
+        if not value:
+            return None
+        # isdigit() alone accepts characters such as "²" that int() rejects
+        if value.isascii() and value.isdigit():
+            return f'id:{int(value)}'
+        return f'username:{value}'
+
+    def resolve_assignees(self, rows):
+        """Load every assignee the batch refers to that is not cached yet, in one query."""
+        ids, usernames = set(), set()
+        for row in rows:
+            key = self.assignee_key(row)
+            if key is None or key in self.assignees:
+                continue
+            kind, value = key.split(':', 1)
+            if kind == 'id':
+                if PK_MIN <= int(value) <= PK_MAX:
+                    ids.add(int(value))
+                else:
+                    # Reported as a missing user by build_task
+                    self.assignees[key] = None
+            else:
+                usernames.add(value)
+        if not ids and not usernames:
+            return
+
+        for key in [f'id:{pk}' for pk in ids] + [f'username:{name}' for name in usernames]:
+            self.assignees[key] = None
+        users = User.objects.filter(Q(id__in=ids) | Q(username__in=usernames)).only('id', 'username', 'is_active')
+        for user in users:
+            if user.id in ids:
+                self.assignees[f'id:{user.id}'] = user
+            if user.username in usernames:
+                self.assignees[f'username:{user.username}'] = user
+
+    def build_task(self, row):
+        errors = {}
+
+        title = str(row.get('title') or '').strip()
+        if not title:
+            errors['title'] = ['This field is required.']
+        elif len(title) > TITLE_MAX_LENGTH:
+            errors['title'] = [f'Ensure this field has no more than {TITLE_MAX_LENGTH} characters.']
+
+        status_value = str(row.get('status') or '').strip()
+        status = STATUS_LOOKUP.get(status_value.lower(), None) if status_value else Task.Status.TODO
+        if status is None:
+            errors['status'] = [f"Status must be one of: {', '.join(Task.Status.values)}"]
+
+        deadline, deadline_error = self.parse_deadline(row.get('deadline'))
+        if deadline_error:
+            errors['deadline'] = [deadline_error]
+
+        assignee = None
+        key = self.assignee_key(row)
+        if key is not None:
+            assignee = self.assignees.get(key)
+            if assignee is None:
+                errors['assignee'] = [f'User "{key.split(":", 1)[1]}" does not exist.']
+            elif not assignee.is_active:
+                errors['assignee'] = ['Cannot assign task to inactive user.']
+
+        if errors:
+            return None, errors
+        return Task(
+            title=title,
+            description=str(row.get('description') or ''),
+            status=status,
+            deadline=deadline,
+            assignee=assignee,
+        ), None
+
+    @staticmethod
+    def parse_deadline(value):
+        value = str(value or '').strip()
+        if not value:
+            return None, None
+        try:
+            parsed = parse_datetime(value)
+            if parsed is None:
+                day = parse_date(value)
+                parsed = datetime.combine(day, time.min) if day else None
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            return None, 'Datetime has wrong format. Use ISO 8601.'
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed, None
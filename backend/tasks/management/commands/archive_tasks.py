@@ -0,0 +1,45 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks import archive
+
+
+class Command(BaseCommand):
+    help = (
+        'Move Done tasks not updated for TASK_ARCHIVE_AFTER_DAYS days to the archive table, '
+        'one batch per transaction (see tasks/archive.py). Safe to run while serving; '
+        'schedule it daily, e.g. from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days', type=int,
+            help='Archive Done tasks last updated this many days ago (default: TASK_ARCHIVE_AFTER_DAYS).',
+        )
+        parser.add_argument('--batch-size', type=int, default=500, help='Tasks per transaction (default: 500).')
+        parser.add_argument(
+            '--pause', type=float, default=0.1,
+            help='Seconds to wait between batches, leaving room for other writers (default: 0.1).',
+        )
+        parser.add_argument('--max-batches', type=int, help='Stop after this many batches.')
+
+    def handle(self, *args, **options):
+        age = archive.get_archive_age()
+        if options['older_than_days'] is not None:
+            age = timedelta(days=options['older_than_days'])
+        cutoff = timezone.now() - age
+
+        total = batches = 0
+        while options['max_batches'] is None or batches < options['max_batches']:
+            moved = archive.archive_batch(cutoff, options['batch_size'])
+            if not moved:
+                break
+            total += moved
+            batches += 1
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Archived {total} tasks')
+            time.sleep(options['pause'])
+        self.stdout.write(self.style.SUCCESS(f'Archived {total} tasks in {batches} batches'))
@@ -0,0 +1,217 @@
+import asyncio
+import itertools
+import json
+import random
+import subprocess
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from authapp.tokens import issue_tokens
+from core.loadtest import PROFILES, ServerError, free_port, run_requests, start_server, wait_until_ready
+from tasks.benchmarking import BENCH_PASSWORD, BENCH_USER_PREFIX
+from tasks.models import Task
+
+from .seed_benchmark_data import BENCH_MANAGER
+
+User = get_user_model()
+
+SCENARIOS = ['list', 'filter', 'search', 'retrieve', 'update', 'login']
+
+# Distinct requests built per scenario; clients cycle through them
+REQUESTS_PER_SCENARIO = 1000
+
+JSON_HEADERS = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Drive the task list, filter, search, retrieve, update and login endpoints with '
+        'concurrent clients and report p50/p95/p99 latency and throughput per scenario as '
+        'JSON, to compare between commits. Runs against the dataset from seed_benchmark_data: '
+        'starts Gunicorn with a serving profile, or targets a running server with --host '
+        '(which must share this SECRET_KEY and database). The update scenario writes task '
+        'statuses.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS)
+        parser.add_argument('--concurrency', type=int, default=50, help='Requests kept in flight.')
+        parser.add_argument('--duration', type=float, default=15, help='Seconds of load per scenario.')
+        parser.add_argument('--warmup', type=float, default=2, help='Seconds of untimed load per scenario.')
+        parser.add_argument('--host', help='Benchmark a running server instead of starting one.')
+        parser.add_argument('--port', type=int, default=8000, help='Port of the server given by --host.')
+        parser.add_argument('--profile', choices=list(PROFILES), default='wsgi', help='Serving profile to start.')
+        parser.add_argument('--workers', type=int, default=3, help='Gunicorn workers (default: 3).')
+        parser.add_argument('--members', type=int, default=50, help='Members whose tokens and tasks are used.')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the request mix.')
+        parser.add_argument('--password', default=BENCH_PASSWORD, help='Password of the benchmark members.')
+        parser.add_argument('--json', dest='json_path', help='Write the report to this file ("-" for stdout).')
+        parser.add_argument('--baseline', help='A previous --json report to compare against.')
+
+    def handle(self, *args, **options):
+        bounds = Task.objects.aggregate(low=Min('id'), high=Max('id'))
+        members = self.sample_members(options['members'], random.Random(options['seed']))
+        if bounds['low'] is None or not members:
+            raise CommandError('No benchmark data; run manage.py seed_benchmark_data first.')
+        try:
+            manager = User.objects.get(username=BENCH_MANAGER)
+        except User.DoesNotExist:
+            raise CommandError('No benchmark manager; run manage.py seed_benchmark_data first.')
+        task_ids = self.sample_task_ids(bounds, REQUESTS_PER_SCENARIO, random.Random(options['seed']))
+
+        server = None
+        host, port = options['host'], options['port']
+        if host is None:
+            host, port = '127.0.0.1', free_port()
+            server = start_server(
+                options['profile'], port, options['workers'], settings.BASE_DIR,
+                env={'AUTH_ACCESS_TOKEN_LIFETIME': str(int(options['warmup'] + options['duration']) + 300)},
+                verbose=options['verbosity'] > 1,
+            )
+
+        results = {}
+        try:
+            try:
+                wait_until_ready(host, port, server, '/api/auth/me/', self.auth_headers(manager))
+            except ServerError as exc:
+                raise CommandError(exc)
+            for scenario in options['scenarios']:
+                self.stdout.write(self.style.MIGRATE_HEADING(f'{scenario}: {options["concurrency"]} clients'))
+                # Fresh tokens per scenario, so none expire mid-run
+                requests = self.build_requests(
+                    scenario, manager, members, task_ids, options['password'], random.Random(options['seed']),
+                )
+                next_request = itertools.cycle(requests).__next__
+                if options['warmup']:
+                    asyncio.run(run_requests(host, port, next_request, options['concurrency'], options['warmup']))
+                result = asyncio.run(run_requests(host, port, next_request, options['concurrency'], options['duration']))
+                results[scenario] = result.summary()
+                self.stdout.write(self.format_summary(results[scenario]))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+
+        report = {
+            **get_revision(),
+            'created_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'dataset': {'users': User.objects.count(), 'tasks': Task.objects.count()},
+            'options': {
+                key: options[key]
+                for key in ['profile', 'workers', 'concurrency', 'duration', 'warmup', 'members', 'seed']
+            },
+            'target': 'external' if options['host'] else options['profile'],
+            'results': results,
+        }
+        if options['baseline']:
+            self.compare(report, options['baseline'])
+        if options['json_path'] == '-':
+            self.stdout.write(json.dumps(report, indent=2))
+        elif options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(f'Wrote {options["json_path"]}')
+
+    @staticmethod
+    def sample_members(count, rng):
+        """Up to ``count`` benchmark members, drawn across the id range"""
+        members = User.objects.filter(username__startswith=BENCH_USER_PREFIX).order_by('id')
+        bounds = members.aggregate(low=Min('id'), high=Max('id'))
+        if bounds['low'] is None:
+            return []
+        picked = {}
+        for _ in range(count):
+            member = members.filter(id__gte=rng.randint(bounds['low'], bounds['high'])).first()
+            picked[member.pk] = member
+        return list(picked.values())
+
+    @staticmethod
+    def sample_task_ids(bounds, count, rng):
+        """Existing task ids, one index probe each instead of ORDER BY random() over the table"""
+        tasks = Task.objects.order_by('id').values_list('id', flat=True)
+        return [tasks.filter(id__gte=rng.randint(bounds['low'], bounds['high'])).first() for _ in range(count)]
+
+    @staticmethod
+    def auth_headers(user):
+        return {'Authorization': f"Bearer {issue_tokens(user)['access']}", 'Accept': 'application/json'}
+
+    def build_requests(self, scenario, manager, members, task_ids, password, rng):
+        """``(method, path, headers, body)`` tuples for one scenario"""
+        manager_headers = self.auth_headers(manager)
+        member_headers = [(member, self.auth_headers(member)) for member in members]
+        statuses = [choice for choice, _ in Task.Status.choices]
+        requests = []
+        for index in range(REQUESTS_PER_SCENARIO):
+            member, headers = rng.choice(member_headers)
+            if scenario == 'list':
+                # Managers see every task, members only their own
+                requests.append(('GET', '/api/tasks/', manager_headers if index % 2 else headers, None))
+            elif scenario == 'filter':
+                query = rng.choice([
+                    {'status': rng.choice(statuses)},
+                    {'overdue': 'true'},
+                    {'assignee': member.pk},
+                    {'status': rng.choice(statuses), 'ordering': '-deadline'},
+                ])
+                requests.append(('GET', f'/api/tasks/?{urlencode(query)}', manager_headers, None))
+            elif scenario == 'search':
+                # Seeded titles are "Task <n>"
+                term = rng.randrange(max(task_ids))
+                requests.append(('GET', f'/api/tasks/?search={term}', manager_headers if index % 2 else headers, None))
+            elif scenario == 'retrieve':
+                requests.append(('GET', f'/api/tasks/{task_ids[index]}/', manager_headers, None))
+            elif scenario == 'update':
+                body = json.dumps({'status': rng.choice(statuses)}).encode()
+                requests.append(('PATCH', f'/api/tasks/{task_ids[index]}/', {**manager_headers, **JSON_HEADERS}, body))
+            elif scenario == 'login':
+                body = json.dumps({'username': member.username, 'password': password}).encode()
+                requests.append(('POST', '/api/auth/token/', JSON_HEADERS, body))
+        return requests
+
+    def compare(self, report, path):
+        with open(path) as fh:
+            baseline = json.load(fh)
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Compared with {baseline.get("commit") or path}'))
+        for scenario, summary in report['results'].items():
+            before = baseline['results'].get(scenario)
+            if before is None:
+                continue
+            changes = ', '.join(
+                f'{key} {before[key]} -> {summary[key]} ({format_change(before[key], summary[key])})'
+                for key in ['requests_per_sec', 'p50_ms', 'p95_ms', 'p99_ms']
+            )
+            self.stdout.write(f'  {scenario}: {changes}')
+
+    @staticmethod
+    def format_summary(summary):
+        return (
+            f"  {summary['requests']} requests, {summary['errors']} errors: "
+            f"{summary['requests_per_sec']:,.1f} req/s, "
+            f"p50 {summary['p50_ms']} ms, p95 {summary['p95_ms']} ms, p99 {summary['p99_ms']} ms"
+        )
+
+
+def format_change(before, after):
+    if not before:
+        return 'n/a'
+    return f'{(after - before) / before:+.1%}'
+
+
+def get_revision():
+    """The checked-out commit, and whether the working tree has changes"""
+    def git(*args):
+        return subprocess.run(
+            ['git', *args], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+
+    try:
+        return {'commit': git('rev-parse', 'HEAD'), 'dirty': bool(git('status', '--porcelain'))}
+    except (OSError, subprocess.CalledProcessError):
+        return {'commit': None, 'dirty': None}
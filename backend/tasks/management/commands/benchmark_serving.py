@@ -0,0 +1,130 @@
+import asyncio
+import json
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from authapp.tokens import issue_tokens
+from core.loadtest import PROFILES, ServerError, free_port, run_load, start_server, wait_until_ready
+from tasks.benchmarking import (
+    UNUSABLE_PASSWORD,
+    add_scratch_database_argument,
+    check_scratch_database,
+    seed_tasks,
+    seed_users,
+)
+from tasks.models import Task
+
+User = get_user_model()
+
+BENCH_ADMIN = 'bench_admin'
+
+DEFAULT_PATHS = [
+    '/api/tasks/',
+    '/api/tasks/?status=Todo',
+    '/api/tasks/?overdue=true&page_size=200',
+    '/api/users/choices/',
+    '/api/auth/me/',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Start the WSGI (sync Gunicorn workers) and ASGI (Gunicorn + Uvicorn workers) '
+        'serving profiles on this database in turn and compare their throughput and '
+        'latency for concurrent reads. Seeds synthetic tasks when the table is smaller '
+        'than --tasks, so it requires --scratch-database and refuses a database holding '
+        'users or tasks it did not seed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', nargs='+', choices=list(PROFILES), default=list(PROFILES))
+        parser.add_argument('--workers', type=int, default=3, help='Gunicorn workers per profile (default: 3).')
+        parser.add_argument('--concurrency', type=int, default=50, help='Requests kept in flight.')
+        parser.add_argument('--duration', type=float, default=15, help='Seconds of load per profile.')
+        parser.add_argument('--warmup', type=float, default=2, help='Seconds of untimed load first.')
+        parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS, help='Paths requested in turn.')
+        parser.add_argument(
+            '--query-delay-ms', type=float, default=0,
+            help='Add this much latency to every server-side query, as a remote or slow database would.',
+        )
+        parser.add_argument('--port', type=int, default=0, help='Port to serve on (default: a free one).')
+        parser.add_argument('--tasks', type=int, default=10_000, help='Number of tasks to seed.')
+        parser.add_argument('--users', type=int, default=100, help='Number of assignees to seed.')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the dataset.')
+        parser.add_argument('--json', dest='json_path', help='Also write the results to this file.')
+        add_scratch_database_argument(parser)
+
+    def handle(self, *args, **options):
+        check_scratch_database(options)
+        if connection.vendor == 'sqlite' and connection.settings_dict['NAME'] in ('', ':memory:'):
+            raise CommandError('The servers need a database they can open; configure a file or server database.')
+        existing = Task.objects.count()
+        if existing < options['tasks']:
+            self.stdout.write(f'Seeding {options["tasks"] - existing} tasks on {connection.vendor}...')
+            assignee_ids = seed_users(options['users'])
+            seed_tasks(options['tasks'] - existing, assignee_ids, seed=options['seed'], stdout=self.stdout)
+
+        admin, _ = User.objects.get_or_create(
+            username=BENCH_ADMIN,
+            defaults={'role': User.Role.ADMIN, 'password': UNUSABLE_PASSWORD},
+        )
+        headers = {'Authorization': f"Bearer {issue_tokens(admin)['access']}"}
+
+        results = {}
+        for profile in options['profiles']:
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{profile}: {options["workers"]} workers, {options["query_delay_ms"]:g} ms per query'
+            ))
+            port = options['port'] or free_port()
+            server = start_server(
+                profile, port, options['workers'], settings.BASE_DIR,
+                env={
+                    # The benchmark's access token must outlive the run
+                    'AUTH_ACCESS_TOKEN_LIFETIME': str(int(options['warmup'] + options['duration']) + 300),
+                    'LOADTEST_QUERY_DELAY_MS': str(options['query_delay_ms']),
+                },
+                verbose=options['verbosity'] > 1,
+            )
+            try:
+                try:
+                    wait_until_ready('127.0.0.1', port, server, '/api/auth/me/', headers)
+                except ServerError as exc:
+                    raise CommandError(exc)
+                if options['warmup']:
+                    asyncio.run(run_load(
+                        '127.0.0.1', port, options['paths'], headers,
+                        options['concurrency'], options['warmup'],
+                    ))
+                result = asyncio.run(run_load(
+                    '127.0.0.1', port, options['paths'], headers,
+                    options['concurrency'], options['duration'],
+                ))
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+            results[profile] = result.summary()
+            self.stdout.write(self.format_summary(results[profile]))
+
+        if {'wsgi', 'asgi'} <= results.keys() and results['wsgi']['requests_per_sec']:
+            ratio = results['asgi']['requests_per_sec'] / results['wsgi']['requests_per_sec']
+            self.stdout.write(self.style.SUCCESS(f'ASGI/WSGI throughput: {ratio:.2f}x'))
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump({'options': {
+                    key: options[key]
+                    for key in ['workers', 'concurrency', 'duration', 'query_delay_ms', 'paths', 'tasks']
+                }, 'results': results}, fh, indent=2)
+            self.stdout.write(f'Wrote {options["json_path"]}')
+
+    @staticmethod
+    def format_summary(summary):
+        return (
+            f"  {summary['requests']} requests, {summary['errors']} errors: "
+            f"{summary['requests_per_sec']:,.1f} req/s, "
+            f"p50 {summary['p50_ms']} ms, p95 {summary['p95_ms']} ms, p99 {summary['p99_ms']} ms"
+        )
+
@@ -0,0 +1,170 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from tasks.benchmarking import (
+    add_scratch_database_argument,
+    analyze,
+    check_scratch_database,
+    seed_tasks,
+    seed_users,
+)
+from tasks.models import Task
+
+# Copy of tasks_task with its primary key but none of the other indexes
+BASELINE_TABLE = 'tasks_task_index_baseline'
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a scratch database with synthetic tasks and print the query plans and '
+        'timings of the TaskViewSet access patterns with and without the task indexes. '
+        'The baseline runs against a copy of the task table without its indexes, so the '
+        'real ones are never dropped. Refuses to run on a database with rows it did not '
+        'seed. Works on PostgreSQL and SQLite; run it once per backend.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=1_000_000, help='Number of tasks to seed.')
+        parser.add_argument('--users', type=int, default=1000, help='Number of assignees to seed.')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the dataset.')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per query.')
+        parser.add_argument('--skip-seed', action='store_true', help='Benchmark the existing rows.')
+        parser.add_argument('--analyze', action='store_true', help='Use EXPLAIN ANALYZE (PostgreSQL only).')
+        parser.add_argument('--json', dest='json_path', help='Also write the results to this file.')
+        add_scratch_database_argument(parser)
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            raise CommandError(f'Unsupported database: {connection.vendor}.')
+        check_scratch_database(options)
+
+        if not options['skip_seed']:
+            existing = Task.objects.count()
+            if existing < options['tasks']:
+                self.stdout.write(f'Seeding {options["tasks"] - existing} tasks on {connection.vendor}...')
+                assignee_ids = seed_users(options['users'])
+                seed_tasks(
+                    options['tasks'] - existing,
+                    assignee_ids,
+                    seed=options['seed'],
+                    stdout=self.stdout,
+                )
+
+        queries = {name: queryset.query.sql_with_params() for name, queryset in self.get_queries().items()}
+        table = connection.ops.quote_name(Task._meta.db_table)
+        baseline = connection.ops.quote_name(BASELINE_TABLE)
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Copying the task table without its indexes'))
+        self.create_baseline_table()
+        try:
+            analyze()
+            before = self.run_queries(
+                {name: (sql.replace(table, baseline), params) for name, (sql, params) in queries.items()},
+                options,
+            )
+        finally:
+            self.drop_baseline_table()
+        after = self.run_queries(queries, options)
+
+        results = {
+            'vendor': connection.vendor,
+            'tasks': Task.objects.count(),
+            'queries': [
+                {
+                    'name': name,
+                    'before': before[name],
+                    'after': after[name],
+                }
+                for name in queries
+            ],
+        }
+        for entry in results['queries']:
+            self.stdout.write(self.style.SUCCESS(
+                f"\n== {entry['name']}: {entry['before']['median_ms']:.2f} ms -> "
+                f"{entry['after']['median_ms']:.2f} ms"
+            ))
+            self.stdout.write('-- before')
+            self.stdout.write(entry['before']['plan'])
+            self.stdout.write('-- after')
+            self.stdout.write(entry['after']['plan'])
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump(results, fh, indent=2)
+
+    def get_queries(self):
+        """The filter/order combinations TaskViewSet issues, as first pages."""
+        base = Task.objects.select_related('assignee')
+        member_id = (
+            Task.objects.exclude(assignee=None)
+            .order_by('assignee_id')
+            .values_list('assignee_id', flat=True)
+            .first()
+        )
+        now = timezone.now()
+        page = 51
+        return {
+            'all_by_created': base.order_by('-created_at', 'id')[:page],
+            'member_by_created': base.filter(assignee_id=member_id).order_by('-created_at', 'id')[:page],
+            'member_status_by_created': base.filter(
+                assignee_id=member_id, status=Task.Status.TODO,
+            ).order_by('-created_at')[:page],
+            'status_by_created': base.filter(status=Task.Status.IN_PROGRESS).order_by('-created_at', 'id')[:page],
+            'all_by_updated': base.order_by('-updated_at', 'id')[:page],
+            'all_by_title': base.order_by('title', 'id')[:page],
+            'open_by_deadline': base.exclude(status=Task.Status.DONE).filter(
+                deadline__isnull=False,
+            ).order_by('deadline')[:page],
+            'overdue_by_deadline': Task.objects.exclude(status=Task.Status.DONE).filter(
+                deadline__lt=now,
+            ).order_by('deadline').values_list('id', flat=True)[:page],
+        }
+
+    def create_baseline_table(self):
+        """Copy tasks_task, keeping its columns and primary key but no other index."""
+        table = connection.ops.quote_name(Task._meta.db_table)
+        baseline = connection.ops.quote_name(BASELINE_TABLE)
+        with connection.cursor() as cursor:
+            # A copy left behind by an interrupted run
+            cursor.execute(f'DROP TABLE IF EXISTS {baseline}')
+            if connection.vendor == 'postgresql':
+                cursor.execute(f'CREATE TABLE {baseline} (LIKE {table} INCLUDING DEFAULTS)')
+                cursor.execute(f'ALTER TABLE {baseline} ADD PRIMARY KEY (id)')
+            else:
+                # Indexes are separate statements in SQLite, so the table's own DDL has none
+                cursor.execute(
+                    "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = %s", [Task._meta.db_table],
+                )
+                cursor.execute(cursor.fetchone()[0].replace(table, baseline, 1))
+            cursor.execute(f'INSERT INTO {baseline} SELECT * FROM {table}')
+
+    def drop_baseline_table(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {connection.ops.quote_name(BASELINE_TABLE)}')
+
+    def run_queries(self, queries, options):
+        """Time each ``(sql, params)`` and capture its plan."""
+        if connection.vendor == 'postgresql':
+            explain = 'EXPLAIN (ANALYZE) ' if options['analyze'] else 'EXPLAIN '
+        else:
+            explain = 'EXPLAIN QUERY PLAN '
+        results = {}
+        with connection.cursor() as cursor:
+            for name, (sql, params) in queries.items():
+                timings = []
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    cursor.execute(sql, params)
+                    cursor.fetchall()
+                    timings.append((time.perf_counter() - started) * 1000)
+                cursor.execute(explain + sql, params)
+                results[name] = {
+                    'median_ms': statistics.median(timings),
+                    'plan': '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall()),
+                }
+        return results
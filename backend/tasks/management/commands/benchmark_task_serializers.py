@@ -0,0 +1,57 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from tasks.benchmarking import add_scratch_database_argument, check_scratch_database, seed_tasks, seed_users
+from tasks.models import Task
+from tasks.serializers import TaskFastReadSerializer, TaskReadSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare rows/sec of TaskReadSerializer and TaskFastReadSerializer over '
+        'the same page of tasks. Seeds synthetic tasks when the table is smaller '
+        'than --tasks, so it requires --scratch-database and refuses a database '
+        'holding users or tasks it did not seed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=10_000, help='Number of tasks to seed.')
+        parser.add_argument('--users', type=int, default=100, help='Number of assignees to seed.')
+        parser.add_argument('--rows', type=int, default=5000, help='Rows serialized per run.')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per serializer.')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the dataset.')
+        add_scratch_database_argument(parser)
+
+    def handle(self, *args, **options):
+        check_scratch_database(options)
+        existing = Task.objects.count()
+        if existing < options['tasks']:
+            self.stdout.write(f'Seeding {options["tasks"] - existing} tasks on {connection.vendor}...')
+            assignee_ids = seed_users(options['users'])
+            seed_tasks(options['tasks'] - existing, assignee_ids, seed=options['seed'], stdout=self.stdout)
+
+        queryset = Task.objects.select_related('assignee').order_by('-created_at', 'id')[:options['rows']]
+        paths = {
+            'TaskReadSerializer': lambda: TaskReadSerializer(list(queryset.all()), many=True).data,
+            'TaskFastReadSerializer': lambda: TaskFastReadSerializer(
+                list(TaskFastReadSerializer.project(queryset.all())), many=True,
+            ).data,
+        }
+
+        results = {}
+        for name, run in paths.items():
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                rows = len(run())
+                timings.append(time.perf_counter() - started)
+            median = statistics.median(timings)
+            results[name] = rows / median if median else 0
+            self.stdout.write(f'{name}: {rows} rows in {median * 1000:.1f} ms ({results[name]:,.0f} rows/sec)')
+
+        slow, fast = results['TaskReadSerializer'], results['TaskFastReadSerializer']
+        if slow:
+            self.stdout.write(self.style.SUCCESS(f'Fast path speedup: {fast / slow:.1f}x'))
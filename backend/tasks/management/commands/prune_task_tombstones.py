@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.models import TaskTombstone
+from tasks.sync import get_tombstone_retention
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete delta sync tombstones older than TASK_TOMBSTONE_RETENTION days. Clients '
+        'whose sync token is older than that are told to reload. Run daily, e.g. from cron.'
+    )
+
+    def handle(self, *args, **options):
+        deleted = TaskTombstone.prune(timezone.now() - get_tombstone_retention())
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} task tombstones'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from tasks.models import TaskStatusCounter
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the per-(assignee, status) task counters behind /api/tasks/stats/ '
+        'from tasks_task. Run after writes that bypass the ORM (raw SQL, queryset.update).'
+    )
+
+    def handle(self, *args, **options):
+        TaskStatusCounter.rebuild()
+        rows = TaskStatusCounter.objects.count()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} task counters'))
@@ -0,0 +1,38 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from tasks import reminders
+
+
+class Command(BaseCommand):
+    help = (
+        'Run the deadline reminder scheduler: keep upcoming deadlines in a heap and '
+        'send task_reminders_due batches as they fall due (see tasks/reminders.py).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=30, help='Seconds between ticks (default: 30).')
+        parser.add_argument(
+            '--window', type=int, default=3600,
+            help='Seconds of upcoming reminders kept in memory (default: 3600).',
+        )
+        parser.add_argument('--batch-size', type=int, default=100, help='Reminders per batch (default: 100).')
+        parser.add_argument('--once', action='store_true', help='Run a single tick and exit.')
+
+    def handle(self, *args, **options):
+        scheduler = reminders.ReminderScheduler(
+            window=timedelta(seconds=options['window']),
+            batch_size=options['batch_size'],
+        )
+        try:
+            while True:
+                sent = scheduler.tick()
+                if sent:
+                    self.stdout.write(f'Sent {sent} reminders ({len(scheduler.scheduled)} tasks scheduled)')
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,68 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from tasks.benchmarking import (
+    BENCH_PASSWORD,
+    UNUSABLE_PASSWORD,
+    add_scratch_database_argument,
+    check_scratch_database,
+    seed_tasks,
+    seed_users,
+    set_benchmark_password,
+)
+from tasks.models import Task
+from users.choices import invalidate_choices
+
+User = get_user_model()
+
+BENCH_ADMIN = 'bench_admin'
+BENCH_MANAGER = 'bench_manager'
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a scratch database with the dataset benchmark_api runs against: synthetic '
+        'members and tasks with realistic status, assignee and deadline skew, plus a '
+        'benchmark admin and manager. Tops up to the requested sizes, so reruns with the '
+        'same arguments are no-ops. Requires --scratch-database and refuses a database '
+        'holding users or tasks it did not seed, since every member gets the same known password.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100_000, help='Number of members to seed.')
+        parser.add_argument('--tasks', type=int, default=5_000_000, help='Number of tasks to seed.')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the dataset.')
+        parser.add_argument('--batch-size', type=int, default=10_000, help='Rows per INSERT.')
+        parser.add_argument(
+            '--password', default=BENCH_PASSWORD,
+            help='Password given to every benchmark member, for the login scenario.',
+        )
+        add_scratch_database_argument(parser)
+
+    def handle(self, *args, **options):
+        check_scratch_database(options)
+        self.stdout.write(f'Seeding up to {options["users"]} members on {connection.vendor}...')
+        assignee_ids = seed_users(options['users'], batch_size=options['batch_size'])
+        set_benchmark_password(options['password'])
+
+        for username, role in [(BENCH_ADMIN, User.Role.ADMIN), (BENCH_MANAGER, User.Role.MANAGER)]:
+            User.objects.get_or_create(username=username, defaults={'role': role, 'password': UNUSABLE_PASSWORD})
+        # Bulk-created members bypass the signal that drops the cached assignee choices
+        invalidate_choices()
+
+        existing = Task.objects.count()
+        if existing < options['tasks']:
+            self.stdout.write(f'Seeding {options["tasks"] - existing} tasks...')
+            seed_tasks(
+                options['tasks'] - existing,
+                assignee_ids,
+                # Top-ups draw a different sequence than the first run
+                seed=options['seed'] + existing,
+                batch_size=options['batch_size'],
+                stdout=self.stdout,
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{User.objects.count()} users, {Task.objects.count()} tasks'
+        ))
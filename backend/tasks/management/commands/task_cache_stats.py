@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from tasks import cache as response_cache
+
+
+class Command(BaseCommand):
+    help = 'Print the hit/miss counters of the task response cache.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset the counters after printing them.')
+
+    def handle(self, *args, **options):
+        stats = response_cache.get_stats()
+        state = 'enabled' if response_cache.is_enabled() else 'disabled'
+        self.stdout.write(f'Task response cache is {state}')
+        self.stdout.write(
+            f"hits: {stats['hits']}  misses: {stats['misses']}  hit ratio: {stats['hit_ratio']:.1%}"
+        )
+        if options['reset']:
+            response_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset'))
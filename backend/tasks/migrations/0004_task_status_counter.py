@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_counters(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    TaskStatusCounter = apps.get_model('tasks', 'TaskStatusCounter')
+    rows = Task.objects.order_by().values('assignee_id', 'status').annotate(total=models.Count('id'))
+    TaskStatusCounter.objects.bulk_create([
+        TaskStatusCounter(assignee_id=row['assignee_id'], status=row['status'], count=row['total'])
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_task_full_text_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStatusCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('Todo', 'Todo'), ('In Progress', 'In Progress'), ('Done', 'Done')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('assignee', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='task_counters', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Task status counter',
+                'verbose_name_plural': 'Task status counters',
+                'db_table': 'tasks_task_status_counter',
+                'constraints': [models.UniqueConstraint(condition=models.Q(('assignee__isnull', False)), fields=('assignee', 'status'), name='tasks_counter_assignee_status_uniq'), models.UniqueConstraint(condition=models.Q(('assignee__isnull', True)), fields=('status',), name='tasks_counter_unassigned_status_uniq')],
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
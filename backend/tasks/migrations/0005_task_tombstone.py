@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_task_status_counter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField(blank=True, null=True)),
+                ('assignee_id', models.BigIntegerField(blank=True, null=True)),
+                ('reason', models.CharField(choices=[('deleted', 'Deleted'), ('reassigned', 'Reassigned'), ('scope_changed', 'Scope changed')], max_length=16)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Task tombstone',
+                'verbose_name_plural': 'Task tombstones',
+                'db_table': 'tasks_task_tombstone',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assignee', 'updated_at'], name='tasks_assignee_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktombstone',
+            index=models.Index(fields=['created_at'], name='tasks_tombstone_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktombstone',
+            index=models.Index(fields=['assignee_id', 'created_at'], name='tasks_tombstone_assignee_idx'),
+        ),
+    ]
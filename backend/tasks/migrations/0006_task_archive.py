@@ -0,0 +1,93 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+TASK_COLUMNS = 'id, title, description, status, deadline, assignee_id, created_at, updated_at'
+
+CREATE_VIEW = f"""
+    CREATE VIEW tasks_task_with_archive AS
+    SELECT {TASK_COLUMNS} FROM tasks_task
+    UNION ALL
+    SELECT {TASK_COLUMNS} FROM tasks_task_archive
+"""
+
+DROP_VIEW = 'DROP VIEW IF EXISTS tasks_task_with_archive'
+
+
+class Migration(migrations.Migration):
+    """
+    Archive table for Done tasks and the tasks_task_with_archive view read
+    by TaskWithArchive (see tasks/archive.py).
+
+    A later migration that alters tasks_task columns must drop and recreate
+    the view around the change.
+    """
+
+    dependencies = [
+        ('tasks', '0005_task_tombstone'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskWithArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('status', models.CharField(choices=[('Todo', 'Todo'), ('In Progress', 'In Progress'), ('Done', 'Done')], max_length=20)),
+                ('deadline', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'tasks_task_with_archive',
+                'ordering': ['-created_at'],
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('status', models.CharField(choices=[('Todo', 'Todo'), ('In Progress', 'In Progress'), ('Done', 'Done')], max_length=20)),
+                ('deadline', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Archived task',
+                'verbose_name_plural': 'Archived tasks',
+                'db_table': 'tasks_task_archive',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='tasktombstone',
+            name='reason',
+            field=models.CharField(choices=[('deleted', 'Deleted'), ('archived', 'Archived'), ('reassigned', 'Reassigned'), ('scope_changed', 'Scope changed')], max_length=16),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status', 'Done')), fields=['updated_at'], name='tasks_done_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedtask',
+            name='assignee',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='archivedtask',
+            index=models.Index(fields=['-created_at', 'id'], name='tasks_archive_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedtask',
+            index=models.Index(fields=['assignee', '-created_at', 'id'], name='tasks_archive_assignee_idx'),
+        ),
+        migrations.RunSQL(CREATE_VIEW, DROP_VIEW),
+    ]
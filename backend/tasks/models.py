@@ -1,10 +1,34 @@
-from django.db import models
+import operator
+from collections import defaultdict
+from functools import reduce
+
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Now
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
 User = get_user_model()
 
 
+class TaskQuerySet(models.QuerySet):
+    
+    def overdue_condition(self):
+        """Open tasks past their deadline, evaluated by the database clock"""
+        return models.Q(deadline__lt=Now()) & ~models.Q(status=Task.Status.DONE)
+    
+    def overdue(self, value=True):
+        """Filter on overdue; ``value=True`` can use the partial index on open deadlines"""
+        return self.filter(self.overdue_condition()) if value else self.exclude(self.overdue_condition())
+    
+    def with_overdue(self):
+        """Annotate ``overdue`` so serializers do not call Task.is_overdue per row"""
+        return self.annotate(overdue=models.Case(
+            models.When(self.overdue_condition(), then=models.Value(True)),
+            default=models.Value(False),
+            output_field=models.BooleanField(),
+        ))
+
+
 class Task(models.Model):
     """Task model for managing team tasks"""
     
@@ -31,19 +55,340 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = TaskQuerySet.as_manager()
+    
     class Meta:
         db_table = 'tasks_task'
         ordering = ['-created_at']
         verbose_name = 'Task'
         verbose_name_plural = 'Tasks'
+        indexes = [
+            # Default list ordering and keyset pagination: (-created_at, id)
+            models.Index(fields=['-created_at', 'id'], name='tasks_created_id_idx'),
+            # Member lists are always scoped to the assignee
+            models.Index(fields=['assignee', '-created_at', 'id'], name='tasks_assignee_created_idx'),
+            models.Index(fields=['assignee', 'status', '-created_at'], name='tasks_assignee_status_idx'),
+            # Manager/Admin status filter
+            models.Index(fields=['status', '-created_at', 'id'], name='tasks_status_created_idx'),
+            # Remaining ordering_fields
+            models.Index(fields=['updated_at'], name='tasks_updated_idx'),
+            # Member delta sync (/api/tasks/changes/)
+            models.Index(fields=['assignee', 'updated_at'], name='tasks_assignee_updated_idx'),
+            models.Index(fields=['title'], name='tasks_title_idx'),
+            # Only open tasks have a meaningful deadline to sort or filter on
+            models.Index(
+                fields=['deadline'],
+                name='tasks_open_deadline_idx',
+                condition=~models.Q(status='Done'),
+            ),
+            # Archival candidates (see tasks/archive.py)
+            models.Index(
+                fields=['updated_at'],
+                name='tasks_done_updated_idx',
+                condition=models.Q(status='Done'),
+            ),
+        ]
     
     def __str__(self):
         assignee_name = self.assignee.username if self.assignee else 'Unassigned'
         return f"{self.title} ({self.status}) - {assignee_name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded (assignee, status) for the delete and bulk write receivers"""
+        instance = super().from_db(db, field_names, values)
+        instance.remember_counter_key()
+        return instance
+    
+    @property
+    def counter_key(self):
+        return self.__dict__.get('assignee_id'), self.__dict__.get('status')
+    
+    def remember_counter_key(self):
+        key = self.counter_key
+        # Unknown when either field was deferred
+        self._original_counter_key = key if 'assignee_id' in self.__dict__ and 'status' in self.__dict__ else None
+    
+    def save(self, *args, **kwargs):
+        """
+        Save and update TaskStatusCounter in the same transaction.
+        
+        The counter moved from is read with the row locked, not taken from
+        when the task was loaded: a concurrent save may have moved it since.
+        """
+        with transaction.atomic():
+            created = self._state.adding
+            original = None
+            if not created:
+                original = Task.objects.select_for_update().filter(pk=self.pk).values_list(
+                    'assignee_id', 'status',
+                ).first()
+                # The post_save receivers read the previous assignee from here
+                self._original_counter_key = original
+            super().save(*args, **kwargs)
+            new = self.counter_key
+            if original is not None:
+                # Deferred fields and fields left out of update_fields were not written
+                update_fields = kwargs.get('update_fields')
+                written = set(update_fields) if update_fields is not None else {'assignee', 'status'}
+                new = (
+                    new[0] if 'assignee_id' in self.__dict__ and written & {'assignee', 'assignee_id'} else original[0],
+                    new[1] if 'status' in self.__dict__ and 'status' in written else original[1],
+                )
+            TaskStatusCounter.record_change(original, new)
+        self._original_counter_key = new
+    
     @property
     def is_overdue(self):
         """Check if task is overdue"""
         if self.deadline and self.status != self.Status.DONE:
             return timezone.now() > self.deadline
         return False
+
+
+class TaskStatusCounter(models.Model):
+    """
+    Number of tasks per (assignee, status), maintained incrementally.
+    
+    Task.save and the signal receivers in tasks/signals.py adjust these rows
+    in the same transaction as the task write, so the dashboard statistics
+    read O(assignees) rows instead of aggregating tasks_task. Rebuild with
+    ``manage.py rebuild_task_counters`` after writes that bypass the ORM.
+    """
+    
+    assignee = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='task_counters',
+    )
+    status = models.CharField(max_length=20, choices=Task.Status.choices)
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'tasks_task_status_counter'
+        verbose_name = 'Task status counter'
+        verbose_name_plural = 'Task status counters'
+        constraints = [
+            # NULLs are distinct in unique indexes, so unassigned rows need their own
+            models.UniqueConstraint(
+                fields=['assignee', 'status'],
+                condition=models.Q(assignee__isnull=False),
+                name='tasks_counter_assignee_status_uniq',
+            ),
+            models.UniqueConstraint(
+                fields=['status'],
+                condition=models.Q(assignee__isnull=True),
+                name='tasks_counter_unassigned_status_uniq',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.assignee_id or 'Unassigned'} / {self.status}: {self.count}"
+    
+    @classmethod
+    def adjust(cls, assignee_id, status, delta):
+        """Add ``delta`` to one counter, creating the row if needed"""
+        if not delta:
+            return
+        counters = cls.objects.filter(assignee_id=assignee_id, status=status)
+        if counters.update(count=models.F('count') + delta):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(assignee_id=assignee_id, status=status, count=delta)
+        except IntegrityError:
+            # Created concurrently since the update above
+            counters.update(count=models.F('count') + delta)
+    
+    @classmethod
+    def record_change(cls, old_key, new_key):
+        """Move one task from ``old_key`` to ``new_key``; either may be None (create/delete)"""
+        cls.apply_changes([(old_key, new_key)])
+    
+    @classmethod
+    def apply_changes(cls, changes):
+        """
+        Apply many ``(old_key, new_key)`` moves. Several counters are
+        adjusted with two statements however many there are: an insert of
+        the missing rows, then one UPDATE with a CASE per counter.
+        """
+        deltas = defaultdict(int)
+        for old_key, new_key in changes:
+            if old_key == new_key:
+                continue
+            if old_key is not None:
+                deltas[old_key] -= 1
+            if new_key is not None:
+                deltas[new_key] += 1
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if len(deltas) <= 1:
+            for (assignee_id, status), delta in deltas.items():
+                cls.adjust(assignee_id, status, delta)
+            return
+        
+        cls.objects.bulk_create(
+            [cls(assignee_id=assignee_id, status=status, count=0) for assignee_id, status in deltas],
+            ignore_conflicts=True,
+        )
+        conditions = [
+            (models.Q(assignee__isnull=True) if assignee_id is None else models.Q(assignee_id=assignee_id))
+            & models.Q(status=status)
+            for assignee_id, status in deltas
+        ]
+        cls.objects.filter(reduce(operator.or_, conditions)).update(count=models.F('count') + models.Case(
+            *(models.When(condition, then=models.Value(delta)) for condition, delta in zip(conditions, deltas.values())),
+            default=models.Value(0),
+        ))
+    
+    @classmethod
+    def rebuild(cls):
+        """Recompute every counter from tasks_task"""
+        rows = (
+            Task.objects.order_by()
+            .values('assignee_id', 'status')
+            .annotate(total=models.Count('id'))
+        )
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create([
+                cls(assignee_id=row['assignee_id'], status=row['status'], count=row['total'])
+                for row in rows
+            ])
+
+
+class TaskTombstone(models.Model):
+    """
+    A task leaving someone's view, for the delta sync at ``/api/tasks/changes/``.
+    
+    Recorded by the receivers in tasks/signals.py in the same transaction as
+    the write: a deleted or archived task (for everyone who could see it), a task
+    reassigned away from ``assignee_id`` (a Member's scope), or a change of
+    ``assignee_id``'s role that changed which tasks they can see (no
+    ``task_id``; their clients must resync from scratch). Rows older than
+    ``TASK_TOMBSTONE_RETENTION`` days are removed by
+    ``manage.py prune_task_tombstones``.
+    """
+    
+    class Reason(models.TextChoices):
+        DELETED = 'deleted', 'Deleted'
+        ARCHIVED = 'archived', 'Archived'
+        REASSIGNED = 'reassigned', 'Reassigned'
+        SCOPE_CHANGED = 'scope_changed', 'Scope changed'
+    
+    task_id = models.BigIntegerField(null=True, blank=True)
+    # Not a foreign key: tombstones outlive the users they mention
+    assignee_id = models.BigIntegerField(null=True, blank=True)
+    reason = models.CharField(max_length=16, choices=Reason.choices)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'tasks_task_tombstone'
+        verbose_name = 'Task tombstone'
+        verbose_name_plural = 'Task tombstones'
+        indexes = [
+            models.Index(fields=['created_at'], name='tasks_tombstone_created_idx'),
+            models.Index(fields=['assignee_id', 'created_at'], name='tasks_tombstone_assignee_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.reason}: task {self.task_id} / user {self.assignee_id}"
+    
+    @classmethod
+    def prune(cls, older_than):
+        """Delete tombstones created before ``older_than``; returns how many"""
+        deleted, _ = cls.objects.filter(created_at__lt=older_than).delete()
+        return deleted
+
+
+class ArchivedTask(models.Model):
+    """
+    A Done task moved out of tasks_task by ``manage.py archive_tasks``.
+    
+    Keeps the task's id and fields, so the task reads the same from the
+    archive; archived tasks are read-only.
+    """
+    
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    status = models.CharField(max_length=20, choices=Task.Status.choices)
+    deadline = models.DateTimeField(null=True, blank=True)
+    assignee = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+    
+    objects = TaskQuerySet.as_manager()
+    
+    class Meta:
+        db_table = 'tasks_task_archive'
+        ordering = ['-created_at']
+        verbose_name = 'Archived task'
+        verbose_name_plural = 'Archived tasks'
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='tasks_archive_created_idx'),
+            models.Index(fields=['assignee', '-created_at', 'id'], name='tasks_archive_assignee_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.title} (archived)"
+    
+    @classmethod
+    def from_task(cls, task, archived_at):
+        return cls(
+            id=task.pk,
+            title=task.title,
+            description=task.description,
+            status=task.status,
+            deadline=task.deadline,
+            assignee_id=task.assignee_id,
+            created_at=task.created_at,
+            updated_at=task.updated_at,
+            archived_at=archived_at,
+        )
+
+
+class TaskWithArchive(models.Model):
+    """
+    Read-only view over tasks_task and tasks_task_archive (UNION ALL), with
+    the same fields as Task, for reads that include archived tasks. The view
+    is created by migration ``0006_task_archive``.
+    """
+    
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    status = models.CharField(max_length=20, choices=Task.Status.choices)
+    deadline = models.DateTimeField(null=True, blank=True)
+    assignee = models.ForeignKey(
+        User,
+        # A view cannot be updated; the underlying tables handle user deletion
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    
+    objects = TaskQuerySet.as_manager()
+    
+    class Meta:
+        managed = False
+        db_table = 'tasks_task_with_archive'
+        ordering = ['-created_at']
+    
+    @property
+    def is_overdue(self):
+        if self.deadline and self.status != Task.Status.DONE:
+            return timezone.now() > self.deadline
+        return False
@@ -0,0 +1,226 @@
+import binascii
+import json
+from base64 import b64decode, b64encode
+from collections import namedtuple
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+KeysetCursor = namedtuple('KeysetCursor', ['ordering', 'position', 'reverse'])
+OrderingKey = namedtuple('OrderingKey', ['attr', 'descending', 'nullable', 'field'])
+
+
+class TaskCursorPagination(CursorPagination):
+    """
+    Keyset pagination for task list endpoints.
+
+    Pages are addressed by the position of the last row seen rather than by
+    an offset, so every page costs the same index range scan regardless of
+    depth and no COUNT(*) is issued. The requested ordering is always made
+    total by appending ``id`` as a tiebreaker, giving ``(-created_at, id)``
+    by default. Nullable ordering fields (``deadline``) sort NULLs last in
+    both directions so the keyset comparison is well defined.
+
+    Pass ``?paginate=false`` to get the legacy unpaginated list response.
+    """
+
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-created_at',)
+    tiebreaker = 'id'
+    paginate_query_param = 'paginate'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() with the page fetched through the async ORM"""
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """Return the query for the requested page, or None when not paginating"""
+        if self.is_unpaginated_request(request):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.keys = self.get_ordering_keys(queryset, self.ordering)
+        self.cursor = self.decode_cursor(request)
+
+        reverse = self.cursor.reverse if self.cursor else False
+        queryset = queryset.order_by(*self.get_order_by(reverse))
+        if self.cursor is not None:
+            queryset = queryset.filter(self.get_keyset_filter(self.cursor.position, reverse))
+
+        # Fetch one extra row to find out whether another page follows.
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        reverse = self.cursor.reverse if self.cursor else False
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def is_unpaginated_request(self, request):
+        value = request.query_params.get(self.paginate_query_param, '')
+        return value.lower() in ('false', '0', 'no', 'off')
+
+    def get_ordering(self, request, queryset, view):
+        """Return the requested ordering with the ``id`` tiebreaker appended."""
+        ordering = list(super().get_ordering(request, queryset, view))
+        if not any(field.lstrip('-') == self.tiebreaker for field in ordering):
+            ordering.append(self.tiebreaker)
+        return tuple(ordering)
+
+    def get_ordering_keys(self, queryset, ordering):
+        keys = []
+        for field_name in ordering:
+            attr = field_name.lstrip('-')
+            if attr in queryset.query.annotations:
+                field = queryset.query.annotations[attr].output_field
+            else:
+                field = queryset.model._meta.get_field(attr)
+            keys.append(OrderingKey(attr, field_name.startswith('-'), field.null, field))
+        return keys
+
+    def get_order_by(self, reverse):
+        order_by = []
+        for key in self.keys:
+            descending = key.descending != reverse
+            expression = F(key.attr)
+            nulls = {}
+            if key.nullable:
+                nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+            order_by.append(expression.desc(**nulls) if descending else expression.asc(**nulls))
+        return order_by
+
+    def get_keyset_filter(self, position, reverse):
+        """
+        Build the row-value comparison ``(k1, k2, ...) > (v1, v2, ...)`` in the
+        direction of travel, expanded so that it works on every backend:
+
+            k1 > v1 OR (k1 = v1 AND k2 > v2) OR ...
+        """
+        condition = Q(pk__in=[])
+        prefix = Q()
+        for key, value in zip(self.keys, position):
+            condition |= prefix & self._after(key, value, reverse)
+            prefix &= Q(**{f'{key.attr}__isnull': True}) if value is None else Q(**{key.attr: value})
+        return condition
+
+    def _after(self, key, value, reverse):
+        descending = key.descending != reverse
+        # NULLs sort last when walking forwards and therefore first in reverse.
+        nulls_last = not reverse
+        if value is None:
+            if nulls_last:
+                return Q(pk__in=[])
+            return Q(**{f'{key.attr}__isnull': False})
+        condition = Q(**{f"{key.attr}__{'lt' if descending else 'gt'}": value})
+        if key.nullable and nulls_last:
+            condition |= Q(**{f'{key.attr}__isnull': True})
+        return condition
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self._get_position_from_instance(self.page[-1], self.ordering)
+        return self.encode_cursor(KeysetCursor(self.ordering, position, reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        position = self._get_position_from_instance(self.page[0], self.ordering)
+        return self.encode_cursor(KeysetCursor(self.ordering, position, reverse=True))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            payload = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+            ordering = tuple(payload['o'])
+            values = payload['p']
+            reverse = bool(payload.get('r', False))
+            if ordering != self.ordering or len(values) != len(self.keys):
+                raise ValueError('Cursor does not match the requested ordering')
+            position = [
+                None if value is None else key.field.to_python(value)
+                for key, value in zip(self.keys, values)
+            ]
+        except (TypeError, ValueError, KeyError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return KeysetCursor(ordering, position, reverse)
+
+    def encode_cursor(self, cursor):
+        payload = {
+            'o': list(cursor.ordering),
+            'p': [self._encode_value(value) for value in cursor.position],
+        }
+        if cursor.reverse:
+            payload['r'] = 1
+        encoded = b64encode(json.dumps(payload, separators=(',', ':')).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _get_position_from_instance(self, instance, ordering):
+        position = []
+        for key in self.keys:
+            if isinstance(instance, dict):
+                position.append(instance[key.attr])
+            else:
+                position.append(getattr(instance, key.attr))
+        return position
+
+    @staticmethod
+    def _encode_value(value):
+        # Keep full microsecond precision; the keyset comparison is exact.
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'page_size': self.page_size,
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['page_size'] = {'type': 'integer'}
+        return response_schema
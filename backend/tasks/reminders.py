@@ -0,0 +1,177 @@
+"""
+Deadline reminders without scanning tasks_task.
+
+ReminderScheduler (run by ``manage.py run_task_reminders``) keeps a min-heap
+of the reminders that fall due within a sliding window: a ``due_soon``
+reminder ``TASK_REMINDER_LEAD`` seconds before each deadline and an
+``overdue`` one at the deadline. The heap is filled by deadline range queries
+over the partial index on open tasks' deadlines, only ever for the part of
+the window not loaded yet, so the work done scales with upcoming deadlines
+rather than with the size of the table.
+
+The heap is kept current incrementally by polling the ``updated_at`` index
+for rows changed since the previous tick, which sees writes from every
+process (the API runs in other processes than the scheduler). Deletes leave
+no row to poll; their reminders are dropped by the re-check below.
+
+Reminders that fall due are re-checked against the database in one query per
+batch, then sent as ``task_reminders_due``; tasks/signals.py logs each one.
+Reminders that fell due before the scheduler started are not replayed.
+"""
+import heapq
+import logging
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+DUE_SOON = 'due_soon'
+OVERDUE = 'overdue'
+
+# Rows committed by long transactions can carry an updated_at slightly older
+# than the previous poll; re-reading this much history catches them.
+CHANGE_POLL_OVERLAP = timedelta(minutes=1)
+
+Reminder = namedtuple('Reminder', ['task_id', 'kind', 'deadline', 'title', 'assignee_id'])
+
+# Sent for each batch of reminders that fell due.
+# Arguments: sender=Task, reminders (list of Reminder).
+task_reminders_due = Signal()
+
+
+def get_lead_time():
+    return timedelta(seconds=getattr(settings, 'TASK_REMINDER_LEAD', 3600))
+
+
+class ReminderScheduler:
+    """
+    Min-heap of ``(fire_at, task_id, kind, deadline)`` reminder entries.
+
+    ``scheduled`` maps each task in the window to the deadline its reminders
+    were scheduled for. Rescheduling a task only updates that map and pushes
+    new entries; heap entries whose deadline no longer matches are stale and
+    are skipped when popped.
+    """
+
+    def __init__(self, window=timedelta(hours=1), lead=None, batch_size=100, now=None):
+        self.window = window
+        self.lead = get_lead_time() if lead is None else lead
+        self.batch_size = batch_size
+        self.now = self.started_at = now or timezone.now()
+        self.heap = []
+        self.scheduled = {}
+        # Open tasks with deadlines in [started_at, horizon) have been loaded
+        self.horizon = self.started_at
+        self.changed_since = self.started_at
+
+    def schedule(self, task_id, deadline, changed=True):
+        """
+        (Re)schedule a task's reminders; None drops them.
+
+        A task ``changed`` since the scheduler started gets a due_soon
+        reminder straight away when its deadline is already that close.
+        """
+        if self.scheduled.get(task_id) == deadline:
+            return
+        if deadline is not None and not self.now <= deadline < self.horizon:
+            # Past deadlines have nothing left to send; later ones are
+            # loaded again when the window reaches them
+            deadline = None
+        if deadline is None:
+            self.scheduled.pop(task_id, None)
+            return
+
+        self.scheduled[task_id] = deadline
+        due_soon = deadline - self.lead
+        if deadline > self.now and (changed or due_soon >= self.started_at):
+            heapq.heappush(self.heap, (due_soon, task_id, DUE_SOON, deadline))
+        heapq.heappush(self.heap, (deadline, task_id, OVERDUE, deadline))
+
+    def schedule_row(self, task_id, deadline, status, changed=True):
+        self.schedule(task_id, None if status == Task.Status.DONE else deadline, changed)
+
+    def poll_changes(self):
+        """Reschedule tasks written since the last poll"""
+        rows = (
+            Task.objects
+            .filter(updated_at__gte=self.changed_since - CHANGE_POLL_OVERLAP)
+            .order_by('updated_at')
+            .values_list('id', 'deadline', 'status', 'updated_at')
+        )
+        for task_id, deadline, status, updated_at in rows.iterator():
+            self.schedule_row(task_id, deadline, status, changed=updated_at >= self.started_at)
+            self.changed_since = max(self.changed_since, updated_at)
+
+    def extend_window(self):
+        """Load open tasks whose reminders enter the window, by deadline range"""
+        # due_soon reminders fire one lead time before the deadline
+        horizon = self.now + self.window + self.lead
+        if horizon <= self.horizon:
+            return
+        rows = (
+            Task.objects
+            .exclude(status=Task.Status.DONE)
+            .filter(deadline__gte=self.horizon, deadline__lt=horizon)
+            .order_by('deadline')
+            .values_list('id', 'deadline')
+        )
+        self.horizon = horizon
+        for task_id, deadline in rows.iterator():
+            self.schedule(task_id, deadline, changed=False)
+
+    def compact(self):
+        """Drop stale entries once they outnumber the live ones"""
+        if len(self.heap) > 4 * len(self.scheduled) + 1024:
+            self.heap = [entry for entry in self.heap if self.scheduled.get(entry[1]) == entry[3]]
+            heapq.heapify(self.heap)
+
+    def pop_due(self):
+        """Pop the ``(task_id, kind, deadline)`` reminders due by now"""
+        due = []
+        while self.heap and self.heap[0][0] <= self.now:
+            _, task_id, kind, deadline = heapq.heappop(self.heap)
+            if self.scheduled.get(task_id) != deadline:
+                continue
+            if kind == OVERDUE:
+                # Nothing left to send for this task
+                del self.scheduled[task_id]
+            due.append((task_id, kind, deadline))
+        return due
+
+    def emit(self, due):
+        """Re-check due reminders against the database and send them in batches"""
+        sent = 0
+        for start in range(0, len(due), self.batch_size):
+            batch = due[start:start + self.batch_size]
+            rows = {
+                row['id']: row
+                for row in Task.objects
+                .filter(pk__in=[task_id for task_id, _, _ in batch])
+                .exclude(status=Task.Status.DONE)
+                .values('id', 'title', 'deadline', 'assignee_id')
+            }
+            reminders = [
+                Reminder(task_id, kind, deadline, rows[task_id]['title'], rows[task_id]['assignee_id'])
+                for task_id, kind, deadline in batch
+                # Deleted, done or rescheduled since the last poll
+                if task_id in rows and rows[task_id]['deadline'] == deadline
+            ]
+            if reminders:
+                task_reminders_due.send(sender=Task, reminders=reminders)
+                logger.info('Sent %d task reminders', len(reminders))
+                sent += len(reminders)
+        return sent
+
+    def tick(self, now=None):
+        """Apply task changes, slide the window and send what fell due; returns the number sent"""
+        self.now = now or timezone.now()
+        self.poll_changes()
+        self.extend_window()
+        self.compact()
+        return self.emit(self.pop_due())
@@ -0,0 +1,171 @@
+"""
+Full-text search engines for tasks.
+
+Each engine filters a Task queryset down to the rows matching a query and
+annotates them with ``search_rank`` (higher is more relevant) and, when
+asked, ``search_snippet`` (matched text wrapped in ``<mark>`` tags; the
+surrounding text is not HTML-escaped).
+
+The index structures are created by migration ``0003_task_full_text_search``:
+
+- PostgreSQL: a generated ``search_vector`` tsvector column with a GIN index.
+- SQLite: an external-content FTS5 table, ``tasks_task_fts``, kept in sync
+  with ``tasks_task`` by triggers, so bulk writes are covered as well.
+"""
+import re
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import BooleanField, CharField, FloatField
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import Task
+
+SNIPPET_START = '<mark>'
+SNIPPET_END = '</mark>'
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class BaseSearchEngine:
+    """Interface for task search engines."""
+
+    vendor = None
+
+    def is_available(self, queryset):
+        connection = connections[queryset.db]
+        return queryset.model is Task and connection.vendor == self.vendor
+
+    def search(self, queryset, terms, highlight=False):
+        raise NotImplementedError
+
+
+class PostgresSearchEngine(BaseSearchEngine):
+    """Ranked search over the GIN-indexed ``search_vector`` column."""
+
+    vendor = 'postgresql'
+    config = 'english'
+
+    def build_query(self, terms):
+        # Every word must match, each as a prefix, like the old icontains search.
+        words = [word for term in terms for word in _WORD_RE.findall(term)]
+        return ' & '.join(f'{word}:*' for word in words)
+
+    def search(self, queryset, terms, highlight=False):
+        query = self.build_query(terms)
+        if not query:
+            return queryset.none()
+
+        table = connections[queryset.db].ops.quote_name(queryset.model._meta.db_table)
+        tsquery = f"to_tsquery('{self.config}', %s)"
+        queryset = queryset.filter(
+            RawSQL(f'{table}.search_vector @@ {tsquery}', [query], output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(f'ts_rank_cd({table}.search_vector, {tsquery})', [query], output_field=FloatField())
+        )
+        if highlight:
+            options = f'StartSel={SNIPPET_START}, StopSel={SNIPPET_END}, MaxWords=30, MinWords=10'
+            queryset = queryset.annotate(
+                search_snippet=RawSQL(
+                    f"ts_headline('{self.config}', {table}.title || ' ' || {table}.description, "
+                    f"{tsquery}, %s)",
+                    [query, options],
+                    output_field=CharField(),
+                )
+            )
+        return queryset
+
+
+class SQLiteFTS5Search(BaseSearchEngine):
+    """Ranked search through the ``tasks_task_fts`` FTS5 shadow table."""
+
+    vendor = 'sqlite'
+    fts_table = 'tasks_task_fts'
+    # bm25 column weights for (title, description)
+    weights = (10.0, 1.0)
+
+    def __init__(self):
+        self._available = {}
+
+    def is_available(self, queryset):
+        if not super().is_available(queryset):
+            return False
+        if queryset.db not in self._available:
+            with connections[queryset.db].cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                    [self.fts_table],
+                )
+                self._available[queryset.db] = cursor.fetchone() is not None
+        return self._available[queryset.db]
+
+    def build_query(self, terms):
+        # Quote each word so FTS5 operators in user input are treated as text.
+        words = [word for term in terms for word in _WORD_RE.findall(term)]
+        return ' '.join('"{}"*'.format(word.replace('"', '""')) for word in words)
+
+    def search(self, queryset, terms, highlight=False):
+        query = self.build_query(terms)
+        if not query:
+            return queryset.none()
+
+        table = connections[queryset.db].ops.quote_name(queryset.model._meta.db_table)
+        fts = self.fts_table
+        weights = ', '.join(str(weight) for weight in self.weights)
+        queryset = queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s', [query])
+        ).annotate(
+            # bm25() is lower-is-better; negate it so every engine ranks descending.
+            search_rank=RawSQL(
+                f'SELECT -bm25({fts}, {weights}) FROM {fts} '
+                f'WHERE {fts} MATCH %s AND rowid = {table}.id',
+                [query],
+                output_field=FloatField(),
+            )
+        )
+        if highlight:
+            queryset = queryset.annotate(
+                search_snippet=RawSQL(
+                    f'SELECT snippet({fts}, -1, %s, %s, %s, 12) FROM {fts} '
+                    f'WHERE {fts} MATCH %s AND rowid = {table}.id',
+                    [SNIPPET_START, SNIPPET_END, '…', query],
+                    output_field=CharField(),
+                )
+            )
+        return queryset
+
+
+ENGINES = {
+    'postgresql': PostgresSearchEngine,
+    'sqlite': SQLiteFTS5Search,
+}
+
+_engine_cache = {}
+
+
+def get_search_engine(queryset):
+    """
+    Return the engine configured by ``TASK_SEARCH_BACKEND`` for the
+    queryset's database, or None to fall back to ``SearchFilter``.
+
+    ``TASK_SEARCH_BACKEND`` is ``'auto'`` (pick by database vendor),
+    ``'basic'`` (always use icontains), or the dotted path of an engine class.
+    """
+    backend = getattr(settings, 'TASK_SEARCH_BACKEND', 'auto')
+    if backend == 'basic':
+        return None
+
+    vendor = connections[queryset.db].vendor
+    key = (backend, vendor)
+    if key not in _engine_cache:
+        if backend == 'auto':
+            engine_class = ENGINES.get(vendor)
+        else:
+            engine_class = import_string(backend)
+        _engine_cache[key] = engine_class() if engine_class else None
+
+    engine = _engine_cache[key]
+    if engine is None or not engine.is_available(queryset):
+        return None
+    return engine
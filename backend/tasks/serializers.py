@@ -1,13 +1,47 @@
-from rest_framework import serializers
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+from core.middleware import record_serialization
+from core.serializers import TimedSerializerMixin
 from .models import Task
 
 User = get_user_model()
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class AssigneeField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field for the task assignee.
+    
+    When the serializer context carries an ``assignees`` mapping of
+    ``{pk: user}`` (prefetched with one IN query by bulk endpoints), the user
+    is looked up there instead of issuing a query per item.
+    """
+    
+    def to_internal_value(self, data):
+        assignees = self.context.get('assignees')
+        if assignees is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        user = assignees.get(pk)
+        if user is None:
+            self.fail('does_not_exist', pk_value=data)
+        return user
+
+
+class TaskSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for Task CRUD operations"""
     
+    assignee = AssigneeField(
+        queryset=User.objects.all(),
+        allow_null=True,
+        required=False,
+    )
     assignee_username = serializers.CharField(
         source='assignee.username',
         read_only=True,
@@ -44,12 +78,13 @@ class TaskSerializer(serializers.ModelSerializer):
         return value
 
 
-class TaskReadSerializer(serializers.ModelSerializer):
+class TaskReadSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Read-only serializer for Task (with nested user info)"""
     
     assignee_username = serializers.CharField(source='assignee.username', read_only=True)
     assignee_email = serializers.EmailField(source='assignee.email', read_only=True)
     assignee_role = serializers.CharField(source='assignee.role', read_only=True)
+    is_overdue = serializers.SerializerMethodField()
     
     class Meta:
         model = Task
@@ -59,6 +94,7 @@ class TaskReadSerializer(serializers.ModelSerializer):
             'description',
             'status',
             'deadline',
+            'is_overdue',
             'assignee',
             'assignee_username',
             'assignee_email',
@@ -67,4 +103,122 @@ class TaskReadSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+    
+    def get_is_overdue(self, instance):
+        """Read the ``overdue`` annotation from TaskQuerySet.with_overdue when present"""
+        overdue = getattr(instance, 'overdue', None)
+        return instance.is_overdue if overdue is None else overdue
+    
+    def to_representation(self, instance):
+        """Include the search snippet when the list was highlighted"""
+        data = super().to_representation(instance)
+        snippet = getattr(instance, 'search_snippet', None)
+        if snippet is not None:
+            data['search_snippet'] = snippet
+        return data
+
+
+_datetime_field = serializers.DateTimeField()
+
+
+def format_datetime(value, tz=None):
+    """Format a datetime exactly as DRF's DateTimeField would"""
+    if value is None:
+        return None
+    if api_settings.DATETIME_FORMAT != ISO_8601:
+        return _datetime_field.to_representation(value)
+    if timezone.is_aware(value):
+        value = value.astimezone(tz or timezone.get_current_timezone())
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
 
+class TaskFastReadSerializer:
+    """
+    Fast path equivalent of TaskReadSerializer for list and retrieve.
+    
+    Works on ``.values()`` rows produced by ``project()``, where the assignee
+    join has already been done in SQL, and builds the same output dicts
+    directly instead of running DRF's per-field machinery for every row.
+    Like TaskReadSerializer, the ``assignee_*`` keys are omitted for
+    unassigned tasks.
+    """
+    
+    lookups = [
+        'id',
+        'title',
+        'description',
+        'status',
+        'deadline',
+        'overdue',
+        'assignee',
+        'assignee__username',
+        'assignee__email',
+        'assignee__role',
+        'created_at',
+        'updated_at',
+    ]
+    # Queryset annotations that are passed through when present
+    optional_annotations = ['search_rank', 'search_snippet']
+    
+    def __init__(self, instance=None, many=False, **kwargs):
+        self.instance = instance
+        self.many = many
+    
+    @classmethod
+    def project(cls, queryset):
+        """Turn a Task queryset into the ``.values()`` rows this serializer reads"""
+        if 'overdue' not in queryset.query.annotations:
+            queryset = queryset.with_overdue()
+        annotations = [name for name in cls.optional_annotations if name in queryset.query.annotations]
+        return queryset.values(*cls.lookups, *annotations)
+    
+    @property
+    def data(self):
+        tz = timezone.get_current_timezone()
+        with record_serialization():
+            if self.many:
+                return [self.to_representation(row, tz) for row in self.instance]
+            return self.to_representation(self.instance, tz)
+    
+    @staticmethod
+    def to_representation(row, tz=None):
+        data = {
+            'id': row['id'],
+            'title': row['title'],
+            'description': row['description'],
+            'status': row['status'],
+            'deadline': format_datetime(row['deadline'], tz),
+            'is_overdue': row['overdue'],
+            'assignee': row['assignee'],
+        }
+        if row['assignee'] is not None:
+            data['assignee_username'] = row['assignee__username']
+            data['assignee_email'] = row['assignee__email']
+            data['assignee_role'] = row['assignee__role']
+        data['created_at'] = format_datetime(row['created_at'], tz)
+        data['updated_at'] = format_datetime(row['updated_at'], tz)
+        snippet = row.get('search_snippet')
+        if snippet is not None:
+            data['search_snippet'] = snippet
+        return data
+
+
+class TaskBulkOperationSerializer(serializers.Serializer):
+    """Envelope for one operation in a bulk task request"""
+    
+    OPERATIONS = ['create', 'update', 'delete']
+    
+    op = serializers.ChoiceField(choices=OPERATIONS)
+    id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False)
+    
+    def validate(self, attrs):
+        """Require an id for update/delete and data for create/update"""
+        if attrs['op'] in ['update', 'delete'] and 'id' not in attrs:
+            raise serializers.ValidationError({'id': 'This field is required.'})
+        if attrs['op'] in ['create', 'update'] and 'data' not in attrs:
+            raise serializers.ValidationError({'data': 'This field is required.'})
+        return attrs
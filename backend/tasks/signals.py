@@ -0,0 +1,171 @@
+import logging
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from core.cache import bump_version
+
+from . import cache as response_cache
+from . import events
+from . import reminders
+from .models import Task, TaskStatusCounter, TaskTombstone
+
+User = get_user_model()
+
+reminder_logger = logging.getLogger('tasks.reminders')
+
+# Sent after tasks are written with bulk_create/bulk_update, which bypass
+# post_save. Arguments: sender=Task, instances (list of Task), created (bool).
+tasks_bulk_saved = Signal()
+
+# Sent after tasks are moved to the archive (tasks/archive.py), which deletes
+# them without post_delete. Arguments: sender=Task, instances (list of Task).
+tasks_archived = Signal()
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(tasks_bulk_saved, sender=Task)
+@receiver(tasks_archived, sender=Task)
+def invalidate_task_responses(sender, **kwargs):
+    """Task writes change every cached list they could appear in."""
+    bump_version(response_cache.NAMESPACE)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_task_responses_for_user(sender, update_fields=None, **kwargs):
+    """Task responses embed the assignee's username, email and role."""
+    # Logging in only touches last_login, which no task response shows
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    bump_version(response_cache.NAMESPACE)
+
+
+def _previous_assignee(task):
+    original = getattr(task, '_original_counter_key', None)
+    return original[0] if original else None
+
+
+# The event receivers read _original_counter_key, so they must run before
+# count_bulk_saved_tasks replaces it
+@receiver(post_save, sender=Task)
+def publish_saved_task(sender, instance, created, **kwargs):
+    kind = events.CREATED if created else events.UPDATED
+    events.queue_changes([(kind, instance.pk, None if created else _previous_assignee(instance))])
+
+
+@receiver(post_delete, sender=Task)
+def publish_deleted_task(sender, instance, **kwargs):
+    events.queue_changes([(events.DELETED, instance.pk, _previous_assignee(instance) or instance.assignee_id)])
+
+
+@receiver(tasks_bulk_saved, sender=Task)
+def publish_bulk_saved_tasks(sender, instances, created, **kwargs):
+    kind = events.CREATED if created else events.UPDATED
+    events.queue_changes([
+        (kind, task.pk, None if created else _previous_assignee(task))
+        for task in instances
+    ])
+
+
+@receiver(tasks_archived, sender=Task)
+def publish_archived_tasks(sender, instances, **kwargs):
+    # Gone from the task list, like a deleted task
+    events.queue_changes([(events.DELETED, task.pk, task.assignee_id) for task in instances])
+
+
+@receiver(post_save, sender=Task)
+def record_reassigned_task(sender, instance, created, **kwargs):
+    """The previous assignee's clients must drop the task on their next delta sync."""
+    previous = None if created else _previous_assignee(instance)
+    if previous is not None and previous != instance.assignee_id:
+        TaskTombstone.objects.create(task_id=instance.pk, assignee_id=previous, reason=TaskTombstone.Reason.REASSIGNED)
+
+
+@receiver(post_delete, sender=Task)
+def record_deleted_task(sender, instance, **kwargs):
+    TaskTombstone.objects.create(
+        task_id=instance.pk,
+        assignee_id=_previous_assignee(instance) or instance.assignee_id,
+        reason=TaskTombstone.Reason.DELETED,
+    )
+
+
+@receiver(tasks_bulk_saved, sender=Task)
+def record_bulk_reassigned_tasks(sender, instances, created, **kwargs):
+    if created:
+        return
+    TaskTombstone.objects.bulk_create([
+        TaskTombstone(task_id=task.pk, assignee_id=previous, reason=TaskTombstone.Reason.REASSIGNED)
+        for task in instances
+        if (previous := _previous_assignee(task)) is not None and previous != task.assignee_id
+    ])
+
+
+@receiver(tasks_archived, sender=Task)
+def record_archived_tasks(sender, instances, **kwargs):
+    TaskTombstone.objects.bulk_create([
+        TaskTombstone(task_id=task.pk, assignee_id=task.assignee_id, reason=TaskTombstone.Reason.ARCHIVED)
+        for task in instances
+    ])
+
+
+@receiver(pre_save, sender=User)
+def record_scope_change(sender, instance, update_fields=None, **kwargs):
+    """Becoming or ceasing to be a Member changes which tasks the user can see."""
+    if instance._state.adding or (update_fields is not None and 'role' not in update_fields):
+        return
+    previous = User.objects.filter(pk=instance.pk).values_list('role', flat=True).first()
+    if previous is not None and (previous == User.Role.MEMBER) != (instance.role == User.Role.MEMBER):
+        TaskTombstone.objects.create(assignee_id=instance.pk, reason=TaskTombstone.Reason.SCOPE_CHANGED)
+
+
+@receiver(post_delete, sender=Task)
+def count_deleted_task(sender, instance, **kwargs):
+    """Runs inside the delete transaction, including queryset deletes."""
+    original = getattr(instance, '_original_counter_key', None)
+    TaskStatusCounter.record_change(original or instance.counter_key, None)
+
+
+@receiver(tasks_bulk_saved, sender=Task)
+def count_bulk_saved_tasks(sender, instances, created, **kwargs):
+    """
+    bulk_create/bulk_update skip Task.save, so adjust the counters here.
+    Updated instances must have been loaded from the database (from_db).
+    """
+    TaskStatusCounter.apply_changes(
+        (None if created else getattr(task, '_original_counter_key', None), task.counter_key)
+        for task in instances
+    )
+    for task in instances:
+        task.remember_counter_key()
+
+
+@receiver(tasks_archived, sender=Task)
+def count_archived_tasks(sender, instances, **kwargs):
+    """The counters, like the dashboard, cover tasks_task only."""
+    TaskStatusCounter.apply_changes((task.counter_key, None) for task in instances)
+
+
+@receiver(pre_delete, sender=User)
+def move_counters_to_unassigned(sender, instance, **kwargs):
+    """The user's tasks become unassigned (SET_NULL) without going through Task.save."""
+    for status, count in instance.task_counters.values_list('status', 'count'):
+        TaskStatusCounter.adjust(None, status, count)
+    # The user's own counter rows are removed by the cascade
+    # Delta sync clients must see the new assignee
+    instance.assigned_tasks.update(updated_at=timezone.now())
+
+
+@receiver(reminders.task_reminders_due, sender=Task)
+def log_task_reminders(sender, reminders, **kwargs):
+    """Record every reminder sent; delivery (mail, push) can hook the same signal."""
+    for reminder in reminders:
+        reminder_logger.info(
+            'Task %s is %s (deadline %s, assignee %s)',
+            reminder.task_id, reminder.kind.replace('_', ' '), reminder.deadline.isoformat(), reminder.assignee_id,
+            extra=reminder._asdict(),
+        )
@@ -0,0 +1,101 @@
+"""
+Delta sync behind ``GET /api/tasks/changes/?since=<token>``.
+
+A sync token is a point in time (microseconds since the epoch). A response
+covers the writes between the request's token and the one it returns:
+
+- upserts: tasks in the user's scope with ``updated_at`` in that range, read
+  in ``(updated_at, id)`` order from the updated_at indexes;
+- removals: ids from TaskTombstone rows in that range, for deleted and
+  archived tasks and tasks reassigned out of a Member's scope.
+
+Tokens never move backwards. Writes from the last ``TASK_CHANGES_SETTLE``
+seconds are left for the next sync, since a transaction can commit after
+rows with later timestamps; a sync that starts too soon simply returns
+nothing new. ``reset`` means the client must reload the task list and sync
+from the returned token: there was no token, it is older than the tombstone
+retention, or the user's role changed what they can see.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import TaskTombstone
+from .serializers import TaskFastReadSerializer
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def get_settle_time():
+    return timedelta(seconds=getattr(settings, 'TASK_CHANGES_SETTLE', 2))
+
+
+def get_tombstone_retention():
+    return timedelta(days=getattr(settings, 'TASK_TOMBSTONE_RETENTION', 30))
+
+
+def encode_token(moment):
+    return str((moment - EPOCH) // timedelta(microseconds=1))
+
+
+def decode_token(token):
+    """Raises ValueError for a malformed token"""
+    value = int(token)
+    if value < 0:
+        raise ValueError(token)
+    return EPOCH + timedelta(microseconds=value)
+
+
+def sync_changes(queryset, user, since, limit):
+    """
+    Changes to ``queryset`` (the user's scoped tasks) after ``since`` (a
+    datetime or None), at most ``limit`` upserts plus any that share the
+    last one's timestamp.
+    """
+    now = timezone.now()
+    horizon = now - get_settle_time()
+    result = {'token': None, 'reset': False, 'has_more': False, 'upserts': [], 'removals': []}
+
+    tombstones = TaskTombstone.objects.all()
+    if since is None or since < now - get_tombstone_retention() or tombstones.filter(
+        reason=TaskTombstone.Reason.SCOPE_CHANGED, assignee_id=user.pk, created_at__gt=since,
+    ).exists():
+        result.update(token=encode_token(horizon), reset=True)
+        return result
+    if since >= horizon:
+        result['token'] = encode_token(since)
+        return result
+
+    rows = TaskFastReadSerializer.project(
+        queryset.filter(updated_at__gt=since, updated_at__lte=horizon).order_by('updated_at', 'id')
+    )
+    page = list(rows[:limit + 1])
+    until = horizon
+    if len(page) > limit:
+        page = page[:limit]
+        until = page[-1]['updated_at']
+        # The next sync starts after ``until``, so take its ties now
+        page += rows.filter(updated_at=until, id__gt=page[-1]['id'])
+        result['has_more'] = True
+
+    if user.role == user.Role.MEMBER:
+        tombstones = tombstones.filter(assignee_id=user.pk)
+    else:
+        tombstones = tombstones.filter(reason__in=[TaskTombstone.Reason.DELETED, TaskTombstone.Reason.ARCHIVED])
+    upserted = {row['id'] for row in page}
+    removals = (
+        tombstones
+        .filter(created_at__gt=since, created_at__lte=until, task_id__isnull=False)
+        .values_list('task_id', flat=True)
+    )
+
+    tz = timezone.get_current_timezone()
+    result.update(
+        token=encode_token(until),
+        upserts=[TaskFastReadSerializer.to_representation(row, tz) for row in page],
+        # A task removed and then back in scope is an upsert
+        removals=sorted(set(removals) - upserted),
+    )
+    return result
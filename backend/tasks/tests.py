@@ -1,10 +1,32 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import random
+import time
+from unittest import mock
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.test import TestCase, override_settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.db.models import Count
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta
-from rest_framework.test import APIClient
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
 from rest_framework import status
-from .models import Task
+from core.testing import QueryBudgetMixin
+from .models import ArchivedTask, Task, TaskStatusCounter, TaskTombstone
+from .serializers import TaskReadSerializer, TaskFastReadSerializer
+from . import cache as response_cache
+from . import events
+from . import reminders
+from . import sync as task_sync
+from .views import AsyncTaskViewSet, TaskViewSet
+from .benchmarking import manual_timestamps, seed_tasks
+from .management.commands.benchmark_api import SCENARIOS, Command as BenchmarkApiCommand
 
 User = get_user_model()
 
@@ -241,3 +263,1978 @@ class TaskAPIViewSetTests(TestCase):
         self.client.force_authenticate(user=self.admin_user)
         response = self.client.get(f'/api/tasks/?assignee={self.member_user.id}')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class TaskCursorPaginationTests(TestCase):
+    """Tests for keyset pagination of the task list"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.manager_user = User.objects.create_user(
+            username='manager',
+            password='testpass123',
+            role=User.Role.MANAGER,
+        )
+        self.member_user = User.objects.create_user(
+            username='member',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+        now = timezone.now()
+        self.tasks = []
+        for i in range(7):
+            self.tasks.append(Task.objects.create(
+                title=f'Task {i}',
+                status=Task.Status.DONE if i % 2 else Task.Status.TODO,
+                assignee=self.member_user if i < 5 else None,
+                deadline=now + timedelta(days=i) if i % 3 else None,
+            ))
+        # Give two tasks the same created_at to exercise the id tiebreaker
+        Task.objects.filter(id__in=[self.tasks[2].id, self.tasks[3].id]).update(
+            created_at=self.tasks[2].created_at
+        )
+        self.client.force_authenticate(user=self.manager_user)
+    
+    def _walk(self, url):
+        ids = []
+        pages = 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(task['id'] for task in response.data['results'])
+            url = response.data['next']
+            pages += 1
+        return ids, pages
+    
+    def test_list_is_paginated_by_default(self):
+        """Test that the task list returns a cursor page"""
+        response = self.client.get('/api/tasks/?page_size=3')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertIsNotNone(response.data['next'])
+        self.assertIsNone(response.data['previous'])
+        self.assertNotIn('count', response.data)
+    
+    def test_walking_pages_returns_every_task_once_in_order(self):
+        """Test that following next links visits each task exactly once"""
+        ids, pages = self._walk('/api/tasks/?page_size=2')
+        expected = list(
+            Task.objects.order_by('-created_at', 'id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 4)
+    
+    def test_ordering_on_nullable_deadline(self):
+        """Test that deadline ordering pages across NULL deadlines"""
+        for ordering in ['deadline', '-deadline']:
+            ids, _ = self._walk(f'/api/tasks/?page_size=2&ordering={ordering}')
+            self.assertEqual(sorted(ids), sorted(task.id for task in self.tasks))
+            self.assertEqual(len(ids), len(set(ids)))
+    
+    def test_previous_link_returns_preceding_page(self):
+        """Test that the previous link returns the page before"""
+        first = self.client.get('/api/tasks/?page_size=3')
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [task['id'] for task in back.data['results']],
+            [task['id'] for task in first.data['results']],
+        )
+    
+    def test_pagination_respects_filters_and_scope(self):
+        """Test that filters and member scoping apply to every page"""
+        ids, _ = self._walk('/api/tasks/?page_size=1&status=Todo')
+        self.assertEqual(
+            sorted(ids),
+            sorted(task.id for task in self.tasks if task.status == Task.Status.TODO),
+        )
+        
+        self.client.force_authenticate(user=self.member_user)
+        ids, _ = self._walk('/api/tasks/?page_size=2')
+        self.assertEqual(sorted(ids), sorted(task.id for task in self.tasks[:5]))
+    
+    def test_invalid_cursor_returns_404(self):
+        """Test that a tampered cursor is rejected"""
+        response = self.client.get('/api/tasks/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_paginate_false_returns_plain_list(self):
+        """Test the opt-in for the legacy unpaginated response"""
+        response = self.client.get('/api/tasks/?paginate=false')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), len(self.tasks))
+
+
+class TaskSearchTests(TestCase):
+    """Tests for full-text task search"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.manager_user = User.objects.create_user(
+            username='manager',
+            password='testpass123',
+            role=User.Role.MANAGER,
+        )
+        self.title_match = Task.objects.create(
+            title='Deploy billing service',
+            description='Roll out the new release',
+        )
+        self.description_match = Task.objects.create(
+            title='Quarterly review',
+            description='Check the billing dashboards after deploy',
+        )
+        self.no_match = Task.objects.create(
+            title='Plan offsite',
+            description='Book the venue',
+        )
+        self.client.force_authenticate(user=self.manager_user)
+    
+    def _search_ids(self, query):
+        response = self.client.get('/api/tasks/', {'search': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [task['id'] for task in response.data['results']]
+    
+    def test_search_matches_title_and_description(self):
+        """Test that search finds matches in both title and description"""
+        ids = self._search_ids('billing')
+        self.assertCountEqual(ids, [self.title_match.id, self.description_match.id])
+    
+    def test_search_requires_every_term(self):
+        """Test that multiple terms are combined with AND"""
+        self.assertEqual(self._search_ids('billing review'), [self.description_match.id])
+    
+    def test_search_matches_prefixes(self):
+        """Test that partial words still match"""
+        self.assertEqual(self._search_ids('offs'), [self.no_match.id])
+    
+    def test_search_orders_by_relevance(self):
+        """Test that title matches rank above description matches"""
+        self.assertEqual(
+            self._search_ids('billing'),
+            [self.title_match.id, self.description_match.id],
+        )
+    
+    def test_search_index_follows_updates_and_deletes(self):
+        """Test that the search index stays in sync with the task table"""
+        self.no_match.title = 'Plan billing offsite'
+        self.no_match.save()
+        self.assertIn(self.no_match.id, self._search_ids('billing'))
+        
+        self.title_match.delete()
+        self.assertNotIn(self.title_match.id, self._search_ids('billing'))
+    
+    def test_search_ignores_query_syntax(self):
+        """Test that operator characters in the query are treated as text"""
+        self.assertEqual(self._search_ids('"billing" (*:'), self._search_ids('billing'))
+    
+    def test_highlight_returns_snippet(self):
+        """Test that ?highlight=true adds a marked snippet"""
+        response = self.client.get('/api/tasks/', {'search': 'venue', 'highlight': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('<mark>venue</mark>', response.data['results'][0]['search_snippet'])
+        
+        response = self.client.get('/api/tasks/', {'search': 'venue'})
+        self.assertNotIn('search_snippet', response.data['results'][0])
+    
+    def test_search_results_paginate(self):
+        """Test that relevance-ordered results page with cursors"""
+        response = self.client.get('/api/tasks/', {'search': 'billing', 'page_size': 1})
+        first_id = response.data['results'][0]['id']
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertNotEqual(response.data['results'][0]['id'], first_id)
+
+
+class TaskBulkEndpointTests(TestCase):
+    """Tests for the bulk task endpoint"""
+    
+    url = '/api/tasks/bulk/'
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            password='testpass123',
+            role=User.Role.ADMIN,
+        )
+        self.manager_user = User.objects.create_user(
+            username='manager',
+            password='testpass123',
+            role=User.Role.MANAGER,
+        )
+        self.member_user = User.objects.create_user(
+            username='member',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+        self.other_member = User.objects.create_user(
+            username='othermember',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+        self.member_task = Task.objects.create(title='Mine', assignee=self.member_user)
+        self.other_task = Task.objects.create(title='Theirs', assignee=self.other_member)
+    
+    def test_manager_bulk_create_reports_each_item(self):
+        """Test that valid items are created and invalid ones are reported"""
+        self.client.force_authenticate(user=self.manager_user)
+        response = self.client.post(self.url, {'operations': [
+            {'op': 'create', 'data': {'title': 'A', 'assignee': self.member_user.id}},
+            {'op': 'create', 'data': {'title': 'B', 'assignee': 999999}},
+            {'op': 'create', 'data': {'title': 'C', 'status': 'Blocked'}},
+            {'op': 'explode'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['failed'], 3)
+        statuses = [result['status'] for result in response.data['results']]
+        self.assertEqual(statuses, [201, 400, 400, 400])
+        self.assertIn('assignee', response.data['results'][1]['errors'])
+        created = Task.objects.get(id=response.data['results'][0]['data']['id'])
+        self.assertEqual(created.assignee, self.member_user)
+    
+    def test_bulk_create_uses_constant_queries(self):
+        """Test that assignees are validated with a single query"""
+        self.client.force_authenticate(user=self.manager_user)
+        assignees = [self.member_user.id, self.other_member.id, self.manager_user.id]
+        
+        def payload(count):
+            return {'operations': [
+                {'op': 'create', 'data': {'title': f'Task {i}', 'assignee': assignees[i % 3]}}
+                for i in range(count)
+            ]}
+        
+        # The first write per (assignee, status) also creates its counter row
+        self.client.post(self.url, payload(3), format='json')
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self.url, payload(3), format='json')
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.post(self.url, payload(30), format='json')
+        self.assertEqual(response.data['created'], 30)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+    
+    def test_member_bulk_applies_role_permissions(self):
+        """Test that each item is checked against the member's permissions"""
+        self.client.force_authenticate(user=self.member_user)
+        response = self.client.post(self.url, {'operations': [
+            {'op': 'update', 'id': self.member_task.id, 'data': {'status': 'Done'}},
+            {'op': 'update', 'id': self.other_task.id, 'data': {'status': 'Done'}},
+            {'op': 'create', 'data': {'title': 'Nope'}},
+            {'op': 'delete', 'id': self.member_task.id},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        statuses = [result['status'] for result in response.data['results']]
+        # The repeated id is rejected before permissions are checked
+        self.assertEqual(statuses, [200, 404, 403, 400])
+        self.member_task.refresh_from_db()
+        self.other_task.refresh_from_db()
+        self.assertEqual(self.member_task.status, Task.Status.DONE)
+        self.assertEqual(self.other_task.status, Task.Status.TODO)
+    
+    def test_bulk_update_bumps_updated_at(self):
+        """Test that bulk updates stamp updated_at like a regular save"""
+        before = self.member_task.updated_at
+        self.client.force_authenticate(user=self.manager_user)
+        response = self.client.post(self.url, [
+            {'op': 'update', 'id': self.member_task.id, 'data': {'assignee': self.other_member.id}},
+        ], format='json')
+        self.assertEqual(response.data['updated'], 1)
+        self.member_task.refresh_from_db()
+        self.assertEqual(self.member_task.assignee, self.other_member)
+        self.assertGreater(self.member_task.updated_at, before)
+    
+    def test_bulk_update_writes_only_each_items_fields(self):
+        """Test that an item does not overwrite fields it left alone, even if another item changed them"""
+        has_permission = TaskViewSet._has_bulk_permission
+        
+        def edit_elsewhere(view, action_name, instance=None):
+            # Another request edits both tasks after the bulk request loaded them
+            if instance is not None and instance.pk == self.other_task.pk:
+                Task.objects.filter(pk=self.member_task.pk).update(title='Edited elsewhere')
+                Task.objects.filter(pk=self.other_task.pk).update(description='Edited elsewhere')
+            return has_permission(view, action_name, instance)
+        
+        self.client.force_authenticate(user=self.manager_user)
+        with mock.patch.object(TaskViewSet, '_has_bulk_permission', edit_elsewhere):
+            response = self.client.post(self.url, [
+                {'op': 'update', 'id': self.member_task.id, 'data': {'status': Task.Status.DONE}},
+                {'op': 'update', 'id': self.other_task.id, 'data': {'title': 'Renamed'}},
+            ], format='json')
+        self.assertEqual(response.data['updated'], 2)
+        self.member_task.refresh_from_db()
+        self.other_task.refresh_from_db()
+        self.assertEqual((self.member_task.title, self.member_task.status), ('Edited elsewhere', Task.Status.DONE))
+        self.assertEqual((self.other_task.title, self.other_task.description), ('Renamed', 'Edited elsewhere'))
+    
+    def test_only_admin_can_bulk_delete(self):
+        """Test that bulk delete requires the Admin role"""
+        operations = [{'op': 'delete', 'id': self.other_task.id}]
+        self.client.force_authenticate(user=self.manager_user)
+        response = self.client.post(self.url, operations, format='json')
+        self.assertEqual(response.data['results'][0]['status'], 403)
+        self.assertTrue(Task.objects.filter(id=self.other_task.id).exists())
+        
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.post(self.url, operations, format='json')
+        self.assertEqual(response.data['deleted'], 1)
+        self.assertFalse(Task.objects.filter(id=self.other_task.id).exists())
+    
+    def test_bulk_rejects_empty_or_oversized_requests(self):
+        """Test request-level validation"""
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.post(self.url, {'operations': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        operations = [{'op': 'delete', 'id': i} for i in range(501)]
+        response = self.client.post(self.url, operations, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TaskExportTests(TestCase):
+    """Tests for the streaming task export"""
+    
+    url = '/api/tasks/export/'
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.manager_user = User.objects.create_user(
+            username='manager',
+            password='testpass123',
+            role=User.Role.MANAGER,
+            email='manager@example.com',
+        )
+        self.member_user = User.objects.create_user(
+            username='member',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+        self.member_task = Task.objects.create(
+            title='Write, "quoted" report',
+            status=Task.Status.IN_PROGRESS,
+            assignee=self.member_user,
+            deadline=timezone.now() + timedelta(days=1),
+        )
+        self.manager_task = Task.objects.create(title='Budget', assignee=self.manager_user)
+        self.unassigned_task = Task.objects.create(title='Unassigned')
+    
+    def _content(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b''.join(response.streaming_content).decode('utf-8')
+    
+    def test_csv_export_matches_read_serializer(self):
+        """Test that CSV rows carry the same values as the API"""
+        self.client.force_authenticate(user=self.manager_user)
+        response = self.client.get(self.url)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        self.assertIn('attachment;', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(self._content(response))))
+        self.assertEqual(len(rows), 3)
+        
+        api = self.client.get(f'/api/tasks/{self.member_task.id}/').data
+        row = next(row for row in rows if row['id'] == str(self.member_task.id))
+        self.assertEqual(row['title'], api['title'])
+        self.assertEqual(row['deadline'], api['deadline'])
+        self.assertEqual(row['created_at'], api['created_at'])
+        self.assertEqual(row['assignee_username'], 'member')
+        self.assertEqual(row['is_overdue'], str(api['is_overdue']))
+        self.assertEqual(list(rows[0]), [*api.keys()])
+    
+    def test_ndjson_export_honours_scope_and_filters(self):
+        """Test member scoping and filters in the NDJSON export"""
+        self.client.force_authenticate(user=self.member_user)
+        response = self.client.get(self.url, {'format': 'ndjson'})
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        rows = [json.loads(line) for line in self._content(response).splitlines()]
+        self.assertEqual([row['id'] for row in rows], [self.member_task.id])
+        
+        self.client.force_authenticate(user=self.manager_user)
+        response = self.client.get(self.url, {'format': 'ndjson', 'status': 'Todo'})
+        rows = [json.loads(line) for line in self._content(response).splitlines()]
+        self.assertCountEqual(
+            [row['id'] for row in rows],
+            [self.manager_task.id, self.unassigned_task.id],
+        )
+        unassigned = next(row for row in rows if row['id'] == self.unassigned_task.id)
+        self.assertIsNone(unassigned['assignee_username'])
+    
+    def test_export_requires_authentication(self):
+        """Test that anonymous users cannot export"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class TaskImportTests(TestCase):
+    """Tests for the streaming task import"""
+    
+    url = '/api/tasks/import/'
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.manager_user = User.objects.create_user(
+            username='manager',
+            password='testpass123',
+            role=User.Role.MANAGER,
+        )
+        self.member_user = User.objects.create_user(
+            username='member',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+        self.inactive_user = User.objects.create_user(
+            username='former',
+            password='testpass123',
+            is_active=False,
+        )
+        self.client.force_authenticate(user=self.manager_user)
+    
+    def _upload(self, name, content, **extra):
+        upload = SimpleUploadedFile(name, content.encode('utf-8'))
+        return self.client.post(self.url, {'file': upload, **extra}, format='multipart')
+    
+    def test_csv_import_creates_valid_rows_and_reports_errors(self):
+        """Test that valid rows are inserted and bad rows are reported by line"""
+        content = (
+            'title,description,status,deadline,assignee\n'
+            'By username,First,In Progress,2030-01-02T10:00:00Z,member\n'
+            f'By id,Second,done,2030-01-02,{self.member_user.id}\n'
+            'Unassigned,,,,\n'
+            ',Missing title,Todo,,\n'
+            'Bad status,,Blocked,,\n'
+            'Bad deadline,,Todo,tomorrow,\n'
+            'Unknown user,,Todo,,nobody\n'
+            'Inactive user,,Todo,,former\n'
+        )
+        response = self._upload('tasks.csv', content)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['rows'], 8)
+        self.assertEqual(response.data['created'], 3)
+        self.assertEqual(response.data['failed'], 5)
+        self.assertEqual([error['row'] for error in response.data['errors']], [5, 6, 7, 8, 9])
+        self.assertIn('assignee', response.data['errors'][3]['errors'])
+        
+        by_id = Task.objects.get(title='By id')
+        self.assertEqual(by_id.assignee, self.member_user)
+        self.assertEqual(by_id.status, Task.Status.DONE)
+        self.assertEqual(Task.objects.get(title='By username').status, Task.Status.IN_PROGRESS)
+        self.assertIsNone(Task.objects.get(title='Unassigned').assignee)
+    
+    def test_ndjson_import_and_dry_run(self):
+        """Test NDJSON parsing and that dry runs write nothing"""
+        content = (
+            json.dumps({'title': 'One', 'assignee_username': 'member'}) + '\n'
+            '\n'
+            'not json\n'
+            + json.dumps({'title': 'Two', 'assignee': self.member_user.id}) + '\n'
+        )
+        response = self._upload('tasks.ndjson', content, dry_run='true')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['errors'][0]['row'], 3)
+        self.assertFalse(Task.objects.exists())
+        
+        response = self._upload('tasks.jsonl', content)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Task.objects.filter(assignee=self.member_user).count(), 2)
+    
+    def test_import_queries_do_not_grow_with_rows(self):
+        """Test that a batch costs the same queries for 3 or 100 rows"""
+        def content(count):
+            return 'title,assignee\n' + ''.join(
+                f'Task {i},{"member" if i % 2 else self.manager_user.id}\n' for i in range(count)
+            )
+        
+        # The first write per (assignee, status) also creates its counter row
+        self._upload('small.csv', content(3))
+        with CaptureQueriesContext(connection) as small:
+            self._upload('small.csv', content(3))
+        with CaptureQueriesContext(connection) as large:
+            response = self._upload('large.csv', content(100))
+        self.assertEqual(response.data['created'], 100)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+    
+    def test_odd_assignee_ids_are_row_errors(self):
+        """Test that non-ASCII digits, out-of-range ids and leading zeros fail or resolve per row"""
+        content = (
+            'title,assignee\n'
+            f'Leading zero,0{self.member_user.id}\n'
+            'Superscript,\u00b2\n'
+            'Too large,99999999999999999999\n'
+        )
+        response = self._upload('tasks.csv', content)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(Task.objects.get(title='Leading zero').assignee, self.member_user)
+        self.assertEqual([error['row'] for error in response.data['errors']], [3, 4])
+        self.assertTrue(all('assignee' in error['errors'] for error in response.data['errors']))
+    
+    def test_import_requires_manager_or_admin(self):
+        """Test that members cannot import"""
+        self.client.force_authenticate(user=self.member_user)
+        response = self._upload('tasks.csv', 'title\nNope\n')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+    
+    def test_import_rejects_unknown_format(self):
+        """Test that unsupported file types are rejected"""
+        response = self._upload('tasks.xlsx', 'title\n')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('file_format', response.data)
+
+
+class TaskFastReadSerializerTests(TestCase):
+    """Tests that the fast read path matches TaskReadSerializer"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.manager_user = User.objects.create_user(
+            username='manager',
+            password='testpass123',
+            role=User.Role.MANAGER,
+            email='manager@example.com',
+        )
+        self.member_user = User.objects.create_user(
+            username='member',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+        Task.objects.create(
+            title='Assigned',
+            description='Quarterly billing review',
+            status=Task.Status.IN_PROGRESS,
+            assignee=self.manager_user,
+            deadline=timezone.now() + timedelta(days=2),
+        )
+        Task.objects.create(title='No email', assignee=self.member_user)
+        Task.objects.create(title='Unassigned billing', status=Task.Status.DONE)
+    
+    def test_rows_match_read_serializer(self):
+        """Test that keys, key order and values match for every task"""
+        tasks = Task.objects.select_related('assignee').order_by('id')
+        expected = TaskReadSerializer(tasks, many=True).data
+        actual = TaskFastReadSerializer(TaskFastReadSerializer.project(tasks), many=True).data
+        self.assertEqual(len(actual), 3)
+        for fast, slow in zip(actual, expected):
+            self.assertEqual(list(fast.keys()), list(slow.keys()))
+            self.assertEqual(fast, dict(slow))
+    
+    def test_list_and_retrieve_match_slow_path(self):
+        """Test that API responses are identical with the fast path on and off"""
+        self.client.force_authenticate(user=self.manager_user)
+        task = Task.objects.get(title='Assigned')
+        urls = [
+            '/api/tasks/',
+            '/api/tasks/?paginate=false&ordering=title',
+            '/api/tasks/?search=billing&highlight=true',
+            f'/api/tasks/{task.id}/',
+        ]
+        for url in urls:
+            with override_settings(TASK_FAST_READ_SERIALIZER=True):
+                fast = self.client.get(url)
+            with override_settings(TASK_FAST_READ_SERIALIZER=False):
+                slow = self.client.get(url)
+            self.assertEqual(fast.status_code, status.HTTP_200_OK, url)
+            self.assertEqual(fast.content, slow.content, url)
+    
+    def test_retrieve_respects_member_scope(self):
+        """Test that members still cannot retrieve other users' tasks"""
+        self.client.force_authenticate(user=self.member_user)
+        task = Task.objects.get(title='Assigned')
+        with override_settings(TASK_FAST_READ_SERIALIZER=True):
+            response = self.client.get(f'/api/tasks/{task.id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(TASK_RESPONSE_CACHE=True)
+class TaskResponseCacheTests(TestCase):
+    """Tests for the task list/detail response cache"""
+    
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.manager_user = User.objects.create_user(
+            username='manager',
+            password='testpass123',
+            role=User.Role.MANAGER,
+        )
+        self.member_user = User.objects.create_user(
+            username='member',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+        self.other_member = User.objects.create_user(
+            username='other',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+        self.task = Task.objects.create(title='Mine', assignee=self.member_user)
+        Task.objects.create(title='Theirs', assignee=self.other_member)
+    
+    def test_repeated_get_is_served_from_cache(self):
+        """Test that the second identical request is a hit that runs no query, not even the ETag's"""
+        self.client.force_authenticate(user=self.manager_user)
+        first = self.client.get('/api/tasks/?status=Todo&ordering=title')
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get('/api/tasks/?ordering=title&status=Todo&assignee=')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(len(queries.captured_queries), 0)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(response_cache.get_stats()['hits'], 1)
+        self.assertEqual(response_cache.get_stats()['misses'], 1)
+    
+    def test_hit_answers_if_none_match(self):
+        """Test that a hit returns 304 for the cached ETag without a query"""
+        self.client.force_authenticate(user=self.manager_user)
+        etag = self.client.get(f'/api/tasks/{self.task.id}/')['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/tasks/{self.task.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(len(queries.captured_queries), 0)
+    
+    def test_entries_expire_at_the_next_deadline(self):
+        """Test that an entry is dropped once an open task's deadline passes, as is_overdue flips"""
+        Task.objects.create(title='Due soon', deadline=timezone.now() + timedelta(seconds=30))
+        self.client.force_authenticate(user=self.manager_user)
+        self.client.get('/api/tasks/')
+        self.assertEqual(self.client.get('/api/tasks/')['X-Cache'], 'HIT')
+        with mock.patch('time.time', return_value=time.time() + 60):
+            response = self.client.get('/api/tasks/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+    
+    def test_members_do_not_share_entries(self):
+        """Test that each Member gets their own cached list"""
+        self.client.force_authenticate(user=self.member_user)
+        self.client.get('/api/tasks/')
+        self.client.force_authenticate(user=self.other_member)
+        response = self.client.get('/api/tasks/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual([task['title'] for task in response.data['results']], ['Theirs'])
+    
+    def test_task_write_invalidates(self):
+        """Test that saving a task invalidates cached lists and details"""
+        self.client.force_authenticate(user=self.member_user)
+        self.client.get('/api/tasks/')
+        self.client.get(f'/api/tasks/{self.task.id}/')
+        self.task.title = 'Renamed'
+        self.task.save()
+        response = self.client.get('/api/tasks/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['title'], 'Renamed')
+        response = self.client.get(f'/api/tasks/{self.task.id}/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['title'], 'Renamed')
+    
+    def test_bulk_write_invalidates(self):
+        """Test that bulk endpoint writes invalidate cached lists"""
+        self.client.force_authenticate(user=self.manager_user)
+        self.client.get('/api/tasks/')
+        self.client.post(
+            '/api/tasks/bulk/',
+            {'operations': [{'op': 'create', 'data': {'title': 'Bulk'}}]},
+            format='json'
+        )
+        response = self.client.get('/api/tasks/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.data['results']), 3)
+    
+    def test_user_change_invalidates(self):
+        """Test that renaming an assignee invalidates cached tasks"""
+        self.client.force_authenticate(user=self.manager_user)
+        self.client.get(f'/api/tasks/{self.task.id}/')
+        self.member_user.username = 'renamed'
+        self.member_user.save()
+        response = self.client.get(f'/api/tasks/{self.task.id}/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['assignee_username'], 'renamed')
+    
+    @override_settings(TASK_RESPONSE_CACHE=False)
+    def test_cache_can_be_disabled(self):
+        """Test that no cache header is sent when the cache is off"""
+        self.client.force_authenticate(user=self.manager_user)
+        self.client.get('/api/tasks/')
+        response = self.client.get('/api/tasks/')
+        self.assertNotIn('X-Cache', response)
+
+
+class TaskConditionalGetTests(TestCase):
+    """Tests for ETag / If-None-Match on task list and detail"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.manager_user = User.objects.create_user(
+            username='manager',
+            password='testpass123',
+            role=User.Role.MANAGER,
+        )
+        self.member_user = User.objects.create_user(
+            username='member',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+        self.task = Task.objects.create(title='Mine', assignee=self.member_user)
+        self.client.force_authenticate(user=self.manager_user)
+    
+    def test_unchanged_list_returns_304_with_one_query(self):
+        """Test that a matching If-None-Match costs one aggregate query"""
+        response = self.client.get('/api/tasks/?status=Todo')
+        etag = response['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/tasks/?status=Todo', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(len(queries.captured_queries), 1)
+    
+    def test_etag_differs_by_params_and_scope(self):
+        """Test that different filters and users get different ETags"""
+        manager_etag = self.client.get('/api/tasks/')['ETag']
+        self.assertNotEqual(manager_etag, self.client.get('/api/tasks/?ordering=title')['ETag'])
+        self.client.force_authenticate(user=self.member_user)
+        self.assertNotEqual(manager_etag, self.client.get('/api/tasks/')['ETag'])
+    
+    def test_writes_change_etag(self):
+        """Test that task edits, deletes and assignee changes change the ETag"""
+        etags = [self.client.get('/api/tasks/')['ETag']]
+        
+        self.task.title = 'Renamed'
+        self.task.save()
+        etags.append(self.client.get('/api/tasks/')['ETag'])
+        
+        self.member_user.email = 'member@example.com'
+        self.member_user.save()
+        etags.append(self.client.get('/api/tasks/')['ETag'])
+        
+        Task.objects.create(title='Other')
+        etags.append(self.client.get('/api/tasks/')['ETag'])
+        
+        self.member_user.delete()
+        etags.append(self.client.get('/api/tasks/')['ETag'])
+        self.assertEqual(len(set(etags)), len(etags))
+        
+        response = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=etags[0])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_detail_etag(self):
+        """Test conditional GET on a single task and 404 for missing ones"""
+        url = f'/api/tasks/{self.task.id}/'
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=f'"other", W/{etag}')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        response = self.client.get('/api/tasks/999999/', HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get('/api/tasks/abc/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_member_cannot_probe_other_tasks(self):
+        """Test that Members get 404, not 304, for tasks outside their scope"""
+        other = Task.objects.create(title='Hidden', assignee=self.manager_user)
+        self.client.force_authenticate(user=self.member_user)
+        response = self.client.get(f'/api/tasks/{other.id}/', HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TaskStatsTests(TestCase):
+    """Tests for the incrementally maintained dashboard statistics"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            password='testpass123',
+            role=User.Role.ADMIN,
+        )
+        self.member_user = User.objects.create_user(
+            username='member',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+        self.other_member = User.objects.create_user(
+            username='other',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+        self.client.force_authenticate(user=self.admin_user)
+    
+    def assertCountersMatchTasks(self):
+        expected = {
+            (row['assignee_id'], row['status']): row['total']
+            for row in Task.objects.order_by().values('assignee_id', 'status').annotate(total=Count('id'))
+        }
+        actual = {
+            (counter.assignee_id, counter.status): counter.count
+            for counter in TaskStatusCounter.objects.exclude(count=0)
+        }
+        self.assertEqual(actual, expected)
+    
+    def test_counters_follow_every_write_path(self):
+        """Test that counters match tasks_task after saves, bulk writes, imports and deletes"""
+        task = Task.objects.create(title='One', assignee=self.member_user)
+        Task.objects.create(title='Two', status=Task.Status.DONE)
+        self.assertCountersMatchTasks()
+        
+        task.status = Task.Status.IN_PROGRESS
+        task.save()
+        Task.objects.get(pk=task.pk).save(update_fields=['title'])
+        deferred = Task.objects.only('id').get(pk=task.pk)
+        deferred.assignee = self.other_member
+        deferred.save()
+        self.assertCountersMatchTasks()
+        
+        response = self.client.post('/api/tasks/bulk/', {'operations': [
+            {'op': 'create', 'data': {'title': 'Bulk', 'assignee': self.member_user.id}},
+            {'op': 'update', 'id': task.id, 'data': {'status': Task.Status.DONE}},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertCountersMatchTasks()
+        
+        upload = SimpleUploadedFile('tasks.csv', b'title,status,assignee\nA,Done,member\nB,Todo,\n')
+        self.client.post('/api/tasks/import/', {'file': upload}, format='multipart')
+        self.assertCountersMatchTasks()
+        
+        self.client.delete(f'/api/tasks/{task.id}/')
+        self.client.post('/api/tasks/bulk/', {'operations': [
+            {'op': 'delete', 'id': Task.objects.get(title='Bulk').id},
+        ]}, format='json')
+        self.assertCountersMatchTasks()
+        
+        self.member_user.delete()
+        self.assertCountersMatchTasks()
+    
+    def test_concurrent_saves_keep_counters(self):
+        """Test that a save moves the task from the counter it is in now, not the one it was loaded in"""
+        task = Task.objects.create(title='One', assignee=self.member_user)
+        first, second = Task.objects.get(pk=task.pk), Task.objects.get(pk=task.pk)
+        first.status = Task.Status.IN_PROGRESS
+        first.save()
+        second.status = Task.Status.DONE
+        second.save()
+        self.assertCountersMatchTasks()
+    
+    def test_bulk_update_after_concurrent_save_keeps_counters(self):
+        """Test that bulk updates move tasks from their current counters, read under a lock"""
+        task = Task.objects.create(title='One', assignee=self.member_user)
+        moved = Task.objects.create(title='Two', assignee=self.member_user)
+        has_permission = TaskViewSet._has_bulk_permission
+        
+        def save_elsewhere(view, action_name, instance=None):
+            # Another request writes the tasks after the bulk request loaded them
+            if instance is not None and instance.pk == task.pk:
+                elsewhere = Task.objects.get(pk=task.pk)
+                elsewhere.status = Task.Status.IN_PROGRESS
+                elsewhere.save()
+                Task.objects.get(pk=moved.pk).delete()
+            return has_permission(view, action_name, instance)
+        
+        with mock.patch.object(TaskViewSet, '_has_bulk_permission', save_elsewhere):
+            response = self.client.post('/api/tasks/bulk/', {'operations': [
+                {'op': 'update', 'id': task.id, 'data': {'assignee': self.other_member.id}},
+                {'op': 'update', 'id': moved.id, 'data': {'assignee': self.other_member.id}},
+            ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([result['status'] for result in response.data['results']], [200, 404])
+        self.assertEqual(response.data['results'][0]['data']['status'], Task.Status.IN_PROGRESS)
+        self.assertCountersMatchTasks()
+    
+    def test_failed_save_rolls_back_counters(self):
+        """Test that counters are updated in the task's transaction"""
+        task = Task.objects.create(title='One')
+        task.status = Task.Status.DONE
+        with mock.patch.object(TaskStatusCounter, 'apply_changes', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                task.save()
+        self.assertEqual(Task.objects.get(pk=task.pk).status, Task.Status.TODO)
+        self.assertCountersMatchTasks()
+    
+    def test_stats_endpoint(self):
+        """Test status, overdue and workload numbers and that the query count is constant"""
+        past = timezone.now() - timedelta(days=1)
+        Task.objects.create(title='Late', assignee=self.member_user, deadline=past)
+        Task.objects.create(title='Late but done', assignee=self.member_user, deadline=past, status=Task.Status.DONE)
+        Task.objects.create(title='Other', assignee=self.other_member, status=Task.Status.IN_PROGRESS)
+        Task.objects.create(title='Nobody')
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/tasks/stats/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total'], 4)
+        self.assertEqual(response.data['by_status'], {'Todo': 2, 'In Progress': 1, 'Done': 1})
+        self.assertEqual(response.data['overdue'], 1)
+        workload = {entry['assignee_username']: entry for entry in response.data['by_assignee']}
+        self.assertEqual(workload['member']['total'], 2)
+        self.assertEqual(workload['member']['by_status']['Done'], 1)
+        self.assertEqual(workload[None]['total'], 1)
+        
+        for i in range(20):
+            Task.objects.create(title=f'More {i}', assignee=self.other_member)
+        with CaptureQueriesContext(connection) as more_queries:
+            self.client.get('/api/tasks/stats/')
+        self.assertEqual(len(more_queries.captured_queries), len(queries.captured_queries))
+    
+    def test_member_stats_are_scoped(self):
+        """Test that Members only see their own numbers"""
+        Task.objects.create(title='Mine', assignee=self.member_user)
+        Task.objects.create(title='Theirs', assignee=self.other_member)
+        self.client.force_authenticate(user=self.member_user)
+        response = self.client.get('/api/tasks/stats/')
+        self.assertEqual(response.data['total'], 1)
+        self.assertEqual([entry['assignee_username'] for entry in response.data['by_assignee']], ['member'])
+    
+    def test_rebuild_command(self):
+        """Test that rebuild_task_counters repairs drifted counters"""
+        Task.objects.create(title='One', assignee=self.member_user)
+        Task.objects.update(status=Task.Status.DONE)
+        call_command('rebuild_task_counters', stdout=io.StringIO())
+        self.assertCountersMatchTasks()
+
+
+class TaskOverdueTests(TestCase):
+    """Tests for the database-side overdue filter and annotation"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            password='testpass123',
+            role=User.Role.ADMIN,
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        now = timezone.now()
+        self.late = Task.objects.create(title='Late', deadline=now - timedelta(days=1))
+        self.late_done = Task.objects.create(
+            title='Late but done',
+            deadline=now - timedelta(days=1),
+            status=Task.Status.DONE,
+        )
+        self.upcoming = Task.objects.create(title='Upcoming', deadline=now + timedelta(days=1))
+        self.undated = Task.objects.create(title='Undated')
+    
+    def test_overdue_filter(self):
+        """Test that ?overdue=true and ?overdue=false split tasks on the SQL condition"""
+        response = self.client.get('/api/tasks/', {'overdue': 'true'})
+        self.assertEqual([task['id'] for task in response.data['results']], [self.late.id])
+        
+        response = self.client.get('/api/tasks/', {'overdue': 'false'})
+        self.assertEqual(
+            {task['id'] for task in response.data['results']},
+            {self.late_done.id, self.upcoming.id, self.undated.id},
+        )
+    
+    def test_is_overdue_matches_model_property(self):
+        """Test that both read serializers report the annotation, matching Task.is_overdue"""
+        expected = {task.id: task.is_overdue for task in Task.objects.all()}
+        for fast in [True, False]:
+            with self.subTest(fast=fast), override_settings(TASK_FAST_READ_SERIALIZER=fast):
+                response = self.client.get('/api/tasks/')
+                self.assertEqual({task['id']: task['is_overdue'] for task in response.data['results']}, expected)
+                
+                response = self.client.get(f'/api/tasks/{self.late.id}/')
+                self.assertTrue(response.data['is_overdue'])
+    
+    def test_annotation_avoids_per_row_work(self):
+        """Test that the list query computes overdue in SQL"""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/tasks/', {'overdue': 'true'})
+        self.assertTrue(any('CASE WHEN' in query['sql'] for query in queries.captured_queries))
+    
+    def test_etag_changes_when_task_becomes_overdue(self):
+        """Test that a deadline passing changes the ETag although no row was written"""
+        etag = self.client.get('/api/tasks/')['ETag']
+        # QuerySet.update leaves updated_at alone, as if time had simply passed
+        Task.objects.filter(pk=self.upcoming.pk).update(deadline=self.upcoming.deadline - timedelta(days=2))
+        
+        response = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class TaskReminderSchedulerTests(TestCase):
+    """Tests for the heap-based deadline reminder scheduler"""
+    
+    def setUp(self):
+        self.now = timezone.now()
+        self.sent = []
+        reminders.task_reminders_due.connect(self.record, sender=Task)
+        self.addCleanup(reminders.task_reminders_due.disconnect, self.record, sender=Task)
+    
+    def record(self, sender, reminders, **kwargs):
+        self.sent.append([(reminder.task_id, reminder.kind) for reminder in reminders])
+    
+    def make_scheduler(self, **kwargs):
+        kwargs.setdefault('window', timedelta(hours=1))
+        kwargs.setdefault('lead', timedelta(minutes=30))
+        return reminders.ReminderScheduler(now=self.now, **kwargs)
+    
+    def test_reminders_fire_in_deadline_order(self):
+        """Test that due_soon and overdue reminders are sent when they fall due"""
+        first = Task.objects.create(title='First', deadline=self.now + timedelta(minutes=40))
+        second = Task.objects.create(title='Second', deadline=self.now + timedelta(minutes=50))
+        Task.objects.create(title='Done', deadline=self.now + timedelta(minutes=40), status=Task.Status.DONE)
+        scheduler = self.make_scheduler()
+        
+        self.assertEqual(scheduler.tick(self.now), 0)
+        self.assertEqual(set(scheduler.scheduled), {first.id, second.id})
+        scheduler.tick(self.now + timedelta(minutes=25))
+        self.assertEqual(self.sent, [[(first.id, reminders.DUE_SOON), (second.id, reminders.DUE_SOON)]])
+        scheduler.tick(self.now + timedelta(minutes=45))
+        self.assertEqual(self.sent[1], [(first.id, reminders.OVERDUE)])
+        self.assertEqual(set(scheduler.scheduled), {second.id})
+    
+    def test_window_is_loaded_by_deadline_range(self):
+        """Test that only deadlines inside the window are loaded, and later ones as it slides"""
+        near = Task.objects.create(title='Near', deadline=self.now + timedelta(minutes=80))
+        far = Task.objects.create(title='Far', deadline=self.now + timedelta(hours=5))
+        Task.objects.create(title='Past', deadline=self.now - timedelta(hours=1))
+        scheduler = self.make_scheduler()
+        
+        scheduler.tick(self.now)
+        self.assertEqual(set(scheduler.scheduled), {near.id})
+        scheduler.tick(self.now + timedelta(hours=4))
+        self.assertEqual(set(scheduler.scheduled), {far.id})
+        
+        with CaptureQueriesContext(connection) as queries:
+            scheduler.tick(self.now + timedelta(hours=4, minutes=1))
+        window_queries = [query['sql'] for query in queries.captured_queries if 'ORDER BY' in query['sql']]
+        self.assertTrue(all('"deadline" >=' in sql or '"updated_at" >=' in sql for sql in window_queries))
+    
+    def test_saves_and_deletes_reschedule(self):
+        """Test that a moved deadline is polled through updated_at and a deleted task sends nothing"""
+        moved = Task.objects.create(title='Moved', deadline=self.now + timedelta(minutes=40))
+        deleted = Task.objects.create(title='Deleted', deadline=self.now + timedelta(minutes=40))
+        scheduler = self.make_scheduler()
+        scheduler.tick(self.now)
+        
+        moved.deadline = self.now + timedelta(minutes=20)
+        moved.save()
+        deleted.delete()
+        scheduler.tick(self.now + timedelta(minutes=1))
+        self.assertEqual(self.sent, [[(moved.id, reminders.DUE_SOON)]])
+        
+        scheduler.tick(self.now + timedelta(minutes=45))
+        self.assertEqual(self.sent[1:], [[(moved.id, reminders.OVERDUE)]])
+    
+    def test_sent_reminders_are_logged(self):
+        """Test that every reminder sent is logged with its fields"""
+        task = Task.objects.create(title='Logged', deadline=self.now + timedelta(minutes=10))
+        scheduler = self.make_scheduler()
+        scheduler.tick(self.now)
+        with self.assertLogs('tasks.reminders', 'INFO') as logs:
+            scheduler.tick(self.now + timedelta(minutes=11))
+        record = logs.records[0]
+        self.assertEqual((record.task_id, record.kind, record.title), (task.id, reminders.OVERDUE, 'Logged'))
+        self.assertIn(f'Task {task.id} is overdue', record.getMessage())
+    
+    def test_other_process_writes_are_polled(self):
+        """Test that tasks written elsewhere are picked up through updated_at"""
+        scheduler = self.make_scheduler()
+        scheduler.tick(self.now)
+        
+        task = Task.objects.create(title='Elsewhere', deadline=self.now + timedelta(minutes=10))
+        scheduler.tick(self.now + timedelta(minutes=1))
+        self.assertEqual(self.sent, [[(task.id, reminders.DUE_SOON)]])
+        
+        Task.objects.filter(pk=task.pk).update(status=Task.Status.DONE, updated_at=timezone.now())
+        scheduler.tick(self.now + timedelta(minutes=11))
+        self.assertEqual(len(self.sent), 1)
+    
+    def test_command_runs_once(self):
+        """Test that run_task_reminders --once does not replay reminders due before it started"""
+        Task.objects.create(title='Soon', deadline=timezone.now() + timedelta(seconds=30))
+        out = io.StringIO()
+        call_command('run_task_reminders', '--once', stdout=out)
+        self.assertEqual(len(self.sent), 0)
+
+
+class AsyncTaskViewSetTests(TestCase):
+    """Tests for the coroutine list/retrieve handlers of AsyncTaskViewSet"""
+    
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.manager_user = User.objects.create_user(
+            username='manager',
+            password='testpass123',
+            role=User.Role.MANAGER,
+        )
+        self.member_user = User.objects.create_user(
+            username='member',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+        self.task = Task.objects.create(title='Mine', assignee=self.member_user)
+        Task.objects.create(title='Late', deadline=timezone.now() - timedelta(days=1))
+        Task.objects.create(title='Done', status=Task.Status.DONE)
+    
+    def call(self, viewset, actions, path='/api/tasks/', data=None, user=None, method='get', **kwargs):
+        request = getattr(self.factory, method)(path, data, **({'format': 'json'} if method != 'get' else {}))
+        force_authenticate(request, user=user or self.manager_user)
+        view = viewset.as_view(actions)
+        if iscoroutinefunction(view):
+            response = async_to_sync(view)(request, **kwargs)
+        else:
+            response = view(request, **kwargs)
+        return response.render()
+    
+    def test_read_handlers_are_coroutines(self):
+        """Test that list and retrieve are served as coroutine views"""
+        self.assertTrue(iscoroutinefunction(AsyncTaskViewSet.as_view({'get': 'list'})))
+        self.assertTrue(iscoroutinefunction(AsyncTaskViewSet.as_view({'get': 'retrieve'})))
+    
+    def test_responses_match_sync_viewset(self):
+        """Test that the async handlers return the same data and ETags as TaskViewSet"""
+        for params in [{}, {'status': 'Todo'}, {'overdue': 'true'}, {'paginate': 'false'}, {'page_size': 1}]:
+            with self.subTest(params=params):
+                sync = self.call(TaskViewSet, {'get': 'list'}, data=params)
+                async_ = self.call(AsyncTaskViewSet, {'get': 'list'}, data=params)
+                self.assertEqual(async_.status_code, status.HTTP_200_OK)
+                self.assertEqual(async_.data, sync.data)
+                self.assertEqual(async_['ETag'], sync['ETag'])
+        
+        for pk, expected in [(self.task.pk, status.HTTP_200_OK), (0, status.HTTP_404_NOT_FOUND), ('abc', status.HTTP_404_NOT_FOUND)]:
+            with self.subTest(pk=pk):
+                path = f'/api/tasks/{pk}/'
+                sync = self.call(TaskViewSet, {'get': 'retrieve'}, path=path, pk=pk)
+                async_ = self.call(AsyncTaskViewSet, {'get': 'retrieve'}, path=path, pk=pk)
+                self.assertEqual(async_.status_code, expected)
+                self.assertEqual(async_.data, sync.data)
+    
+    def test_slow_read_path_matches(self):
+        """Test that the DRF serializer path is served too"""
+        with override_settings(TASK_FAST_READ_SERIALIZER=False):
+            sync = self.call(TaskViewSet, {'get': 'list'})
+            async_ = self.call(AsyncTaskViewSet, {'get': 'list'})
+        self.assertEqual(async_.data, sync.data)
+    
+    def test_member_scope_and_not_modified(self):
+        """Test that members only see their tasks and a current ETag gets a 304"""
+        response = self.call(AsyncTaskViewSet, {'get': 'list'}, user=self.member_user)
+        self.assertEqual([task['id'] for task in response.data['results']], [self.task.id])
+        
+        request = self.factory.get('/api/tasks/', HTTP_IF_NONE_MATCH=response['ETag'])
+        force_authenticate(request, user=self.member_user)
+        response = async_to_sync(AsyncTaskViewSet.as_view({'get': 'list'}))(request)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+    
+    def test_unauthenticated_request_is_rejected(self):
+        """Test that authentication and permissions still apply"""
+        request = self.factory.get('/api/tasks/')
+        response = async_to_sync(AsyncTaskViewSet.as_view({'get': 'list'}))(request)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+    
+    def test_writes_use_sync_handlers(self):
+        """Test that create still runs through TaskViewSet on the same view"""
+        response = self.call(
+            AsyncTaskViewSet,
+            {'get': 'list', 'post': 'create'},
+            data={'title': 'New'},
+            method='post',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Task.objects.filter(title='New').exists())
+    
+    @override_settings(TASK_RESPONSE_CACHE=True)
+    def test_response_cache(self):
+        """Test that the async list reads and fills the response cache"""
+        cache.clear()
+        first = self.call(AsyncTaskViewSet, {'get': 'list'})
+        second = self.call(AsyncTaskViewSet, {'get': 'list'})
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+
+
+@override_settings(
+    TASK_EVENTS=True, TASK_EVENTS_SYNC=True, TASK_EVENTS_HEARTBEAT=0.05, TASK_EVENTS_POLL_INTERVAL=0.05,
+)
+class TaskEventStreamTests(TestCase):
+    """Tests for the task event log, hub and SSE endpoint"""
+    
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.factory = APIRequestFactory()
+        self.manager_user = User.objects.create_user(
+            username='manager',
+            password='testpass123',
+            role=User.Role.MANAGER,
+        )
+        self.member_user = User.objects.create_user(
+            username='member',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+        self.other_member = User.objects.create_user(
+            username='other',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+    
+    def start_hub(self):
+        """A hub polled by hand instead of by its thread"""
+        hub = events.TaskEventHub()
+        hub.last_seq = hub.floor = events.current_sequence()
+        patcher = mock.patch.object(events, 'hub', hub)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return hub
+    
+    def parse(self, chunk):
+        """(type, data) pairs of the events in an SSE chunk"""
+        parsed = []
+        for message in chunk.strip().split('\n\n'):
+            fields = dict(line.split(': ', 1) for line in message.splitlines() if not line.startswith(':'))
+            if 'event' in fields:
+                parsed.append((fields['event'], json.loads(fields['data'])))
+        return parsed
+    
+    def test_writes_publish_events_after_commit(self):
+        """Test that creating, updating and deleting tasks publishes events once committed"""
+        hub = self.start_hub()
+        start = hub.last_seq
+        with self.captureOnCommitCallbacks(execute=True):
+            task = Task.objects.create(title='New', assignee=self.member_user)
+            self.assertEqual(events.current_sequence(), start)
+        with self.captureOnCommitCallbacks(execute=True):
+            task.status = Task.Status.DONE
+            task.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.get(pk=task.pk).delete()
+        
+        self.assertTrue(hub.poll())
+        published = hub.events_after(start)
+        self.assertEqual([event['type'] for event in published], ['created', 'updated', 'deleted'])
+        self.assertEqual(published[0]['task']['title'], 'New')
+        self.assertEqual(published[1]['task']['status'], 'Done')
+        self.assertFalse(published[1]['task']['is_overdue'])
+        self.assertEqual(published[2]['task'], {'id': task.pk})
+        self.assertEqual(published[2]['assignee'], self.member_user.pk)
+        self.assertEqual([event['id'] for event in published], list(range(start + 1, start + 4)))
+    
+    def test_events_are_scoped_like_the_task_list(self):
+        """Test that Members only see their tasks, and a deleted event when one is reassigned away"""
+        hub = self.start_hub()
+        manager = events.Subscriber(self.manager_user, hub.last_seq)
+        member = events.Subscriber(self.member_user, hub.last_seq)
+        with self.captureOnCommitCallbacks(execute=True):
+            task = Task.objects.create(title='Mine', assignee=self.member_user)
+            Task.objects.create(title='Theirs', assignee=self.other_member)
+        with self.captureOnCommitCallbacks(execute=True):
+            task.assignee = self.other_member
+            task.save()
+        hub.poll()
+        
+        self.assertEqual(
+            [(kind, data.get('title')) for kind, data in self.parse(manager.take())],
+            [('created', 'Mine'), ('created', 'Theirs'), ('updated', 'Mine')],
+        )
+        received = self.parse(member.take())
+        self.assertEqual([kind for kind, _ in received], ['created', 'deleted'])
+        self.assertEqual(received[0][1]['title'], 'Mine')
+        self.assertEqual(received[1][1], {'id': task.pk})
+        # Nothing is sent twice
+        self.assertEqual(member.take(), '')
+    
+    def test_resume_from_the_log(self):
+        """Test that a stream resuming from an older id is sent missed events, or reset when they expired"""
+        start = events.current_sequence()
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(title='Missed', assignee=self.member_user)
+            Task.objects.create(title='Also missed', assignee=self.member_user)
+        # The hub only buffers events from when it started
+        hub = self.start_hub()
+        
+        resumed = events.Subscriber(self.manager_user, start)
+        self.assertEqual([data['title'] for _, data in self.parse(resumed.take())], ['Missed', 'Also missed'])
+        self.assertEqual(resumed.since, hub.last_seq)
+        
+        cache.delete(events.EVENT_KEY.format(start + 1))
+        expired = events.Subscriber(self.manager_user, start)
+        chunk = expired.take()
+        self.assertEqual(self.parse(chunk), [('reset', {})])
+        self.assertIn(f'id: {hub.last_seq}', chunk)
+    
+    def test_hub_waits_for_events_being_written(self):
+        """Test that a sequence number without its event holds the hub back until it is written"""
+        hub = self.start_hub()
+        start = hub.last_seq
+        cache.incr(events.SEQUENCE_KEY)
+        self.assertFalse(hub.poll())
+        self.assertEqual(hub.last_seq, start)
+        
+        cache.set(events.EVENT_KEY.format(start + 1), {
+            'id': start + 1, 'type': 'deleted', 'task': {'id': 1}, 'assignee': None, 'previous_assignee': None,
+        })
+        self.assertTrue(hub.poll())
+        self.assertEqual([event['id'] for event in hub.events_after(start)], [start + 1])
+    
+    def test_stream_endpoint(self):
+        """Test that the endpoint streams SSE with heartbeats and live events"""
+        self.client.force_authenticate(user=self.manager_user)
+        response = self.client.get('/api/tasks/events/', HTTP_ACCEPT='text/event-stream')
+        try:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response['Content-Type'], 'text/event-stream; charset=utf-8')
+            self.assertEqual(response['Cache-Control'], 'no-cache')
+            self.assertEqual(response['X-Accel-Buffering'], 'no')
+            
+            chunks = iter(response.streaming_content)
+            self.assertEqual(next(chunks), b'retry: 3000\n\n')
+            self.assertEqual(next(chunks), b': keepalive\n\n')
+            with self.captureOnCommitCallbacks(execute=True):
+                Task.objects.create(title='Live')
+            received = []
+            for chunk in chunks:
+                received += self.parse(chunk.decode())
+                if received:
+                    break
+            self.assertEqual(received[0][0], 'created')
+            self.assertEqual(received[0][1]['title'], 'Live')
+        finally:
+            response.close()
+    
+    def test_async_stream(self):
+        """Test that AsyncTaskViewSet streams events from a coroutine"""
+        request = self.factory.get('/api/tasks/events/', HTTP_ACCEPT='text/event-stream')
+        force_authenticate(request, user=self.member_user)
+        view = AsyncTaskViewSet.as_view({'get': 'events'}, **AsyncTaskViewSet.events.kwargs)
+        
+        async def read():
+            response = await view(request)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response.is_async)
+            chunks = aiter(response.streaming_content)
+            first = await anext(chunks)
+            await sync_to_async(events.append_events)([
+                {'type': 'created', 'task': {'id': 1}, 'assignee': self.other_member.pk, 'previous_assignee': None},
+                {'type': 'created', 'task': {'id': 2}, 'assignee': self.member_user.pk, 'previous_assignee': None},
+            ])
+            async for chunk in chunks:
+                received = self.parse(chunk.decode())
+                if received:
+                    break
+            await chunks.aclose()
+            return first, received
+        
+        first, received = async_to_sync(read)()
+        self.assertEqual(first, b'retry: 3000\n\n')
+        self.assertEqual(received, [('created', {'id': 2})])
+    
+    def test_disabled(self):
+        """Test that the endpoint is a 404 and nothing is published when the feed is disabled"""
+        self.client.force_authenticate(user=self.manager_user)
+        with override_settings(TASK_EVENTS=False):
+            start = events.current_sequence()
+            with self.captureOnCommitCallbacks(execute=True):
+                Task.objects.create(title='Quiet')
+            self.assertEqual(events.current_sequence(), start)
+            response = self.client.get('/api/tasks/events/', HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(response.content.startswith(b'event: error\n'))
+    
+    def test_sync_view_needs_opt_in(self):
+        """Test that sync workers refuse to hold a stream unless TASK_EVENTS_SYNC is set"""
+        self.client.force_authenticate(user=self.manager_user)
+        with override_settings(TASK_EVENTS_SYNC=False):
+            response = self.client.get('/api/tasks/events/', HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(response.streaming)
+    
+    def test_requires_authentication(self):
+        """Test that anonymous clients get a 403 rendered as an SSE error"""
+        response = self.client.get('/api/tasks/events/', HTTP_ACCEPT='text/event-stream')
+        self.assertIn(response.status_code, [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN])
+
+
+@override_settings(TASK_CHANGES_SETTLE=0)
+class TaskChangesTests(TestCase):
+    """Tests for the delta sync endpoint and its tombstones"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            password='testpass123',
+            role=User.Role.ADMIN,
+        )
+        self.member_user = User.objects.create_user(
+            username='member',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+        self.other_member = User.objects.create_user(
+            username='other',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+        self.kept = Task.objects.create(title='Kept', assignee=self.member_user)
+        self.moved = Task.objects.create(title='Moved', assignee=self.member_user)
+        self.deleted = Task.objects.create(title='Deleted', assignee=self.member_user)
+        self.deleted_pk = self.deleted.pk
+    
+    def sync(self, user, since=None):
+        self.client.force_authenticate(user=user)
+        response = self.client.get('/api/tasks/changes/', {'since': since} if since else {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+    
+    def make_changes(self):
+        Task.objects.create(title='Created', assignee=self.member_user)
+        self.kept.status = Task.Status.IN_PROGRESS
+        self.kept.save()
+        self.moved.assignee = self.other_member
+        self.moved.save()
+        self.deleted.delete()
+    
+    def test_first_sync_resets(self):
+        """Test that syncing without a token asks for a reload and returns a token"""
+        data = self.sync(self.member_user)
+        self.assertTrue(data['reset'])
+        self.assertEqual(data['upserts'], [])
+        self.assertTrue(data['token'].isdigit())
+    
+    def test_member_changes(self):
+        """Test that a Member gets their upserts, deletions and tasks reassigned away"""
+        token = self.sync(self.member_user)['token']
+        self.make_changes()
+        
+        data = self.sync(self.member_user, token)
+        self.assertFalse(data['reset'])
+        self.assertEqual([task['title'] for task in data['upserts']], ['Created', 'Kept'])
+        self.assertEqual(data['upserts'][1]['status'], 'In Progress')
+        self.assertEqual(data['removals'], sorted([self.moved.pk, self.deleted_pk]))
+        self.assertGreater(int(data['token']), int(token))
+        
+        # Nothing new since
+        data = self.sync(self.member_user, data['token'])
+        self.assertEqual((data['upserts'], data['removals']), ([], []))
+    
+    def test_admin_changes(self):
+        """Test that reassignments are upserts for Admins, and only deletions are removals"""
+        token = self.sync(self.admin_user)['token']
+        self.make_changes()
+        
+        data = self.sync(self.admin_user, token)
+        self.assertEqual([task['title'] for task in data['upserts']], ['Created', 'Kept', 'Moved'])
+        self.assertEqual(data['removals'], [self.deleted_pk])
+    
+    def test_reassigned_back_is_an_upsert(self):
+        """Test that a task reassigned away and back is not also removed"""
+        token = self.sync(self.member_user)['token']
+        self.moved.assignee = self.other_member
+        self.moved.save()
+        self.moved.assignee = self.member_user
+        self.moved.save()
+        
+        data = self.sync(self.member_user, token)
+        self.assertEqual([task['id'] for task in data['upserts']], [self.moved.pk])
+        self.assertEqual(data['removals'], [])
+    
+    def test_bulk_updates_record_reassignments(self):
+        """Test that the bulk endpoint's reassignments leave tombstones"""
+        token = self.sync(self.member_user)['token']
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.post('/api/tasks/bulk/', {'operations': [
+            {'op': 'update', 'id': self.moved.pk, 'data': {'assignee': self.other_member.pk}},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        self.assertEqual(self.sync(self.member_user, token)['removals'], [self.moved.pk])
+    
+    def test_pages(self):
+        """Test that large deltas are returned in pages that together cover every change"""
+        token = self.sync(self.admin_user)['token']
+        created = [Task.objects.create(title=f'Task {i}') for i in range(5)]
+        
+        seen = []
+        with mock.patch.object(TaskViewSet, 'changes_page_size', 2):
+            while True:
+                data = self.sync(self.admin_user, token)
+                seen += [task['id'] for task in data['upserts']]
+                token = data['token']
+                if not data['has_more']:
+                    break
+        self.assertEqual(seen, [task.pk for task in created])
+    
+    def test_role_change_resets(self):
+        """Test that becoming or ceasing to be a Member forces a reload"""
+        token = self.sync(self.member_user)['token']
+        self.member_user.role = User.Role.MANAGER
+        self.member_user.save()
+        self.assertTrue(self.sync(self.member_user, token)['reset'])
+        
+        # Manager and Admin see the same tasks
+        token = self.sync(self.admin_user)['token']
+        self.admin_user.role = User.Role.MANAGER
+        self.admin_user.save()
+        self.assertFalse(self.sync(self.admin_user, token)['reset'])
+    
+    def test_old_and_invalid_tokens(self):
+        """Test that tokens past the tombstone retention reset and malformed ones are rejected"""
+        old = task_sync.encode_token(timezone.now() - timedelta(days=31))
+        self.assertTrue(self.sync(self.member_user, old)['reset'])
+        
+        self.client.force_authenticate(user=self.member_user)
+        for token in ['abc', '-5', '9' * 30]:
+            with self.subTest(token=token):
+                response = self.client.get('/api/tasks/changes/', {'since': token})
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    @override_settings(TASK_CHANGES_SETTLE=60)
+    def test_recent_writes_wait_for_the_next_sync(self):
+        """Test that writes inside the settle window are not returned yet and the token does not move back"""
+        token = task_sync.encode_token(timezone.now() - timedelta(minutes=5))
+        Task.objects.create(title='Too recent')
+        data = self.sync(self.admin_user, token)
+        self.assertNotIn('Too recent', [task['title'] for task in data['upserts']])
+        self.assertLess(int(data['token']), int(task_sync.encode_token(timezone.now() - timedelta(seconds=59))))
+        
+        recent = task_sync.encode_token(timezone.now())
+        self.assertEqual(self.sync(self.admin_user, recent)['token'], recent)
+    
+    def test_prune_command(self):
+        """Test that prune_task_tombstones deletes tombstones past the retention"""
+        self.deleted.delete()
+        TaskTombstone.objects.update(created_at=timezone.now() - timedelta(days=31))
+        kept_pk = self.kept.pk
+        self.kept.delete()
+        call_command('prune_task_tombstones', stdout=io.StringIO())
+        self.assertEqual(list(TaskTombstone.objects.values_list('task_id', flat=True)), [kept_pk])
+
+
+class TaskArchiveTests(TestCase):
+    """Tests for archiving old Done tasks and reading them back"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            password='testpass123',
+            role=User.Role.ADMIN,
+        )
+        self.member_user = User.objects.create_user(
+            username='member',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+        self.old_done = [
+            Task.objects.create(title=f'Old done {i}', status=Task.Status.DONE, assignee=self.member_user)
+            for i in range(3)
+        ]
+        self.old_open = Task.objects.create(title='Old open', assignee=self.member_user)
+        self.recent_done = Task.objects.create(title='Recent done', status=Task.Status.DONE)
+        Task.objects.filter(pk__in=[task.pk for task in [*self.old_done, self.old_open]]).update(
+            updated_at=timezone.now() - timedelta(days=120),
+        )
+    
+    def archive(self, *args):
+        call_command('archive_tasks', '--pause', '0', *args, stdout=io.StringIO())
+    
+    def titles(self, response):
+        return sorted(task['title'] for task in response.data['results'])
+    
+    def test_archives_old_done_tasks(self):
+        """Test that only Done tasks older than the cutoff move, with their ids and fields"""
+        self.archive()
+        
+        self.assertEqual(
+            sorted(Task.objects.values_list('title', flat=True)),
+            ['Old open', 'Recent done'],
+        )
+        archived = ArchivedTask.objects.get(pk=self.old_done[0].pk)
+        self.assertEqual(archived.title, 'Old done 0')
+        self.assertEqual(archived.assignee_id, self.member_user.pk)
+        self.assertEqual(archived.created_at, self.old_done[0].created_at)
+        self.assertIsNotNone(archived.archived_at)
+    
+    def test_batches(self):
+        """Test that each batch is bounded and --max-batches stops early"""
+        self.archive('--batch-size', '2', '--max-batches', '1')
+        self.assertEqual(ArchivedTask.objects.count(), 2)
+        self.archive('--batch-size', '2')
+        self.assertEqual(ArchivedTask.objects.count(), 3)
+    
+    def test_bookkeeping(self):
+        """Test that archiving updates the status counters and leaves tombstones"""
+        self.archive()
+        counts = dict(TaskStatusCounter.objects.filter(assignee=self.member_user).values_list('status', 'count'))
+        self.assertEqual(counts.get(Task.Status.DONE, 0), 0)
+        self.assertEqual(counts[Task.Status.TODO], 1)
+        self.assertEqual(
+            sorted(TaskTombstone.objects.filter(reason=TaskTombstone.Reason.ARCHIVED).values_list('task_id', flat=True)),
+            [task.pk for task in self.old_done],
+        )
+    
+    def test_list_excludes_archived_unless_asked(self):
+        """Test that lists read the archive only with ?include_archived=true, scoped and filtered as usual"""
+        self.archive()
+        self.client.force_authenticate(user=self.admin_user)
+        self.assertEqual(self.titles(self.client.get('/api/tasks/')), ['Old open', 'Recent done'])
+        self.assertEqual(
+            self.titles(self.client.get('/api/tasks/', {'include_archived': 'true', 'status': 'Done'})),
+            ['Old done 0', 'Old done 1', 'Old done 2', 'Recent done'],
+        )
+        
+        self.client.force_authenticate(user=self.member_user)
+        self.assertEqual(
+            self.titles(self.client.get('/api/tasks/', {'include_archived': 'true'})),
+            ['Old done 0', 'Old done 1', 'Old done 2', 'Old open'],
+        )
+    
+    def test_retrieve_reads_the_archive(self):
+        """Test that an archived task can be retrieved but not changed"""
+        self.archive()
+        task = self.old_done[0]
+        self.client.force_authenticate(user=self.admin_user)
+        for fast in [True, False]:
+            with self.subTest(fast=fast), override_settings(TASK_FAST_READ_SERIALIZER=fast):
+                response = self.client.get(f'/api/tasks/{task.pk}/')
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.data['title'], 'Old done 0')
+                self.assertFalse(response.data['is_overdue'])
+        
+        response = self.client.patch(f'/api/tasks/{task.pk}/', {'title': 'Changed'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_export_includes_archived(self):
+        """Test that the export reads the archive with ?include_archived=true"""
+        self.archive()
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get('/api/tasks/export/', {'format': 'ndjson', 'include_archived': 'true'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), 5)
+
+
+class TaskBenchmarkTests(TestCase):
+    """Tests for the benchmark dataset and request mix"""
+    
+    def seed(self, *args):
+        call_command(
+            'seed_benchmark_data', '--scratch-database', '--users', '20', '--tasks', '300', '--batch-size', '100',
+            *args,
+            stdout=io.StringIO(),
+        )
+    
+    def test_seed_tops_up_to_the_requested_size(self):
+        """Test that seeding is skewed, keeps counters current and reruns only top up"""
+        self.seed()
+        self.seed('--tasks', '400')
+        
+        self.assertEqual(User.objects.filter(username__startswith='bench_user_').count(), 20)
+        self.assertEqual(Task.objects.count(), 400)
+        self.assertTrue(User.objects.filter(username='bench_manager', role=User.Role.MANAGER).exists())
+        self.assertGreater(Task.objects.filter(status=Task.Status.DONE).count(), 150)
+        self.assertGreater(Task.objects.filter(deadline__isnull=False).count(), 200)
+        rows = Task.objects.order_by().values('assignee_id', 'status').annotate(total=Count('id'))
+        self.assertEqual(
+            {(row['assignee_id'], row['status']): row['total'] for row in rows},
+            {(counter.assignee_id, counter.status): counter.count for counter in TaskStatusCounter.objects.all()},
+        )
+    
+    def test_seed_refuses_real_databases(self):
+        """Test that seeding needs the confirmation flag and creates no accounts on a real database"""
+        with self.assertRaisesMessage(CommandError, '--scratch-database'):
+            call_command('seed_benchmark_data', '--users', '5', '--tasks', '10', stdout=io.StringIO())
+        User.objects.create_user(username='alice', password='testpass123')
+        with self.assertRaisesMessage(CommandError, 'alice'):
+            self.seed()
+        self.assertEqual(User.objects.count(), 1)
+        self.assertFalse(Task.objects.exists())
+    
+    def test_serving_benchmark_refuses_real_databases(self):
+        """Test that benchmark_serving checks for a scratch database before seeding or creating its admin"""
+        with self.assertRaisesMessage(CommandError, '--scratch-database'):
+            call_command('benchmark_serving', '--tasks', '10', stdout=io.StringIO())
+        User.objects.create_user(username='alice', password='testpass123')
+        with self.assertRaisesMessage(CommandError, 'alice'):
+            call_command('benchmark_serving', '--scratch-database', '--tasks', '10', stdout=io.StringIO())
+        self.assertEqual(User.objects.count(), 1)
+        self.assertFalse(Task.objects.exists())
+    
+    def test_serializer_benchmark_refuses_real_databases(self):
+        """Test that benchmark_task_serializers only seeds a scratch database"""
+        with self.assertRaisesMessage(CommandError, '--scratch-database'):
+            call_command('benchmark_task_serializers', '--tasks', '10', stdout=io.StringIO())
+        out = io.StringIO()
+        call_command(
+            'benchmark_task_serializers', '--scratch-database', '--tasks', '50', '--users', '5', '--rows', '20',
+            '--repeat', '1', stdout=out,
+        )
+        self.assertIn('TaskFastReadSerializer: 20 rows', out.getvalue())
+        
+        User.objects.create_user(username='alice', password='testpass123')
+        with self.assertRaisesMessage(CommandError, 'alice'):
+            call_command('benchmark_task_serializers', '--scratch-database', '--tasks', '100', stdout=io.StringIO())
+        self.assertEqual(Task.objects.count(), 50)
+    
+    def test_seed_tasks_keeps_stats_current(self):
+        """Test that every seeding path, not just seed_benchmark_data, leaves the counters right"""
+        manager = User.objects.create_user(username='manager', password='testpass123', role=User.Role.MANAGER)
+        seed_tasks(250, [manager.pk], batch_size=100)
+        self.client.force_login(manager)
+        response = self.client.get('/api/tasks/stats/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['total'], 250)
+    
+    def test_index_benchmark_leaves_the_schema_alone(self):
+        """Test that the index benchmark measures a copy of the table and keeps the real indexes"""
+        indexes = {index.name for index in Task._meta.indexes}
+        out = io.StringIO()
+        call_command(
+            'benchmark_task_indexes', '--scratch-database', '--tasks', '200', '--users', '5', '--repeat', '1',
+            stdout=out,
+        )
+        
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Task._meta.db_table)
+            tables = connection.introspection.table_names(cursor)
+        self.assertLessEqual(indexes, set(constraints))
+        self.assertNotIn('tasks_task_index_baseline', tables)
+        self.assertIn('tasks_task_index_baseline', out.getvalue())
+    
+    def test_index_benchmark_refuses_real_databases(self):
+        """Test that the index benchmark needs the confirmation flag and a database it seeded"""
+        with self.assertRaisesMessage(CommandError, '--scratch-database'):
+            call_command('benchmark_task_indexes', '--tasks', '10', stdout=io.StringIO())
+        User.objects.create_user(username='alice', password='testpass123')
+        with self.assertRaisesMessage(CommandError, 'alice'):
+            call_command('benchmark_task_indexes', '--scratch-database', '--tasks', '10', stdout=io.StringIO())
+        self.assertFalse(Task.objects.exists())
+    
+    def test_scenario_requests_succeed(self):
+        """Test that every scenario's requests are valid calls to the API"""
+        self.seed()
+        command = BenchmarkApiCommand()
+        bounds = {'low': Task.objects.order_by('id').first().pk, 'high': Task.objects.order_by('id').last().pk}
+        members = command.sample_members(5, random.Random(1))
+        task_ids = command.sample_task_ids(bounds, 1000, random.Random(1))
+        manager = User.objects.get(username='bench_manager')
+        
+        for scenario in SCENARIOS:
+            requests = command.build_requests(
+                scenario, manager, members, task_ids, 'benchmark-password', random.Random(1),
+            )
+            for method, path, headers, body in requests[:8]:
+                with self.subTest(scenario=scenario, path=path):
+                    response = self.client.generic(
+                        method, path, body or '',
+                        content_type=headers.get('Content-Type', 'application/octet-stream'),
+                        headers={'Authorization': headers.get('Authorization', '')},
+                    )
+                    self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+
+@override_settings(TASK_RESPONSE_CACHE=False, AUTH_USER_CACHE=False, TASK_EVENTS=False)
+class TaskQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Query budgets for every task endpoint and role; counts must not grow with the data"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(username='admin', password='testpass123', role=User.Role.ADMIN)
+        self.manager_user = User.objects.create_user(username='manager', password='testpass123', role=User.Role.MANAGER)
+        self.member_user = User.objects.create_user(username='member', password='testpass123', role=User.Role.MEMBER)
+        self.users = {'admin': self.admin_user, 'manager': self.manager_user, 'member': self.member_user}
+        self.seeded = 0
+    
+    def seed(self, count):
+        """Add ``count`` tasks, half for the member, the rest for as many new assignees"""
+        assignees = User.objects.bulk_create([
+            User(username=f'assignee{self.seeded + i}', email=f'assignee{self.seeded + i}@example.com', password='!')
+            for i in range(count)
+        ])
+        past = timezone.now() - timedelta(hours=1)
+        with manual_timestamps(Task):
+            Task.objects.bulk_create([
+                Task(
+                    title=f'Seeded task {self.seeded + i}',
+                    status=[Task.Status.TODO, Task.Status.IN_PROGRESS, Task.Status.DONE][i % 3],
+                    deadline=past if i % 2 else None,
+                    assignee=self.member_user if i % 2 else assignees[i],
+                    created_at=past,
+                    updated_at=past,
+                )
+                for i in range(count)
+            ])
+        TaskStatusCounter.rebuild()
+        self.seeded += count
+    
+    def as_user(self, role):
+        self.client.force_authenticate(user=self.users[role])
+    
+    def member_task(self):
+        return Task.objects.filter(assignee=self.member_user).first()
+    
+    def open_member_task(self):
+        """A task the update below moves to Done, so every request changes the same counters"""
+        return Task.objects.filter(assignee=self.member_user).exclude(status=Task.Status.DONE).first()
+    
+    def test_list(self):
+        """Test the task list for every role"""
+        for role, budget in [('admin', 2), ('manager', 2), ('member', 2)]:
+            with self.subTest(role=role):
+                self.as_user(role)
+                self.assertQueryBudget(budget, lambda: self.client.get('/api/tasks/'), self.seed)
+    
+    def test_list_filters(self):
+        """Test the task list with filters, search, ordering and archived tasks"""
+        self.as_user('manager')
+        for params, budget in [
+            ({'status': Task.Status.TODO}, 2),
+            ({'overdue': 'true'}, 2),
+            # The filter first loads the assignee to validate it
+            ({'assignee': self.member_user.pk}, 3),
+            ({'search': 'Seeded'}, 2),
+            ({'ordering': 'deadline'}, 2),
+            ({'include_archived': 'true'}, 2),
+        ]:
+            with self.subTest(params=params):
+                self.assertQueryBudget(budget, lambda: self.client.get('/api/tasks/', params), self.seed)
+    
+    @override_settings(TASK_FAST_READ_SERIALIZER=False)
+    def test_list_and_retrieve_with_model_serializer(self):
+        """Test TaskReadSerializer, whose dotted sources need the assignee join"""
+        for role in ['admin', 'member']:
+            with self.subTest(role=role):
+                self.as_user(role)
+                self.assertQueryBudget(2, lambda: self.client.get('/api/tasks/'), self.seed)
+                self.assertQueryBudget(
+                    2, lambda task: self.client.get(f'/api/tasks/{task.pk}/'), self.seed, setup=self.member_task,
+                )
+    
+    def test_retrieve(self):
+        """Test retrieving a task for every role, archived tasks included"""
+        for role, budget in [('admin', 2), ('manager', 2), ('member', 2)]:
+            with self.subTest(role=role):
+                self.as_user(role)
+                self.assertQueryBudget(
+                    budget, lambda task: self.client.get(f'/api/tasks/{task.pk}/'), self.seed, setup=self.member_task,
+                )
+    
+    def test_create(self):
+        """Test creating a task as a manager and an admin"""
+        for role, budget in [('manager', 5), ('admin', 5)]:
+            with self.subTest(role=role):
+                self.as_user(role)
+                self.assertQueryBudget(
+                    budget,
+                    lambda: self.client.post(
+                        '/api/tasks/', {'title': 'New', 'assignee': self.member_user.pk}, format='json',
+                    ),
+                    self.seed,
+                )
+    
+    def test_update(self):
+        """Test partial and full updates by the assignee, a manager and an admin"""
+        for role, method, budget in [('member', 'patch', 8), ('manager', 'patch', 8), ('admin', 'put', 8)]:
+            with self.subTest(role=role, method=method):
+                self.as_user(role)
+                self.assertQueryBudget(
+                    budget,
+                    lambda task: getattr(self.client, method)(
+                        f'/api/tasks/{task.pk}/',
+                        {'title': 'Renamed', 'status': Task.Status.DONE, 'assignee': self.member_user.pk},
+                        format='json',
+                    ),
+                    self.seed,
+                    setup=self.open_member_task,
+                )
+    
+    def test_destroy(self):
+        """Test deleting a task as an admin"""
+        self.as_user('admin')
+        self.assertQueryBudget(
+            4, lambda task: self.client.delete(f'/api/tasks/{task.pk}/'), self.seed, setup=self.member_task,
+        )
+    
+    def test_stats(self):
+        """Test the dashboard statistics, which grow with assignees"""
+        for role, budget in [('manager', 2), ('member', 2)]:
+            with self.subTest(role=role):
+                self.as_user(role)
+                self.assertQueryBudget(budget, lambda: self.client.get('/api/tasks/stats/'), self.seed)
+    
+    def test_export(self):
+        """Test streaming exports in both formats"""
+        for role, export_format, budget in [('admin', 'csv', 1), ('member', 'ndjson', 1)]:
+            with self.subTest(role=role, format=export_format):
+                self.as_user(role)
+                self.assertQueryBudget(
+                    budget, lambda: self.client.get('/api/tasks/export/', {'format': export_format}), self.seed,
+                )
+    
+    def test_changes(self):
+        """Test delta sync pages for a manager and a member"""
+        since = task_sync.encode_token(timezone.now() - timedelta(days=1))
+        for role, budget in [('manager', 3), ('member', 3)]:
+            with self.subTest(role=role):
+                self.as_user(role)
+                self.assertQueryBudget(budget, lambda: self.client.get('/api/tasks/changes/', {'since': since}), self.seed)
+    
+    def test_import(self):
+        """Test importing one row per existing assignee"""
+        self.as_user('manager')
+    
+        def upload():
+            rows = [f'Imported {username},{username}' for username in User.objects.values_list('username', flat=True)]
+            return SimpleUploadedFile('tasks.csv', '\n'.join(['title,assignee_username', *rows]).encode('utf-8'))
+    
+        self.assertQueryBudget(
+            6, lambda file: self.client.post('/api/tasks/import/', {'file': file}, format='multipart'),
+            self.seed, setup=upload,
+        )
+    
+    def test_bulk(self):
+        """Test a bulk request that updates every member task, creates one and deletes one"""
+        self.as_user('admin')
+    
+        def operations():
+            tasks = list(Task.objects.filter(assignee=self.member_user).values_list('pk', 'status'))
+            # Flipping statuses moves tasks between at least two counters every time
+            return [
+                *(
+                    {'op': 'update', 'id': task_id, 'data': {
+                        'status': Task.Status.TODO if task_status == Task.Status.DONE else Task.Status.DONE,
+                    }}
+                    for task_id, task_status in tasks[1:]
+                ),
+                {'op': 'create', 'data': {'title': 'Bulk created', 'assignee': self.member_user.pk}},
+                {'op': 'delete', 'id': tasks[0][0]},
+            ]
+    
+        self.assertQueryBudget(
+            14, lambda ops: self.client.post('/api/tasks/bulk/', {'operations': ops}, format='json'),
+            self.seed, setup=operations,
+        )
+    
+    def test_async_list_and_retrieve(self):
+        """Test the async read views"""
+        factory = APIRequestFactory()
+        list_view = AsyncTaskViewSet.as_view({'get': 'list'})
+        retrieve_view = AsyncTaskViewSet.as_view({'get': 'retrieve'})
+    
+        def get(view, path, **kwargs):
+            request = factory.get(path)
+            force_authenticate(request, user=self.member_user)
+            response = async_to_sync(view)(request, **kwargs)
+            response.render()
+            return response
+    
+        self.assertQueryBudget(2, lambda: get(list_view, '/api/tasks/'), self.seed)
+        self.assertQueryBudget(
+            2, lambda task: get(retrieve_view, f'/api/tasks/{task.pk}/', pk=task.pk),
+            self.seed, setup=self.member_task,
+        )
+    
+    @override_settings(TASK_FAST_READ_SERIALIZER=False)
+    def test_reports_queries_per_row(self):
+        """Test that dropping the assignee join fails the budget with the offending SQL"""
+        self.as_user('admin')
+        with mock.patch.object(TaskViewSet, 'get_queryset', lambda view: Task.objects.with_overdue()):
+            with self.assertRaises(AssertionError) as raised:
+                self.assertQueryBudget(2, lambda: self.client.get('/api/tasks/'), self.seed)
+        message = str(raised.exception)
+        self.assertIn('grows with the data', message)
+        self.assertIn('Repeated statements:', message)
+        self.assertIn('FROM "users_user"', message)
@@ -1,11 +1,12 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import TaskViewSet
+from .views import AsyncTaskViewSet, TaskViewSet
 
 app_name = 'tasks'
 
 router = DefaultRouter()
-router.register(r'', TaskViewSet, basename='task')
+router.register(r'', AsyncTaskViewSet if settings.ASYNC_VIEWS else TaskViewSet, basename='task')
 
 urlpatterns = [
     path('', include(router.urls)),
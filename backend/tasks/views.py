@@ -1,17 +1,44 @@
-from rest_framework import viewsets, status, filters
+from collections import defaultdict
+from asgiref.sync import sync_to_async
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.parsers import MultiPartParser
+from rest_framework.generics import get_object_or_404
+from rest_framework.exceptions import NotFound
+from rest_framework.renderers import JSONRenderer
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from .models import Task
-from .serializers import TaskSerializer, TaskReadSerializer
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q
+from django.db.models.functions import Now
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from .models import Task, TaskStatusCounter, TaskWithArchive
+from .serializers import (
+    TaskSerializer,
+    TaskReadSerializer,
+    TaskFastReadSerializer,
+    TaskBulkOperationSerializer,
+)
+from .signals import tasks_bulk_saved
+from . import cache as response_cache
+from . import events as task_events
+from . import sync as task_sync
+from .renderers import CSVRenderer, EventStreamRenderer, NDJSONRenderer
+from .export import STREAMERS, export_rows
+from .importer import READERS, TaskImporter
+from .pagination import TaskCursorPagination
+from .filters import TaskFilter, TaskFilterBackend, TaskSearchFilter, TaskOrderingFilter
+from core.async_views import AsyncViewMixin
+from core.etags import ConditionalGetMixin
 from users.permissions import IsAdmin, IsManagerOrAdmin, IsAssigneeOrManagerOrAdmin
 
 User = get_user_model()
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for Task CRUD operations.
     
@@ -21,12 +48,15 @@ class TaskViewSet(viewsets.ModelViewSet):
     - Delete: Admin only
     """
     queryset = Task.objects.all()
+    pagination_class = TaskCursorPagination
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['status', 'assignee']
+    filter_backends = [TaskFilterBackend, TaskSearchFilter, TaskOrderingFilter]
+    filterset_class = TaskFilter
     search_fields = ['title', 'description']
     ordering_fields = ['created_at', 'updated_at', 'deadline', 'title']
     ordering = ['-created_at']
+    bulk_max_operations = 500
+    changes_page_size = 500
     
     def get_serializer_class(self):
         """Use read serializer for GET, write serializer for POST/PUT"""
@@ -36,19 +66,24 @@ class TaskViewSet(viewsets.ModelViewSet):
     
     def get_permissions(self):
         """Set permissions based on action"""
-        if self.action == 'create':
+        return self.get_action_permissions(self.action)
+    
+    def get_action_permissions(self, action):
+        """Permissions for a single-task action; also applied to each bulk item"""
+        if action == 'create':
             permission_classes = [IsAuthenticated, IsManagerOrAdmin]
-        elif self.action in ['update', 'partial_update']:
+        elif action in ['update', 'partial_update']:
             permission_classes = [IsAuthenticated, IsAssigneeOrManagerOrAdmin]
-        elif self.action == 'destroy':
+        elif action == 'destroy':
             permission_classes = [IsAuthenticated, IsAdmin]
         else:
-            permission_classes = [IsAuthenticated]
+            permission_classes = self.permission_classes
         return [permission() for permission in permission_classes]
     
     def get_queryset(self):
         """Filter queryset based on user role"""
-        queryset = Task.objects.select_related('assignee').all()
+        model = TaskWithArchive if self.reads_archive() else Task
+        queryset = model.objects.select_related('assignee').with_overdue()
         
         # Members can only see their assigned tasks
         user = self.request.user
@@ -58,17 +93,114 @@ class TaskViewSet(viewsets.ModelViewSet):
         # Managers and Admins can see all tasks
         return queryset
     
+    def reads_archive(self):
+        """
+        Whether to read archived tasks too (see tasks/archive.py): retrieves
+        always do, lists and exports with ``?include_archived=true``.
+        """
+        if self.action == 'retrieve':
+            return True
+        if self.action in ['list', 'export']:
+            return self.request.query_params.get('include_archived', '').lower() in ('true', '1', 'yes')
+        return False
+    
+    def use_fast_read_path(self):
+        """Whether list/retrieve project rows with TaskFastReadSerializer"""
+        return getattr(settings, 'TASK_FAST_READ_SERIALIZER', True)
+    
+    def cached_conditional_response(self, queryset, build, pk=None):
+        """
+        conditional_response() in front of the response cache.
+        
+        A hit is answered from the cached data and ETag without a query; only
+        a miss runs the ETag aggregate and, unless the client's copy is
+        current, ``build()``. ``X-Cache`` tells whether the response was a HIT
+        or a MISS. Only successful responses are cached; errors are raised
+        before this point.
+        """
+        if not response_cache.is_enabled():
+            return self.conditional_response(queryset, build)
+        
+        key, entry = self.read_response_cache(pk)
+        if entry is not None:
+            return self.cached_response(entry)
+        return self.conditional_response(queryset, lambda: self.write_response_cache(key, build()))
+    
+    def read_response_cache(self, pk=None):
+        key = response_cache.response_key(self.request, self.action, pk)
+        return key, response_cache.get_response_entry(key)
+    
+    def cached_response(self, entry):
+        etag = entry['etag']
+        if self.etag_matches(etag):
+            response = self.not_modified_response(etag)
+        else:
+            response = self.add_etag(Response(entry['data']), etag)
+        response['X-Cache'] = 'HIT'
+        return response
+    
+    def write_response_cache(self, key, response):
+        if response.status_code == status.HTTP_200_OK:
+            response_cache.set_response_entry(
+                key, response.data, self.current_etag, self.etag_values.get('next_deadline'),
+            )
+        response['X-Cache'] = 'MISS'
+        return response
+    
+    def get_etag_aggregates(self):
+        """Also track assignee changes, which show up in every task row"""
+        aggregates = super().get_etag_aggregates()
+        # Deleting an assignee nulls the FK without touching task updated_at
+        aggregates['assigned'] = Count('assignee')
+        aggregates['assignee_updated_at'] = Max('assignee__updated_at')
+        # is_overdue flips as deadlines pass, with no write to the task
+        aggregates['overdue'] = Count('pk', filter=Task.objects.overdue_condition())
+        # When the next flip is due, so cached responses expire by then
+        aggregates['next_deadline'] = Min(
+            'deadline', filter=Q(deadline__gte=Now()) & ~Q(status=Task.Status.DONE),
+        )
+        return aggregates
+    
+    def get_etag_scope(self):
+        return response_cache.user_scope(self.request.user)
+    
     def list(self, request, *args, **kwargs):
         """List tasks with filtering and pagination"""
         queryset = self.filter_queryset(self.get_queryset())
+        return self.cached_conditional_response(queryset, lambda: self.build_list_response(queryset))
+    
+    def build_list_response(self, queryset):
+        fast = self.use_fast_read_path()
+        if fast:
+            queryset = TaskFastReadSerializer.project(queryset)
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
+            serializer = TaskFastReadSerializer(page, many=True) if fast else self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
         
-        serializer = self.get_serializer(queryset, many=True)
+        serializer = TaskFastReadSerializer(queryset, many=True) if fast else self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a single task"""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        pk = self.kwargs[lookup_url_kwarg]
+        return self.cached_conditional_response(
+            self.filter_lookup(self.filter_queryset(self.get_queryset())),
+            lambda: self.build_retrieve_response(request, *args, **kwargs),
+            pk=pk,
+        )
+    
+    def build_retrieve_response(self, request, *args, **kwargs):
+        if not self.use_fast_read_path():
+            return super().retrieve(request, *args, **kwargs)
+        
+        queryset = TaskFastReadSerializer.project(self.filter_queryset(self.get_queryset()))
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(request, row)
+        return Response(TaskFastReadSerializer(row).data)
+    
     def create(self, request, *args, **kwargs):
         """Create a new task (Manager or Admin only)"""
         serializer = self.get_serializer(data=request.data)
@@ -90,3 +222,403 @@ class TaskViewSet(viewsets.ModelViewSet):
         instance = self.get_object()
         instance.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+    
+    @action(detail=False, methods=['get'], url_path='stats')
+    def stats(self, request):
+        """
+        Dashboard statistics: task counts by status, overdue count and
+        per-assignee workload, scoped like the task list.
+        
+        Counts come from TaskStatusCounter, so this reads one row per
+        (assignee, status) instead of aggregating every task. The overdue
+        count uses the partial index on open tasks' deadlines.
+        """
+        counters = TaskStatusCounter.objects.filter(count__gt=0).order_by()
+        overdue = Task.objects.overdue()
+        if request.user.role == 'Member':
+            counters = counters.filter(assignee=request.user)
+            overdue = overdue.filter(assignee=request.user)
+        
+        def empty_statuses():
+            return {value: 0 for value in Task.Status.values}
+        
+        by_status = empty_statuses()
+        workload = {}
+        for assignee_id, username, task_status, count in counters.values_list(
+            'assignee_id', 'assignee__username', 'status', 'count'
+        ):
+            by_status[task_status] += count
+            entry = workload.setdefault(assignee_id, {
+                'assignee': assignee_id,
+                'assignee_username': username,
+                'total': 0,
+                'by_status': empty_statuses(),
+            })
+            entry['total'] += count
+            entry['by_status'][task_status] += count
+        
+        return Response({
+            'total': sum(by_status.values()),
+            'by_status': by_status,
+            'overdue': overdue.count(),
+            'by_assignee': sorted(workload.values(), key=lambda entry: (-entry['total'], entry['assignee_username'] or '')),
+        })
+    
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='export',
+        renderer_classes=[CSVRenderer, NDJSONRenderer],
+    )
+    def export(self, request):
+        """
+        Stream every task visible to the user as CSV (``?format=csv``, default)
+        or NDJSON (``?format=ndjson``).
+        
+        Honours the same role scoping, filters, search and ordering as the
+        list endpoint, but reads rows through a chunked cursor and writes them
+        out as they arrive instead of building the response in memory.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            STREAMERS[renderer.format](export_rows(queryset)),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}',
+        )
+        filename = f"tasks-{timezone.now():%Y%m%d-%H%M%S}.{renderer.format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+    
+    @action(detail=False, methods=['get'], url_path='changes')
+    def changes(self, request):
+        """
+        Delta sync: tasks created or updated and ids of tasks removed from
+        the user's view since ``?since=<token>`` (see tasks/sync.py).
+        
+        Returns ``{token, reset, has_more, upserts, removals}``. Apply
+        removals, then upserts, and pass ``token`` as ``since`` next time;
+        request again straight away while ``has_more`` is true. ``reset``
+        means the task list must be reloaded first.
+        """
+        since = request.query_params.get('since')
+        if since:
+            try:
+                since = task_sync.decode_token(since)
+            except (ValueError, OverflowError):
+                return Response({'since': ['Invalid sync token.']}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(task_sync.sync_changes(self.get_queryset(), request.user, since or None, self.changes_page_size))
+    
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='events',
+        renderer_classes=[EventStreamRenderer, JSONRenderer],
+    )
+    def events(self, request):
+        """
+        Server-Sent Events stream of task ``created``, ``updated`` and
+        ``deleted`` events, scoped like the task list (see tasks/events.py).
+        
+        Served by AsyncTaskViewSet; this sync view is a 404 unless
+        TASK_EVENTS_SYNC is set, as each stream would hold a worker.
+        
+        Each event's data is the task as the fast read serializer renders it,
+        or just ``{"id": ...}`` for deletes. Reconnecting with
+        ``Last-Event-ID`` (or ``?last_event_id=``) replays missed events; a
+        ``reset`` event means they are gone and the client should refetch.
+        """
+        if task_events.is_enabled() and not task_events.allows_sync_streams():
+            raise NotFound('The task event stream is only served by the async views (ASYNC_VIEWS).')
+        return self.event_stream_response(task_events.stream_events(request.user, self.get_last_event_id()))
+    
+    def get_last_event_id(self):
+        value = self.request.headers.get('Last-Event-ID') or self.request.query_params.get('last_event_id')
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    
+    def event_stream_response(self, stream):
+        if not task_events.is_enabled():
+            raise NotFound('The task event stream is not enabled.')
+        response = StreamingHttpResponse(stream, content_type='text/event-stream; charset=utf-8')
+        response['Cache-Control'] = 'no-cache'
+        # Nginx would otherwise buffer the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
+    
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='import',
+        parser_classes=[MultiPartParser],
+        permission_classes=[IsAuthenticated, IsManagerOrAdmin],
+    )
+    def import_tasks(self, request):
+        """
+        Import tasks from an uploaded CSV or NDJSON ``file`` (Manager or Admin only).
+        
+        Columns/keys: ``title``, ``description``, ``status``, ``deadline`` and
+        ``assignee`` (user id or username) or ``assignee_username``, so files
+        produced by the export endpoint can be imported as-is. The format is
+        taken from ``file_format`` or the file extension. Pass
+        ``dry_run=true`` to validate without writing.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'file': ['No file was submitted.']}, status=status.HTTP_400_BAD_REQUEST)
+        
+        file_format = request.data.get('file_format') or upload.name.rsplit('.', 1)[-1].lower()
+        if file_format == 'jsonl':
+            file_format = 'ndjson'
+        if file_format not in READERS:
+            return Response(
+                {'file_format': [f"Unsupported format. Use one of: {', '.join(READERS)}"]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('true', '1', 'yes')
+        report = TaskImporter(dry_run=dry_run).run(READERS[file_format](upload.file))
+        response_status = status.HTTP_200_OK if dry_run or not report['created'] else status.HTTP_201_CREATED
+        return Response(report, status=response_status)
+    
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Apply a batch of create/update/delete operations in one request.
+        
+        Body: ``{"operations": [{"op": "create", "data": {...}},
+        {"op": "update", "id": 1, "data": {...}}, {"op": "delete", "id": 2}]}``
+        
+        Each item is checked with the same role permissions as the single-task
+        endpoints and gets its own status in the response. Assignees and
+        target tasks are each loaded with one query, and all valid items are
+        written together in one transaction.
+        """
+        operations = request.data.get('operations') if isinstance(request.data, dict) else request.data
+        if not isinstance(operations, list) or not operations:
+            return Response(
+                {'detail': 'Expected a non-empty list of operations.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(operations) > self.bulk_max_operations:
+            return Response(
+                {'detail': f'At most {self.bulk_max_operations} operations are allowed per request.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        results = [None] * len(operations)
+        parsed = []
+        for index, raw in enumerate(operations):
+            envelope = TaskBulkOperationSerializer(data=raw)
+            if envelope.is_valid():
+                parsed.append((index, envelope.validated_data))
+            else:
+                results[index] = self._bulk_result(index, raw, status.HTTP_400_BAD_REQUEST, errors=envelope.errors)
+        
+        # One query for the target tasks (scoped by role) and one for assignees
+        task_ids = {op['id'] for _, op in parsed if op['op'] != 'create'}
+        tasks = self.get_queryset().in_bulk(task_ids) if task_ids else {}
+        assignee_ids = set()
+        for _, op in parsed:
+            try:
+                assignee_ids.add(int(op.get('data', {}).get('assignee')))
+            except (TypeError, ValueError):
+                pass
+        context = self.get_serializer_context()
+        context['assignees'] = User.objects.in_bulk(assignee_ids) if assignee_ids else {}
+        
+        to_create, to_update, to_delete = [], [], []
+        # The fields each updated task was given, so no item writes fields it did not change
+        update_fields = {}
+        seen_ids = set()
+        for index, op in parsed:
+            action_name = {'create': 'create', 'update': 'partial_update', 'delete': 'destroy'}[op['op']]
+            task = None
+            if op['op'] != 'create':
+                task = tasks.get(op['id'])
+                if task is None:
+                    results[index] = self._bulk_result(index, op, status.HTTP_404_NOT_FOUND, errors={'detail': 'Not found.'})
+                    continue
+                if task.pk in seen_ids:
+                    results[index] = self._bulk_result(
+                        index, op, status.HTTP_400_BAD_REQUEST,
+                        errors={'id': 'Task appears more than once in this request.'}
+                    )
+                    continue
+                seen_ids.add(task.pk)
+            
+            if not self._has_bulk_permission(action_name, task):
+                results[index] = self._bulk_result(
+                    index, op, status.HTTP_403_FORBIDDEN,
+                    errors={'detail': 'You do not have permission to perform this action.'}
+                )
+                continue
+            
+            if op['op'] == 'delete':
+                to_delete.append((index, op, task))
+                continue
+            
+            serializer = TaskSerializer(task, data=op['data'], partial=task is not None, context=context)
+            if not serializer.is_valid():
+                results[index] = self._bulk_result(index, op, status.HTTP_400_BAD_REQUEST, errors=serializer.errors)
+                continue
+            if task is None:
+                to_create.append((index, op, Task(**serializer.validated_data)))
+            else:
+                for attr, value in serializer.validated_data.items():
+                    setattr(task, attr, value)
+                update_fields[task.pk] = frozenset(serializer.validated_data)
+                to_update.append((index, op, task))
+        
+        with transaction.atomic():
+            if to_create:
+                created = Task.objects.bulk_create([task for _, _, task in to_create])
+                tasks_bulk_saved.send(sender=Task, instances=created, created=True)
+            if to_update:
+                to_update = self._lock_bulk_updates(to_update, update_fields, results)
+            if to_update:
+                # bulk_update skips auto_now, so stamp updated_at explicitly
+                now = timezone.now()
+                for _, _, task in to_update:
+                    task.updated_at = now
+                updated = [task for _, _, task in to_update]
+                # One bulk_update per distinct field set
+                by_fields = defaultdict(list)
+                for task in updated:
+                    by_fields[update_fields[task.pk]].append(task)
+                for fields, group in by_fields.items():
+                    Task.objects.bulk_update(group, sorted(fields | {'updated_at'}))
+                tasks_bulk_saved.send(sender=Task, instances=updated, created=False)
+            if to_delete:
+                Task.objects.filter(pk__in=[task.pk for _, _, task in to_delete]).delete()
+        
+        for index, op, task in to_create:
+            results[index] = self._bulk_result(index, op, status.HTTP_201_CREATED, data=TaskSerializer(task).data)
+        for index, op, task in to_update:
+            results[index] = self._bulk_result(index, op, status.HTTP_200_OK, data=TaskSerializer(task).data)
+        for index, op, task in to_delete:
+            results[index] = self._bulk_result(index, op, status.HTTP_204_NO_CONTENT)
+        
+        return Response({
+            'created': len(to_create),
+            'updated': len(to_update),
+            'deleted': len(to_delete),
+            'failed': len(operations) - len(to_create) - len(to_update) - len(to_delete),
+            'results': results,
+        })
+    
+    def _lock_bulk_updates(self, to_update, update_fields, results):
+        """
+        Lock the rows about to be updated and re-read their (assignee, status),
+        which may have changed since the tasks were loaded: the counters are
+        moved from those values, and a task keeps them unless its item
+        changes them. Tasks deleted in the meantime are reported as not found
+        and dropped.
+        """
+        current = {
+            pk: (assignee_id, task_status)
+            for pk, assignee_id, task_status in Task.objects.select_for_update().filter(
+                pk__in=[task.pk for _, _, task in to_update],
+            ).values_list('pk', 'assignee_id', 'status')
+        }
+        locked = []
+        for index, op, task in to_update:
+            if task.pk not in current:
+                results[index] = self._bulk_result(index, op, status.HTTP_404_NOT_FOUND, errors={'detail': 'Not found.'})
+                continue
+            assignee_id, task_status = task._original_counter_key = current[task.pk]
+            if 'assignee' not in update_fields[task.pk]:
+                task.assignee_id = assignee_id
+            if 'status' not in update_fields[task.pk]:
+                task.status = task_status
+            locked.append((index, op, task))
+        return locked
+    
+    def _has_bulk_permission(self, action_name, task=None):
+        for permission in self.get_action_permissions(action_name):
+            if not permission.has_permission(self.request, self):
+                return False
+            if task is not None and not permission.has_object_permission(self.request, self, task):
+                return False
+        return True
+    
+    @staticmethod
+    def _bulk_result(index, op, status_code, data=None, errors=None):
+        result = {
+            'index': index,
+            'op': op.get('op') if isinstance(op, dict) else None,
+            'status': status_code,
+        }
+        if isinstance(op, dict) and op.get('id') is not None:
+            result['id'] = op['id']
+        if data is not None:
+            result['data'] = data
+        if errors is not None:
+            result['errors'] = errors
+        return result
+
+
+class AsyncTaskViewSet(AsyncViewMixin, TaskViewSet):
+    """
+    TaskViewSet with list and retrieve served as coroutines (see core/async_views.py).
+    
+    The ETag aggregate and the page of rows are fetched with the async ORM;
+    the response cache is read and written in a worker thread. Every other
+    action runs the synchronous TaskViewSet code.
+    """
+    
+    async def acached_conditional_response(self, queryset, build, pk=None):
+        if not response_cache.is_enabled():
+            return await self.aconditional_response(queryset, build)
+        
+        key, entry = await sync_to_async(self.read_response_cache)(pk)
+        if entry is not None:
+            return self.cached_response(entry)
+        
+        async def build_and_cache():
+            return await sync_to_async(self.write_response_cache)(key, await build())
+        return await self.aconditional_response(queryset, build_and_cache)
+    
+    async def list(self, request, *args, **kwargs):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        return await self.acached_conditional_response(queryset, lambda: self.abuild_list_response(queryset))
+    
+    async def abuild_list_response(self, queryset):
+        if not self.use_fast_read_path():
+            return await sync_to_async(self.build_list_response)(queryset)
+        
+        queryset = TaskFastReadSerializer.project(queryset)
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(TaskFastReadSerializer(page, many=True).data)
+        return Response(TaskFastReadSerializer([row async for row in queryset], many=True).data)
+    
+    async def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        pk = self.kwargs[lookup_url_kwarg]
+        queryset = self.filter_lookup(await self.afilter_queryset(self.get_queryset()))
+        return await self.acached_conditional_response(
+            queryset,
+            lambda: self.abuild_retrieve_response(queryset, request, *args, **kwargs),
+            pk=pk,
+        )
+    
+    async def abuild_retrieve_response(self, queryset, request, *args, **kwargs):
+        if not self.use_fast_read_path():
+            return await sync_to_async(self.build_retrieve_response)(request, *args, **kwargs)
+        
+        if queryset is not None:
+            queryset = TaskFastReadSerializer.project(queryset)
+        row = await self.aget_object(queryset)
+        return Response(TaskFastReadSerializer(row).data)
+    
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='events',
+        renderer_classes=[EventStreamRenderer, JSONRenderer],
+    )
+    async def events(self, request):
+        """The event stream, waiting for events on the event loop instead of in a thread."""
+        return self.event_stream_response(task_events.astream_events(request.user, self.get_last_event_id()))
@@ -0,0 +1,113 @@
+"""
+Authentication backend that resolves the session user from a cache.
+
+Every authenticated request resolves ``request.user`` through
+``backend.get_user(user_id)``. This backend serves it from two tiers: a small
+per-process dict with a very short TTL, then the shared cache, and only falls
+back to a ``users_user`` query on a miss. Entries hold the user's columns
+except the password hash, plus the session auth hash (the password
+fingerprint Django checks against the session), so steady-state requests
+need no user query at all.
+
+Entries are dropped from both tiers on every User save or delete (see
+users/signals.py). Other processes' local tiers can lag for at most
+``AUTH_USER_CACHE_LOCAL_TTL`` seconds, so the cache is only enabled by
+default when a shared cache is configured.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+CACHE_KEY = 'auth-user:{}'
+LOCAL_CACHE_MAX_ENTRIES = 1024
+
+# Process-local tier: {user_id: (expires_at, entry)}
+_local_cache = {}
+
+
+def is_enabled():
+    return getattr(settings, 'AUTH_USER_CACHE', False)
+
+
+def cached_field_names():
+    """Concrete User columns kept in the cache; the password hash never is."""
+    return [
+        field.attname for field in get_user_model()._meta.concrete_fields
+        if field.attname != 'password'
+    ]
+
+
+def make_entry(user):
+    entry = {name: getattr(user, name) for name in cached_field_names()}
+    entry['session_auth_hash'] = user.get_session_auth_hash()
+    return entry
+
+
+def user_from_entry(entry):
+    """Rebuild a User from a cache entry, with the password left deferred."""
+    names = cached_field_names()
+    user = get_user_model().from_db(DEFAULT_DB_ALIAS, names, [entry[name] for name in names])
+    user.cached_session_auth_hash = entry['session_auth_hash']
+    return user
+
+
+def get_entry(user_id):
+    now = time.monotonic()
+    local = _local_cache.get(user_id)
+    if local is not None and local[0] > now:
+        return local[1]
+    entry = cache.get(CACHE_KEY.format(user_id))
+    if entry is not None:
+        set_local_entry(user_id, entry, now)
+    return entry
+
+
+def set_entry(user_id, entry):
+    cache.set(CACHE_KEY.format(user_id), entry, getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 60))
+    set_local_entry(user_id, entry, time.monotonic())
+
+
+def set_local_entry(user_id, entry, now):
+    if len(_local_cache) >= LOCAL_CACHE_MAX_ENTRIES:
+        _local_cache.clear()
+    _local_cache[user_id] = (now + getattr(settings, 'AUTH_USER_CACHE_LOCAL_TTL', 1), entry)
+
+
+def _delete_entry(user_id):
+    _local_cache.pop(user_id, None)
+    cache.delete(CACHE_KEY.format(user_id))
+
+
+def invalidate_user(user_id):
+    """
+    Drop a user's entry now and again on commit, so a request that cached
+    the old row before the write committed cannot keep serving it.
+    """
+    _delete_entry(user_id)
+    transaction.on_commit(lambda: _delete_entry(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend whose get_user is served from the user cache."""
+
+    def get_user(self, user_id):
+        if not is_enabled():
+            return super().get_user(user_id)
+
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return None
+        entry = get_entry(user_id)
+        if entry is not None:
+            user = user_from_entry(entry)
+        else:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            set_entry(user_id, make_entry(user))
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,89 @@
+"""
+Assignee choices behind ``GET /api/users/choices/``.
+
+The full list of active users is cached, with its ETag, under the ``users``
+namespace version. The version is bumped whenever a user is written in a
+way that changes the list (see users/signals.py), so a warm request, and a
+304 for a client that already has the list, runs no queries at all.
+
+``?q=<prefix>`` is the typeahead mode: at most USER_CHOICES_TYPEAHEAD_LIMIT
+users whose username starts with the prefix, case-insensitively. It is read
+in order from the lowercase username index created by migration
+``0003_username_prefix_index``, as a range so that the same query works on
+every backend:
+
+- PostgreSQL: ``lower(username) COLLATE "C"``, where ranges and ordering
+  follow code points whatever the database collation;
+- SQLite: ``lower(username)``, which already compares that way.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models.functions import Collate, Lower
+
+from core.cache import bump_version, versioned_key
+
+NAMESPACE = 'users'
+
+# Fields shown by UserChoiceSerializer, plus is_active which selects the rows
+CHOICE_FIELDS = {'username', 'role', 'is_active'}
+
+# Sorts after every character, so [prefix, prefix + PREFIX_END) holds every
+# string starting with prefix
+PREFIX_END = '\U0010ffff'
+
+
+def is_enabled():
+    return getattr(settings, 'USER_CHOICES_CACHE', False)
+
+
+def get_timeout():
+    return getattr(settings, 'USER_CHOICES_CACHE_TIMEOUT', 600)
+
+
+def get_typeahead_limit():
+    return getattr(settings, 'USER_CHOICES_TYPEAHEAD_LIMIT', 20)
+
+
+def read_cached_choices():
+    """
+    Return ``(key, entry)``: the cached ``{'etag': ..., 'data': [...]}`` or
+    None, and the key to store a fresh entry under. The key is taken before
+    the rows are read, so a write in between leaves that entry unreachable.
+    """
+    if not is_enabled():
+        return None, None
+    key = versioned_key(NAMESPACE, 'choices')
+    return key, cache.get(key)
+
+
+def write_cached_choices(key, entry):
+    if key is not None:
+        cache.set(key, entry, get_timeout())
+
+
+def invalidate_choices(update_fields=None):
+    """Drop the cached list unless only fields it does not show were saved (e.g. last_login)"""
+    if update_fields is None or CHOICE_FIELDS & set(update_fields):
+        bump_version(NAMESPACE)
+
+
+def username_key(queryset):
+    """The indexed lowercase username expression for the queryset's database"""
+    if connections[queryset.db].vendor == 'postgresql':
+        return Collate(Lower('username'), 'C')
+    return Lower('username')
+
+
+def filter_username_prefix(queryset, prefix):
+    """Users of ``queryset`` whose username starts with ``prefix``, as a range over the index"""
+    if 'username_key' not in queryset.query.annotations:
+        queryset = queryset.alias(username_key=username_key(queryset))
+    prefix = prefix.lower()
+    return queryset.filter(username_key__gte=prefix, username_key__lt=prefix + PREFIX_END)
+
+
+def typeahead(queryset, prefix, limit=None):
+    """Up to ``limit`` users of ``queryset`` whose username starts with ``prefix``"""
+    queryset = filter_username_prefix(queryset, prefix.strip())
+    return queryset.order_by('username_key')[:limit or get_typeahead_limit()]
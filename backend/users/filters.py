@@ -0,0 +1,31 @@
+from rest_framework import filters
+
+from .search import get_search_engine
+
+
+class UserSearchFilter(filters.SearchFilter):
+    """
+    ``?search=`` over username and email, answered from the indexes of
+    users/search.py. Falls back to the stock icontains ``SearchFilter`` when
+    no engine is available.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+
+        engine = get_search_engine(queryset)
+        if engine is None:
+            return super().filter_queryset(request, queryset, view)
+        return engine.search(queryset, search_terms)
+
+
+class UserOrderingFilter(filters.OrderingFilter):
+    """OrderingFilter that defaults to relevance order, then username, for ranked searches."""
+
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        if not params and 'search_rank' in queryset.query.annotations:
+            return ['-search_rank', 'username']
+        return super().get_ordering(request, queryset, view)
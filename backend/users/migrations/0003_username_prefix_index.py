@@ -0,0 +1,40 @@
+from django.db import migrations
+
+INDEX_NAME = 'users_user_username_lower_idx'
+
+FORWARDS = {
+    'postgresql': f'CREATE INDEX {INDEX_NAME} ON users_user ((lower(username) COLLATE "C"))',
+    'sqlite': f'CREATE INDEX {INDEX_NAME} ON users_user (lower(username))',
+}
+
+
+def forwards(apps, schema_editor):
+    statement = FORWARDS.get(schema_editor.connection.vendor)
+    if statement:
+        schema_editor.execute(statement)
+
+
+def backwards(apps, schema_editor):
+    if schema_editor.connection.vendor in FORWARDS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+    """
+    Lowercase username index for the ``?q=`` typeahead of users/choices
+    (see users/choices.py). The expression differs by backend, so the index
+    is not declared on the model; on other backends the typeahead still
+    works, without it.
+
+    Note that SQLite table rebuilds (Django's _remake_table) drop indexes the
+    model does not declare, so a later migration that rebuilds users_user
+    must recreate this one.
+    """
+
+    dependencies = [
+        ('users', '0002_user_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,105 @@
+from django.db import migrations
+
+
+POSTGRES_FORWARDS = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX users_user_username_trgm_idx ON users_user USING GIN (username gin_trgm_ops)',
+    'CREATE INDEX users_user_email_trgm_idx ON users_user USING GIN (email gin_trgm_ops)',
+]
+
+POSTGRES_BACKWARDS = [
+    'DROP INDEX IF EXISTS users_user_email_trgm_idx',
+    'DROP INDEX IF EXISTS users_user_username_trgm_idx',
+]
+
+SQLITE_FORWARDS = [
+    """
+    CREATE VIRTUAL TABLE users_user_fts USING fts5(
+        username, email,
+        content='users_user', content_rowid='id',
+        tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER users_user_fts_insert AFTER INSERT ON users_user BEGIN
+        INSERT INTO users_user_fts(rowid, username, email)
+        VALUES (new.id, new.username, new.email);
+    END
+    """,
+    """
+    CREATE TRIGGER users_user_fts_delete AFTER DELETE ON users_user BEGIN
+        INSERT INTO users_user_fts(users_user_fts, rowid, username, email)
+        VALUES ('delete', old.id, old.username, old.email);
+    END
+    """,
+    """
+    CREATE TRIGGER users_user_fts_update AFTER UPDATE OF username, email ON users_user BEGIN
+        INSERT INTO users_user_fts(users_user_fts, rowid, username, email)
+        VALUES ('delete', old.id, old.username, old.email);
+        INSERT INTO users_user_fts(rowid, username, email)
+        VALUES (new.id, new.username, new.email);
+    END
+    """,
+    "INSERT INTO users_user_fts(users_user_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARDS = [
+    'DROP TRIGGER IF EXISTS users_user_fts_update',
+    'DROP TRIGGER IF EXISTS users_user_fts_delete',
+    'DROP TRIGGER IF EXISTS users_user_fts_insert',
+    'DROP TABLE IF EXISTS users_user_fts',
+]
+
+# The FTS5 trigram tokenizer
+SQLITE_MIN_VERSION = (3, 34, 0)
+
+
+def sqlite_has_trigram_fts5(schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('PRAGMA compile_options')
+        if not any(row[0] == 'ENABLE_FTS5' for row in cursor.fetchall()):
+            return False
+        cursor.execute('SELECT sqlite_version()')
+        return tuple(int(part) for part in cursor.fetchone()[0].split('.')) >= SQLITE_MIN_VERSION
+
+
+def run_statements(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def forwards(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        run_statements(schema_editor, POSTGRES_FORWARDS)
+    elif vendor == 'sqlite' and sqlite_has_trigram_fts5(schema_editor):
+        run_statements(schema_editor, SQLITE_FORWARDS)
+
+
+def backwards(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        run_statements(schema_editor, POSTGRES_BACKWARDS)
+    elif vendor == 'sqlite':
+        run_statements(schema_editor, SQLITE_BACKWARDS)
+
+
+class Migration(migrations.Migration):
+    """
+    Trigram search structures for users (see users/search.py).
+
+    Creating the pg_trgm extension needs a role allowed to do so (it is a
+    trusted extension from PostgreSQL 13). Without the FTS5 trigram tokenizer
+    in SQLite the migration is a no-op and search falls back to icontains.
+
+    Note that SQLite table rebuilds (Django's _remake_table) drop triggers, so a
+    later migration that rebuilds users_user must recreate the FTS triggers.
+    """
+
+    dependencies = [
+        ('users', '0003_username_prefix_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -20,6 +20,7 @@ class User(AbstractUser):
         default=Role.MEMBER,
     )
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     # Remove username from unique constraint and make email optional
     # username is already unique from AbstractUser
@@ -32,6 +33,16 @@ class User(AbstractUser):
     def __str__(self):
         return f"{self.username} ({self.role})"
     
+    def get_session_auth_hash(self):
+        """
+        Use the fingerprint stored by the user cache (users/backends.py) when
+        this instance came from it, instead of loading the deferred password.
+        """
+        cached = getattr(self, 'cached_session_auth_hash', None)
+        if cached is not None:
+            return cached
+        return super().get_session_auth_hash()
+    
     @property
     def is_admin(self):
         """Check if user has Admin role"""
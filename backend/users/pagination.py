@@ -1,21 +1,187 @@
+import hashlib
+import json
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator as DjangoPaginator
+from django.db import connections
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
+COUNT_MODES = ('exact', 'estimate', 'none')
+
+
+class CountedPaginator(DjangoPaginator):
+    """Django's Paginator, given the row count when the caller already has it"""
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            # Overrides the cached_property, so no COUNT(*) is run
+            self.count = count
+
+
+def estimate_count(queryset):
+    """
+    The planner's row estimate for ``queryset`` on PostgreSQL (reltuples
+    scaled by the filters' selectivity), or None on other databases.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def cached_count(queryset):
+    """
+    ``(count, exact)``: the count of ``queryset`` cached for
+    USER_PAGINATION_COUNT_CACHE_TIMEOUT seconds, exact only when just taken.
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+    key = 'users:count:' + hashlib.sha1(f'{queryset.db}|{sql}|{params!r}'.encode()).hexdigest()
+    count = cache.get(key)
+    if count is not None:
+        return count, False
+    count = queryset.count()
+    cache.set(key, count, getattr(settings, 'USER_PAGINATION_COUNT_CACHE_TIMEOUT', 60))
+    return count, True
+
 
 class UserPagination(PageNumberPagination):
-    """Pagination for user list endpoints."""
-    
+    """
+    Pagination for user list endpoints.
+
+    ``?count=`` (default ``USER_PAGINATION_COUNT``) picks how the total is found:
+
+    - ``exact``: the row count, taken from the list ETag's aggregate when the
+      view has run one (see ``get_known_count``), otherwise a COUNT(*).
+    - ``estimate``: the PostgreSQL planner's estimate, or an exact count when
+      that is below USER_PAGINATION_EXACT_COUNT_BELOW; on other databases a
+      count cached for USER_PAGINATION_COUNT_CACHE_TIMEOUT seconds.
+    - ``none``: no total; ``count`` and ``total_pages`` are null.
+
+    Outside ``exact`` the page is read with one extra row to tell whether
+    another follows, and ``?page=last`` is not supported. ``count_exact``
+    says whether ``count`` and ``total_pages`` can be relied on.
+    """
+
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 50
-    
+    count_query_param = 'count'
+
+    def get_count_mode(self, request):
+        mode = request.query_params.get(self.count_query_param, '').lower()
+        if mode in COUNT_MODES:
+            return mode
+        return getattr(settings, 'USER_PAGINATION_COUNT', 'exact')
+
+    def counts_rows(self, request):
+        """Whether this request's count mode needs every matching row counted"""
+        return self.get_count_mode(request) == 'exact'
+
+    def get_known_count(self, queryset, view):
+        """The row count from the ETag aggregate the view ran over this queryset, if any"""
+        values = getattr(view, 'etag_values', None)
+        if values is None or getattr(view, 'etag_queryset', None) is not queryset:
+            return None
+        return values.get('count')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.count_mode = self.get_count_mode(request)
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        if self.count_mode == 'exact':
+            return self.paginate_exact(queryset, page_size, view)
+
+        self.page_size = page_size
+        self.page_number = self.get_page_number_int(request)
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and self.page_number > 1:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=self.page_number, message='That page contains no results',
+            ))
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+
+        seen = offset + len(self.page)
+        if self.count_mode == 'none':
+            self.count, self.count_exact = None, False
+        elif not self.has_next:
+            # The last page: every row has been seen
+            self.count, self.count_exact = seen, True
+        else:
+            count, self.count_exact = self.get_estimated_count(queryset)
+            # Never less than the rows already read
+            self.count = max(count, seen + 1)
+        return self.page
+
+    def paginate_exact(self, queryset, page_size, view):
+        paginator = CountedPaginator(queryset, page_size, count=self.get_known_count(queryset, view))
+        page_number = self.get_page_number(self.request, paginator)
+        try:
+            page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        self.page_size = page_size
+        self.page_number = page.number
+        self.page = list(page)
+        self.has_next = page.has_next()
+        self.count, self.count_exact = paginator.count, True
+        return self.page
+
+    def get_page_number_int(self, request):
+        page_number = request.query_params.get(self.page_query_param) or 1
+        try:
+            number = int(page_number)
+        except (TypeError, ValueError):
+            number = 0
+        if number < 1:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message='That page number is not a positive integer',
+            ))
+        return number
+
+    def get_estimated_count(self, queryset):
+        """``(count, exact)`` for the ``estimate`` mode"""
+        estimate = estimate_count(queryset)
+        if estimate is None:
+            return cached_count(queryset)
+        if estimate < getattr(settings, 'USER_PAGINATION_EXACT_COUNT_BELOW', 10_000):
+            return queryset.count(), True
+        return estimate, False
+
+    def get_etag_values(self):
+        """ETag aggregates for the page just read, for views that skip the count"""
+        rows = '|'.join(f'{user.pk}:{user.updated_at}' for user in self.page)
+        return {
+            'count': self.count,
+            'count_exact': self.count_exact,
+            'has_next': self.has_next,
+            'page': hashlib.sha1(rows.encode()).hexdigest(),
+        }
+
     def get_paginated_response(self, data):
-        page_size = self.get_page_size(self.request)
+        total_pages = None
+        if self.count is not None:
+            total_pages = max(math.ceil(self.count / self.page_size), 1)
         return Response({
-            'count': self.page.paginator.count,
-            'current_page': self.page.number,
-            'total_pages': self.page.paginator.num_pages,
-            'page_size': page_size,
+            'count': self.count,
+            'count_exact': self.count_exact,
+            'current_page': self.page_number,
+            'total_pages': total_pages,
+            'page_size': self.page_size,
+            'has_next': self.has_next,
             'results': data,
         })
-
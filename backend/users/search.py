@@ -0,0 +1,179 @@
+"""
+Indexed ``?search=`` for the user directory.
+
+The stock ``SearchFilter`` turns every term into ``icontains`` over username
+and email, a leading-wildcard LIKE that reads the whole of users_user. These
+engines match the same way (each term must appear in the username or the
+email, case-insensitively) but answer from indexes, and annotate the rows
+with ``search_rank`` (higher is more relevant).
+
+The index structures are created by migration ``0004_user_search_indexes``:
+
+- PostgreSQL: pg_trgm GIN indexes on username and email; rows are ranked by
+  trigram word similarity to the terms.
+- SQLite: an external-content FTS5 table with the trigram tokenizer,
+  ``users_user_fts``, kept in sync with users_user by triggers; rows are
+  ranked by bm25.
+
+Trigrams cannot answer terms shorter than three characters, so those match
+as a username prefix instead, through the lowercase username index of
+migration ``0003_username_prefix_index`` (see users/choices.py).
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .choices import filter_username_prefix
+
+MIN_TRIGRAM_TERM = 3
+
+
+def split_terms(terms):
+    """``(trigram_terms, prefix_terms)``: terms long enough for the trigram index, and the rest"""
+    return (
+        [term for term in terms if len(term) >= MIN_TRIGRAM_TERM],
+        [term for term in terms if len(term) < MIN_TRIGRAM_TERM],
+    )
+
+
+class BaseUserSearchEngine:
+    """Interface for user search engines."""
+
+    vendor = None
+
+    def __init__(self):
+        self._available = {}
+
+    def is_available(self, queryset):
+        connection = connections[queryset.db]
+        if queryset.model is not get_user_model() or connection.vendor != self.vendor:
+            return False
+        if queryset.db not in self._available:
+            self._available[queryset.db] = self.has_index(connection)
+        return self._available[queryset.db]
+
+    def has_index(self, connection):
+        raise NotImplementedError
+
+    def search(self, queryset, terms):
+        trigram_terms, prefix_terms = split_terms(terms)
+        for term in prefix_terms:
+            queryset = filter_username_prefix(queryset, term)
+        if trigram_terms:
+            queryset = self.search_trigrams(queryset, trigram_terms)
+        return queryset
+
+    def search_trigrams(self, queryset, terms):
+        raise NotImplementedError
+
+
+class PostgresTrigramSearch(BaseUserSearchEngine):
+    """ILIKE over the pg_trgm GIN indexes, ranked by word similarity."""
+
+    vendor = 'postgresql'
+    index = 'users_user_username_trgm_idx'
+
+    def has_index(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1 FROM pg_indexes WHERE indexname = %s', [self.index])
+            return cursor.fetchone() is not None
+
+    @staticmethod
+    def like_pattern(term):
+        escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return f'%{escaped}%'
+
+    def search_trigrams(self, queryset, terms):
+        table = connections[queryset.db].ops.quote_name(queryset.model._meta.db_table)
+        for term in terms:
+            pattern = self.like_pattern(term)
+            queryset = queryset.filter(
+                RawSQL(f'({table}.username ILIKE %s OR {table}.email ILIKE %s)', [pattern, pattern],
+                       output_field=BooleanField())
+            )
+        similarity = (
+            f'GREATEST(word_similarity(%s, {table}.username), word_similarity(%s, {table}.email))'
+        )
+        return queryset.annotate(
+            search_rank=RawSQL(
+                ' + '.join([similarity] * len(terms)),
+                [param for term in terms for param in (term, term)],
+                output_field=FloatField(),
+            )
+        )
+
+
+class SQLiteTrigramSearch(BaseUserSearchEngine):
+    """Ranked search through the ``users_user_fts`` FTS5 trigram table."""
+
+    vendor = 'sqlite'
+    fts_table = 'users_user_fts'
+    # bm25 column weights for (username, email)
+    weights = (2.0, 1.0)
+
+    def has_index(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                [self.fts_table],
+            )
+            return cursor.fetchone() is not None
+
+    def build_query(self, terms):
+        # Each term is a quoted phrase, i.e. a substring; FTS5 operators in user input are text.
+        return ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+    def search_trigrams(self, queryset, terms):
+        query = self.build_query(terms)
+        table = connections[queryset.db].ops.quote_name(queryset.model._meta.db_table)
+        fts = self.fts_table
+        weights = ', '.join(str(weight) for weight in self.weights)
+        return queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s', [query])
+        ).annotate(
+            # bm25() is lower-is-better; negate it so every engine ranks descending.
+            search_rank=RawSQL(
+                f'SELECT -bm25({fts}, {weights}) FROM {fts} '
+                f'WHERE {fts} MATCH %s AND rowid = {table}.id',
+                [query],
+                output_field=FloatField(),
+            )
+        )
+
+
+ENGINES = {
+    'postgresql': PostgresTrigramSearch,
+    'sqlite': SQLiteTrigramSearch,
+}
+
+_engine_cache = {}
+
+
+def get_search_engine(queryset):
+    """
+    Return the engine configured by ``USER_SEARCH_BACKEND`` for the
+    queryset's database, or None to fall back to ``SearchFilter``.
+
+    ``USER_SEARCH_BACKEND`` is ``'auto'`` (pick by database vendor),
+    ``'basic'`` (always use icontains), or the dotted path of an engine class.
+    """
+    backend = getattr(settings, 'USER_SEARCH_BACKEND', 'auto')
+    if backend == 'basic':
+        return None
+
+    vendor = connections[queryset.db].vendor
+    key = (backend, vendor)
+    if key not in _engine_cache:
+        if backend == 'auto':
+            engine_class = ENGINES.get(vendor)
+        else:
+            engine_class = import_string(backend)
+        _engine_cache[key] = engine_class() if engine_class else None
+
+    engine = _engine_cache[key]
+    if engine is None or not engine.is_available(queryset):
+        return None
+    return engine
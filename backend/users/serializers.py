@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from core.serializers import TimedSerializerMixin
 from .models import User
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for User model"""
     
     password = serializers.CharField(write_only=True, required=False)
@@ -32,7 +33,7 @@ class UserSerializer(serializers.ModelSerializer):
         return instance
 
 
-class UserReadSerializer(serializers.ModelSerializer):
+class UserReadSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Read-only serializer for User (without password)"""
     
     class Meta:
@@ -41,7 +42,7 @@ class UserReadSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'username', 'email', 'role', 'is_active']
 
 
-class UserChoiceSerializer(serializers.ModelSerializer):
+class UserChoiceSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Lightweight serializer for user choices."""
     
     class Meta:
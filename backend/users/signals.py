@@ -0,0 +1,25 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .backends import invalidate_user
+from .choices import invalidate_choices
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Role, activation and password changes must reach the next request."""
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_choices_on_save(sender, instance, update_fields=None, **kwargs):
+    invalidate_choices(update_fields)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_user_choices_on_delete(sender, instance, **kwargs):
+    invalidate_choices()
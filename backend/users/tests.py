@@ -1,7 +1,17 @@
-from django.test import TestCase
+from unittest.mock import patch
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.core.cache import cache
+from django.db import connection
 from django.contrib.auth import get_user_model
-from rest_framework.test import APIClient
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
 from rest_framework import status
+from core.testing import QueryBudgetMixin
+from tasks.models import Task, TaskStatusCounter
+from . import backends
+from . import search as user_search
+from .views import AsyncUserViewSet, UserViewSet
 
 User = get_user_model()
 
@@ -247,3 +257,546 @@ class UserChoicesActionTests(TestCase):
         self.client.force_authenticate(user=self.admin_user)
         response = self.client.get('/api/users/choices/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    
+    def test_typeahead_matches_username_prefix(self):
+        """Test that ?q= returns active users by case-insensitive username prefix, in order"""
+        for username in ['Mallory', 'mark', 'zed']:
+            User.objects.create_user(username=username, password='testpass123')
+        User.objects.create_user(username='maxine', password='testpass123', is_active=False)
+        self.client.force_authenticate(user=self.manager_user)
+        
+        response = self.client.get('/api/users/choices/', {'q': 'MA'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([user['username'] for user in response.data], ['Mallory', 'manager', 'mark'])
+        self.assertNotIn('ETag', response)
+        
+        response = self.client.get('/api/users/choices/', {'q': 'mallory'})
+        self.assertEqual([user['username'] for user in response.data], ['Mallory'])
+        response = self.client.get('/api/users/choices/', {'q': 'nobody'})
+        self.assertEqual(response.data, [])
+    
+    @override_settings(USER_CHOICES_TYPEAHEAD_LIMIT=2)
+    def test_typeahead_is_limited(self):
+        """Test that ?q= returns at most USER_CHOICES_TYPEAHEAD_LIMIT users, an empty prefix included"""
+        self.client.force_authenticate(user=self.manager_user)
+        response = self.client.get('/api/users/choices/', {'q': ''})
+        self.assertEqual([user['username'] for user in response.data], ['admin', 'manager'])
+    
+    def test_unchanged_choices_return_304(self):
+        """Test that the full list carries an ETag and a matching If-None-Match returns 304"""
+        self.client.force_authenticate(user=self.manager_user)
+        etag = self.client.get('/api/users/choices/')['ETag']
+        response = self.client.get('/api/users/choices/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+@override_settings(USER_CHOICES_CACHE=True, AUTH_USER_CACHE=False)
+class CachedUserChoicesTests(TestCase):
+    """Tests for the cached /api/users/choices/ list (see users/choices.py)"""
+    
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.manager_user = User.objects.create_user(
+            username='manager',
+            password='testpass123',
+            role=User.Role.MANAGER,
+        )
+        self.member_user = User.objects.create_user(
+            username='member',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+        self.client.force_authenticate(user=self.manager_user)
+    
+    def usernames(self):
+        return [user['username'] for user in self.client.get('/api/users/choices/').data]
+    
+    def test_warm_list_and_304_run_no_queries(self):
+        """Test that a cached list, and a 304 for it, are served without touching the database"""
+        etag = self.client.get('/api/users/choices/')['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/users/choices/')
+            not_modified = self.client.get('/api/users/choices/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual([user['username'] for user in response.data], ['manager', 'member'])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+    
+    def test_user_writes_invalidate(self):
+        """Test that creating, editing, deactivating and deleting users refresh the list"""
+        self.assertEqual(self.usernames(), ['manager', 'member'])
+        user = User.objects.create_user(username='newbie', password='testpass123')
+        self.assertEqual(self.usernames(), ['manager', 'member', 'newbie'])
+        user.username = 'alice'
+        user.save()
+        self.assertEqual(self.usernames(), ['alice', 'manager', 'member'])
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+        self.assertEqual(self.usernames(), ['manager', 'member'])
+        self.member_user.delete()
+        self.assertEqual(self.usernames(), ['manager'])
+    
+    def test_login_does_not_invalidate(self):
+        """Test that saving only last_login, as every login does, keeps the cached list"""
+        etag = self.client.get('/api/users/choices/')['ETag']
+        self.assertTrue(APIClient().login(username='member', password='testpass123'))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/users/choices/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(queries), 0)
+    
+    def test_typeahead_is_not_cached(self):
+        """Test that ?q= always reads the database"""
+        self.client.get('/api/users/choices/', {'q': 'm'})
+        User.objects.filter(username='member').update(username='mike')
+        response = self.client.get('/api/users/choices/', {'q': 'm'})
+        self.assertEqual([user['username'] for user in response.data], ['manager', 'mike'])
+
+
+class UserSearchTests(TestCase):
+    """Tests for the indexed ?search= on the user list (see users/search.py)"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            password='testpass123',
+            role=User.Role.ADMIN,
+        )
+        for username, email in [
+            ('ann', 'ann@example.com'),
+            ('joanna', 'jo@corp.test'),
+            ('Annabel', 'bel@example.com'),
+            ('bob', 'robert.annis@corp.test'),
+        ]:
+            User.objects.create_user(username=username, email=email, password='testpass123')
+        self.client.force_authenticate(user=self.admin_user)
+    
+    def search(self, term, **params):
+        response = self.client.get('/api/users/', {'search': term, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [user['username'] for user in response.data['results']]
+    
+    def test_engine_available(self):
+        """Test that the test database has the trigram index the engine reads"""
+        self.assertIsNotNone(user_search.get_search_engine(User.objects.all()))
+    
+    def test_substring_of_username_or_email(self):
+        """Test that terms match anywhere in the username or email, case-insensitively"""
+        self.assertEqual(sorted(self.search('ANN')), ['Annabel', 'ann', 'bob', 'joanna'])
+        self.assertEqual(self.search('corp.test', ordering='username'), ['bob', 'joanna'])
+        self.assertEqual(self.search('nobody'), [])
+    
+    def test_every_term_must_match(self):
+        """Test that several terms narrow the results, as with SearchFilter"""
+        self.assertEqual(self.search('ann example', ordering='username'), ['Annabel', 'ann'])
+    
+    def test_short_terms_match_username_prefix(self):
+        """Test that terms under three characters match the start of the username"""
+        self.assertEqual(sorted(self.search('an')), ['Annabel', 'ann'])
+        self.assertEqual(self.search('jo ann'), ['joanna'])
+    
+    def test_ranked_by_relevance_unless_ordered(self):
+        """Test that the closest match comes first, and ?ordering= still applies"""
+        self.assertEqual(self.search('ann')[0], 'ann')
+        self.assertEqual(self.search('ann', ordering='-username'), ['joanna', 'bob', 'ann', 'Annabel'])
+    
+    def test_index_follows_writes(self):
+        """Test that renamed and deleted users are searched by their current values"""
+        user = User.objects.get(username='bob')
+        user.email = 'bob@example.com'
+        user.save()
+        self.assertEqual(sorted(self.search('ann')), ['Annabel', 'ann', 'joanna'])
+        User.objects.filter(username='joanna').delete()
+        self.assertEqual(sorted(self.search('ann')), ['Annabel', 'ann'])
+    
+    def test_like_wildcards_are_text(self):
+        """Test that % and _ in a term are not wildcards"""
+        self.assertEqual(self.search('a%n'), [])
+        self.assertEqual(self.search('o_a'), [])
+    
+    @override_settings(USER_SEARCH_BACKEND='basic')
+    def test_basic_backend(self):
+        """Test that the icontains fallback matches the same users"""
+        self.assertEqual(sorted(self.search('ANN')), ['Annabel', 'ann', 'bob', 'joanna'])
+
+
+class UserConditionalGetTests(TestCase):
+    """Tests for ETag / If-None-Match on user list and detail"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            password='testpass123',
+            role=User.Role.ADMIN,
+        )
+        self.member_user = User.objects.create_user(
+            username='member',
+            password='testpass123',
+            role=User.Role.MEMBER,
+        )
+        self.client.force_authenticate(user=self.admin_user)
+    
+    def test_unchanged_list_returns_304(self):
+        """Test that a matching If-None-Match returns 304 with no body"""
+        etag = self.client.get('/api/users/')['ETag']
+        response = self.client.get('/api/users/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+    
+    def test_update_changes_list_and_detail_etags(self):
+        """Test that editing a user through the API invalidates both ETags"""
+        url = f'/api/users/{self.member_user.id}/'
+        list_etag = self.client.get('/api/users/')['ETag']
+        detail_etag = self.client.get(url)['ETag']
+        
+        response = self.client.patch(url, {'role': User.Role.MANAGER}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        response = self.client.get('/api/users/', HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['role'], User.Role.MANAGER)
+
+
+class UserPaginationTests(TestCase):
+    """Tests for the exact, estimated and count-free user list totals (see users/pagination.py)"""
+    
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            password='testpass123',
+            role=User.Role.ADMIN,
+        )
+        for i in range(14):
+            User.objects.create_user(username=f'user{i:02}', password='testpass123')
+        self.client.force_authenticate(user=self.admin_user)
+    
+    def get(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/users/', {'page_size': 5, **params})
+        self.queries = queries
+        return response
+    
+    def test_exact_count_reuses_etag_aggregate(self):
+        """Test that exact totals come from the ETag aggregate, without a second COUNT"""
+        response = self.get(page=2)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 15)
+        self.assertTrue(response.data['count_exact'])
+        self.assertEqual(response.data['total_pages'], 3)
+        self.assertTrue(response.data['has_next'])
+        self.assertEqual(len(self.queries), 2)
+        self.assertEqual(self.get(page='last').data['current_page'], 3)
+    
+    def test_count_free_pages(self):
+        """Test that ?count=none reads the page plus one row and reports no total"""
+        response = self.get(count='none')
+        self.assertEqual(len(self.queries), 1)
+        self.assertIsNone(response.data['count'])
+        self.assertIsNone(response.data['total_pages'])
+        self.assertFalse(response.data['count_exact'])
+        self.assertTrue(response.data['has_next'])
+        self.assertEqual([user['username'] for user in response.data['results']],
+                         ['admin', 'user00', 'user01', 'user02', 'user03'])
+        
+        response = self.get(count='none', page=3)
+        self.assertFalse(response.data['has_next'])
+        self.assertEqual(response.data['current_page'], 3)
+        self.assertEqual(self.get(count='none', page=4).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.get(count='none', page='last').status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_estimate_uses_cached_count_without_planner(self):
+        """Test that ?count=estimate caches the count on databases without planner estimates"""
+        response = self.get(count='estimate')
+        self.assertEqual(response.data['count'], 15)
+        self.assertTrue(response.data['count_exact'])
+        
+        User.objects.create_user(username='user99', password='testpass123')
+        response = self.get(count='estimate')
+        self.assertEqual(len(self.queries), 1)
+        self.assertEqual(response.data['count'], 15)
+        self.assertFalse(response.data['count_exact'])
+        
+        # The last page has seen every row, so its count is exact regardless
+        response = self.get(count='estimate', page=4)
+        self.assertEqual(response.data['count'], 16)
+        self.assertTrue(response.data['count_exact'])
+    
+    @override_settings(USER_PAGINATION_EXACT_COUNT_BELOW=1000)
+    def test_estimate_uses_planner_rows(self):
+        """Test that large planner estimates are reported as inexact and small ones replaced by a count"""
+        with patch('users.pagination.estimate_count', return_value=250_000):
+            response = self.get(count='estimate')
+        self.assertEqual(response.data['count'], 250_000)
+        self.assertFalse(response.data['count_exact'])
+        self.assertEqual(response.data['total_pages'], 50_000)
+        
+        with patch('users.pagination.estimate_count', return_value=20):
+            response = self.get(count='estimate')
+        self.assertEqual(response.data['count'], 15)
+        self.assertTrue(response.data['count_exact'])
+        
+        # An estimate below the rows already read is raised to them
+        with patch('users.pagination.estimate_count', return_value=3):
+            response = self.get(count='estimate', page=2)
+        self.assertEqual(response.data['count'], 15)
+    
+    @override_settings(USER_PAGINATION_COUNT='none')
+    def test_default_mode_setting(self):
+        """Test that USER_PAGINATION_COUNT sets the default and unknown ?count= values fall back to it"""
+        self.assertIsNone(self.get().data['count'])
+        self.assertIsNone(self.get(count='bogus').data['count'])
+        self.assertEqual(self.get(count='exact').data['count'], 15)
+    
+    def test_count_free_etag(self):
+        """Test that count-free pages are tagged from their rows"""
+        etag = self.get(count='none')['ETag']
+        response = self.client.get('/api/users/', {'page_size': 5, 'count': 'none'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        user = User.objects.get(username='user01')
+        user.role = User.Role.MANAGER
+        user.save()
+        response = self.client.get('/api/users/', {'page_size': 5, 'count': 'none'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Later pages are unaffected
+        etag = self.get(count='none', page=3)['ETag']
+        self.assertEqual(self.get(count='none', page=3)['ETag'], etag)
+
+
+@override_settings(AUTH_USER_CACHE=True)
+class CachedUserBackendTests(TestCase):
+    """Tests for resolving the session user from the cache"""
+    
+    def setUp(self):
+        cache.clear()
+        backends._local_cache.clear()
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            password='testpass123',
+            role=User.Role.ADMIN,
+        )
+        self.assertTrue(self.client.login(username='admin', password='testpass123'))
+    
+    def _user_queries(self, path):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        return response, [q['sql'] for q in queries.captured_queries if 'FROM "users_user"' in q['sql']]
+    
+    def test_steady_state_needs_no_user_query(self):
+        """Test that only the first request loads the session user"""
+        response, first = self._user_queries('/api/auth/me/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(first), 1)
+        response, second = self._user_queries('/api/auth/me/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user']['username'], 'admin')
+        self.assertEqual(second, [])
+    
+    def test_shared_tier_is_used_after_local_expiry(self):
+        """Test that an empty local tier is refilled from the shared cache"""
+        self.client.get('/api/auth/me/')
+        backends._local_cache.clear()
+        response, queries = self._user_queries('/api/auth/me/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, [])
+    
+    def test_role_change_applies_to_next_request(self):
+        """Test that demoting a cached user takes effect immediately"""
+        self.assertEqual(self.client.get('/api/users/').status_code, status.HTTP_200_OK)
+        self.admin_user.role = User.Role.MEMBER
+        self.admin_user.save()
+        self.assertEqual(self.client.get('/api/users/').status_code, status.HTTP_403_FORBIDDEN)
+    
+    def test_deactivation_logs_user_out(self):
+        """Test that a deactivated cached user is no longer authenticated"""
+        self.client.get('/api/auth/me/')
+        self.admin_user.is_active = False
+        self.admin_user.save()
+        response = self.client.get('/api/auth/me/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_password_change_through_serializer_ends_session(self):
+        """Test that UserSerializer.update password changes invalidate the session"""
+        other = User.objects.create_user(username='other', password='testpass123', role=User.Role.ADMIN)
+        other_client = APIClient()
+        other_client.login(username='other', password='testpass123')
+        self.assertEqual(other_client.get('/api/auth/me/').status_code, status.HTTP_200_OK)
+        
+        response = self.client.patch(f'/api/users/{other.id}/', {'password': 'newpass456'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(other_client.get('/api/auth/me/').status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_cached_user_save_keeps_password(self):
+        """Test that saving a user resolved from the cache does not clear its password"""
+        self.client.get('/api/auth/me/')
+        user = backends.CachedModelBackend().get_user(self.admin_user.pk)
+        self.assertEqual(user.cached_session_auth_hash, self.admin_user.get_session_auth_hash())
+        user.email = 'admin@example.com'
+        user.save()
+        self.assertTrue(User.objects.get(pk=self.admin_user.pk).check_password('testpass123'))
+
+
+class AsyncUserViewSetTests(TestCase):
+    """Tests for the coroutine list/retrieve/choices handlers of AsyncUserViewSet"""
+    
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            password='testpass123',
+            role=User.Role.ADMIN,
+        )
+        self.manager_user = User.objects.create_user(
+            username='manager',
+            password='testpass123',
+            role=User.Role.MANAGER,
+        )
+        User.objects.create_user(username='gone', password='testpass123', is_active=False)
+    
+    def call(self, viewset, actions, path='/api/users/', data=None, user=None, **kwargs):
+        request = self.factory.get(path, data)
+        force_authenticate(request, user=user or self.admin_user)
+        action = getattr(viewset, actions['get'])
+        # As the router does, apply the @action's own options (permission_classes)
+        view = viewset.as_view(actions, **getattr(action, 'kwargs', {}))
+        if iscoroutinefunction(view):
+            response = async_to_sync(view)(request, **kwargs)
+        else:
+            response = view(request, **kwargs)
+        return response.render()
+    
+    def test_responses_match_sync_viewset(self):
+        """Test that list, retrieve and choices match UserViewSet"""
+        cases = [
+            ({'get': 'list'}, '/api/users/', {}, {}),
+            ({'get': 'list'}, '/api/users/', {'search': 'man', 'page_size': 1}, {}),
+            ({'get': 'retrieve'}, f'/api/users/{self.manager_user.pk}/', {}, {'pk': self.manager_user.pk}),
+            ({'get': 'retrieve'}, '/api/users/0/', {}, {'pk': 0}),
+            ({'get': 'choices'}, '/api/users/choices/', {}, {}),
+            ({'get': 'choices'}, '/api/users/choices/', {'q': 'MAN'}, {}),
+        ]
+        for actions, path, params, kwargs in cases:
+            with self.subTest(path=path, params=params):
+                sync = self.call(UserViewSet, actions, path, params, **kwargs)
+                async_ = self.call(AsyncUserViewSet, actions, path, params, **kwargs)
+                self.assertEqual(async_.status_code, sync.status_code)
+                self.assertEqual(async_.data, sync.data)
+                self.assertEqual(async_.get('ETag'), sync.get('ETag'))
+    
+    def test_permissions_apply(self):
+        """Test that managers get choices but not the admin-only list"""
+        response = self.call(AsyncUserViewSet, {'get': 'choices'}, '/api/users/choices/', user=self.manager_user)
+        self.assertEqual([user['username'] for user in response.data], ['admin', 'manager'])
+        response = self.call(AsyncUserViewSet, {'get': 'list'}, user=self.manager_user)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+    
+    @override_settings(USER_CHOICES_CACHE=True)
+    def test_choices_cache(self):
+        """Test that the async choices read and fill the same cache as the sync view"""
+        cache.clear()
+        etag = self.call(AsyncUserViewSet, {'get': 'choices'}, '/api/users/choices/')['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            sync = self.call(UserViewSet, {'get': 'choices'}, '/api/users/choices/')
+            async_ = self.call(AsyncUserViewSet, {'get': 'choices'}, '/api/users/choices/')
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(sync['ETag'], etag)
+        self.assertEqual(async_.data, sync.data)
+
+
+@override_settings(AUTH_USER_CACHE=False, USER_CHOICES_CACHE=False)
+class UserQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Query budgets for every user endpoint and role; counts must not grow with the data"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(username='admin', password='testpass123', role=User.Role.ADMIN)
+        self.manager_user = User.objects.create_user(username='manager', password='testpass123', role=User.Role.MANAGER)
+        self.member_user = User.objects.create_user(username='member', password='testpass123', role=User.Role.MEMBER)
+        self.seeded = 0
+    
+    def seed(self, count):
+        """Add ``count`` members, each with an assigned task"""
+        users = User.objects.bulk_create([
+            User(username=f'user{self.seeded + i}', email=f'user{self.seeded + i}@example.com', password='!')
+            for i in range(count)
+        ])
+        Task.objects.bulk_create([Task(title=f'Task for {user.username}', assignee=user) for user in users])
+        TaskStatusCounter.rebuild()
+        self.seeded += count
+    
+    def seeded_user(self):
+        return User.objects.filter(username__startswith='user').order_by('-id').first()
+    
+    def seeded_member(self):
+        """A member the update below promotes, so every request records the scope change"""
+        return User.objects.filter(username__startswith='user', role=User.Role.MEMBER).order_by('-id').first()
+    
+    def test_list_and_retrieve(self):
+        """Test the user list, search and retrieve as an admin"""
+        self.client.force_authenticate(user=self.admin_user)
+        # The paginator takes its count from the ETag aggregate
+        self.assertQueryBudget(2, lambda: self.client.get('/api/users/'), self.seed)
+        self.assertQueryBudget(2, lambda: self.client.get('/api/users/', {'search': 'user'}), self.seed)
+        self.assertQueryBudget(2, lambda: self.client.get('/api/users/', {'search': 'us'}), self.seed)
+        self.assertQueryBudget(1, lambda: self.client.get('/api/users/', {'count': 'none'}), self.seed)
+        self.assertQueryBudget(
+            2, lambda user: self.client.get(f'/api/users/{user.pk}/'), self.seed, setup=self.seeded_user,
+        )
+    
+    def test_writes(self):
+        """Test creating, updating and deleting users as an admin"""
+        self.client.force_authenticate(user=self.admin_user)
+        created = iter(range(1000))
+        self.assertQueryBudget(
+            4,
+            lambda: self.client.post('/api/users/', {
+                'username': f'new{next(created)}', 'password': 'testpass123', 'role': User.Role.MEMBER,
+            }, format='json'),
+            self.seed,
+        )
+        self.assertQueryBudget(
+            4, lambda user: self.client.patch(f'/api/users/{user.pk}/', {'role': User.Role.MANAGER}, format='json'),
+            self.seed, setup=self.seeded_member,
+        )
+        # The deleted user's tasks move to the unassigned counters
+        self.assertQueryBudget(
+            12, lambda user: self.client.delete(f'/api/users/{user.pk}/'), self.seed, setup=self.seeded_user,
+        )
+    
+    def test_choices(self):
+        """Test the assignee choices for managers and admins"""
+        for user in [self.manager_user, self.admin_user]:
+            with self.subTest(role=user.role):
+                self.client.force_authenticate(user=user)
+                self.assertQueryBudget(2, lambda: self.client.get('/api/users/choices/'), self.seed)
+                self.assertQueryBudget(1, lambda: self.client.get('/api/users/choices/', {'q': 'user1'}), self.seed)
+    
+    def test_forbidden_for_members(self):
+        """Test that refusing a member costs no queries"""
+        self.client.force_authenticate(user=self.member_user)
+        self.assertQueryBudget(
+            0, lambda: self.client.get('/api/users/'), self.seed, status_code=status.HTTP_403_FORBIDDEN,
+        )
+    
+    def test_async_list_and_choices(self):
+        """Test the async read views"""
+        factory = APIRequestFactory()
+    
+        def get(actions, path):
+            request = factory.get(path)
+            force_authenticate(request, user=self.admin_user)
+            action = getattr(AsyncUserViewSet, actions['get'])
+            response = async_to_sync(AsyncUserViewSet.as_view(actions, **getattr(action, 'kwargs', {})))(request)
+            return response.render()
+    
+        self.assertQueryBudget(2, lambda: get({'get': 'list'}, '/api/users/'), self.seed)
+        self.assertQueryBudget(2, lambda: get({'get': 'choices'}, '/api/users/choices/'), self.seed)
@@ -1,11 +1,12 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import UserViewSet
+from .views import AsyncUserViewSet, UserViewSet
 
 app_name = 'users'
 
 router = DefaultRouter()
-router.register(r'', UserViewSet, basename='user')
+router.register(r'', AsyncUserViewSet if settings.ASYNC_VIEWS else UserViewSet, basename='user')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,16 +1,21 @@
-from rest_framework import viewsets, status, filters
+from asgiref.sync import sync_to_async
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth import get_user_model
+from core.async_views import AsyncViewMixin
+from core.etags import ConditionalGetMixin
 from .serializers import UserSerializer, UserReadSerializer, UserChoiceSerializer
 from .permissions import IsAdmin, IsManagerOrAdmin
 from .pagination import UserPagination
+from .filters import UserOrderingFilter, UserSearchFilter
+from . import choices as user_choices
 
 User = get_user_model()
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for User CRUD operations.
     Only Admin users can access these endpoints.
@@ -18,7 +23,7 @@ class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     pagination_class = UserPagination
     permission_classes = [IsAuthenticated, IsAdmin]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [UserSearchFilter, UserOrderingFilter]
     search_fields = ['username', 'email']
     ordering_fields = ['username', 'role', 'is_active']
     ordering = ['username']
@@ -32,6 +37,26 @@ class UserViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         """List all users with pagination"""
         queryset = self.filter_queryset(self.get_queryset())
+        if self.skips_count(request):
+            return self.page_conditional_response(self.paginate_queryset(queryset))
+        return self.conditional_response(queryset, lambda: self.build_list_response(queryset))
+    
+    def skips_count(self, request):
+        """
+        Whether the requested count mode avoids reading every matching row
+        (see users/pagination.py). The ETag aggregate would read them all, so
+        those lists are tagged from the page instead.
+        """
+        return self.paginator is not None and not self.paginator.counts_rows(request)
+    
+    def page_conditional_response(self, page):
+        etag = self.current_etag = self.make_etag(self.paginator.get_etag_values())
+        if self.etag_matches(etag):
+            return self.not_modified_response(etag)
+        serializer = self.get_serializer(page, many=True)
+        return self.add_etag(self.get_paginated_response(serializer.data), etag)
+    
+    def build_list_response(self, queryset):
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -40,6 +65,13 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a single user"""
+        return self.conditional_response(
+            self.filter_lookup(self.filter_queryset(self.get_queryset())),
+            lambda: super(UserViewSet, self).retrieve(request, *args, **kwargs),
+        )
+    
     def create(self, request, *args, **kwargs):
         """Create a new user (Admin only)"""
         serializer = self.get_serializer(data=request.data)
@@ -72,7 +104,79 @@ class UserViewSet(viewsets.ModelViewSet):
         """
         Return a lightweight list of active users that can be assigned tasks.
         Accessible to Managers and Admins.
+        
+        The full list is cached and sent with an ETag (see users/choices.py).
+        ``?q=<prefix>`` instead returns the first USER_CHOICES_TYPEAHEAD_LIMIT
+        users whose username starts with the prefix, for typeaheads.
         """
-        queryset = User.objects.filter(is_active=True).order_by('username')
-        serializer = UserChoiceSerializer(queryset, many=True)
+        if 'q' in request.query_params:
+            users = user_choices.typeahead(self.get_choices_queryset(), request.query_params['q'])
+            return Response(UserChoiceSerializer(users, many=True).data)
+        
+        key, entry = user_choices.read_cached_choices()
+        if entry is not None:
+            return self.cached_choices_response(entry)
+        queryset = self.get_choices_queryset()
+        return self.conditional_response(queryset, lambda: self.build_choices_response(key, queryset))
+    
+    def get_choices_queryset(self):
+        return User.objects.filter(is_active=True).order_by('username')
+    
+    def build_choices_response(self, key, users):
+        data = UserChoiceSerializer(users, many=True).data
+        user_choices.write_cached_choices(key, {'etag': self.current_etag, 'data': data})
+        return Response(data)
+    
+    def cached_choices_response(self, entry):
+        if self.etag_matches(entry['etag']):
+            return self.not_modified_response(entry['etag'])
+        return self.add_etag(Response(entry['data']), entry['etag'])
+
+
+class AsyncUserViewSet(AsyncViewMixin, UserViewSet):
+    """UserViewSet with list, retrieve and choices served as coroutines (see core/async_views.py)."""
+    
+    async def list(self, request, *args, **kwargs):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        if self.skips_count(request):
+            return self.page_conditional_response(await self.apaginate_queryset(queryset))
+        return await self.aconditional_response(queryset, lambda: self.abuild_list_response(queryset))
+    
+    async def abuild_list_response(self, queryset):
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        serializer = self.get_serializer([user async for user in queryset], many=True)
+        return Response(serializer.data)
+    
+    async def retrieve(self, request, *args, **kwargs):
+        queryset = self.filter_lookup(await self.afilter_queryset(self.get_queryset()))
+        return await self.aconditional_response(queryset, lambda: self.abuild_retrieve_response(queryset))
+    
+    async def abuild_retrieve_response(self, queryset):
+        serializer = self.get_serializer(await self.aget_object(queryset))
         return Response(serializer.data)
+    
+    @action(
+        detail=False,
+        methods=['get'],
+        permission_classes=[IsAuthenticated, IsManagerOrAdmin],
+        url_path='choices',
+    )
+    async def choices(self, request):
+        if 'q' in request.query_params:
+            users = user_choices.typeahead(self.get_choices_queryset(), request.query_params['q'])
+            return Response(UserChoiceSerializer([user async for user in users], many=True).data)
+        
+        key, entry = await sync_to_async(user_choices.read_cached_choices)()
+        if entry is not None:
+            return self.cached_choices_response(entry)
+        queryset = self.get_choices_queryset()
+        return await self.aconditional_response(queryset, lambda: self.abuild_choices_response(key, queryset))
+    
+    async def abuild_choices_response(self, key, queryset):
+        data = UserChoiceSerializer([user async for user in queryset], many=True).data
+        await sync_to_async(user_choices.write_cached_choices)(key, {'etag': self.current_etag, 'data': data})
+        return Response(data)
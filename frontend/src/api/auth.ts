@@ -1,4 +1,4 @@
-import { apiClient, setCsrfTokenCache } from './client';
+import { apiClient, clearEtagCache, setCsrfTokenCache } from './client';
 import type { User } from './types';
 
 export type { User };
@@ -91,6 +91,8 @@ export const logout = async (): Promise<LogoutResponse> => {
   await getCsrfToken();
   
   const response = await apiClient.post<LogoutResponse>('/auth/logout/');
+  // Drop cached responses so the next user never sees them
+  clearEtagCache();
   return response.data;
 };
 
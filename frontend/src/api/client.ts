@@ -1,4 +1,4 @@
-import axios from 'axios';
+import axios, { type InternalAxiosRequestConfig } from 'axios';
 
 // In-memory CSRF token storage (fallback when cookie isn't available)
 let csrfTokenCache: string | null = null;
@@ -132,6 +132,55 @@ apiClient.interceptors.request.use(
   }
 );
 
+// Conditional GETs: remember the ETag and body of each GET response and send
+// the ETag back as If-None-Match, so unchanged lists come back as an empty 304
+const MAX_ETAG_ENTRIES = 100;
+const etagCache = new Map<string, { etag: string; data: unknown }>();
+
+const etagCacheKey = (config: InternalAxiosRequestConfig) => apiClient.getUri(config);
+
+export const clearEtagCache = () => {
+  etagCache.clear();
+};
+
+apiClient.interceptors.request.use((config) => {
+  if (config.method?.toUpperCase() !== 'GET') {
+    return config;
+  }
+  const cached = etagCache.get(etagCacheKey(config));
+  if (cached) {
+    config.headers['If-None-Match'] = cached.etag;
+    config.validateStatus = (status) => (status >= 200 && status < 300) || status === 304;
+  }
+  return config;
+});
+
+apiClient.interceptors.response.use((response) => {
+  if (response.config.method?.toUpperCase() !== 'GET') {
+    return response;
+  }
+  const key = etagCacheKey(response.config);
+  if (response.status === 304) {
+    const cached = etagCache.get(key);
+    if (cached) {
+      // Refresh LRU position and hand callers the body they already have
+      etagCache.delete(key);
+      etagCache.set(key, cached);
+      response.data = cached.data;
+    }
+    return response;
+  }
+  const etag = response.headers['etag'] as string | undefined;
+  if (etag) {
+    etagCache.delete(key);
+    etagCache.set(key, { etag, data: response.data });
+    if (etagCache.size > MAX_ETAG_ENTRIES) {
+      etagCache.delete(etagCache.keys().next().value as string);
+    }
+  }
+  return response;
+});
+
 // Handle 401 responses globally (unauthorized) and CSRF errors
 apiClient.interceptors.response.use(
   (response) => response,
@@ -0,0 +1,63 @@
+import { useEffect } from 'react';
+import { useQueryClient, type QueryClient } from '@tanstack/react-query';
+import { apiClient } from './client';
+import type { Task } from './types';
+
+type TaskEventType = 'created' | 'updated' | 'deleted';
+
+/**
+ * Apply one task event to the cached task queries instead of refetching them.
+ * Lists whose filters or ordering a change could affect are marked stale.
+ */
+export const applyTaskEvent = (queryClient: QueryClient, type: TaskEventType, task: Partial<Task> & { id: number }) => {
+  if (type === 'deleted') {
+    queryClient.removeQueries({ queryKey: ['task', task.id] });
+    queryClient.setQueriesData<Task[]>({ queryKey: ['tasks'] }, (tasks) =>
+      Array.isArray(tasks) ? tasks.filter((item) => item.id !== task.id) : tasks
+    );
+  } else if (type === 'updated') {
+    queryClient.setQueryData<Task>(['task', task.id], task as Task);
+    queryClient.setQueriesData<Task[]>({ queryKey: ['tasks'] }, (tasks) =>
+      Array.isArray(tasks) ? tasks.map((item) => (item.id === task.id ? (task as Task) : item)) : tasks
+    );
+    queryClient.invalidateQueries({ queryKey: ['tasks'], refetchType: 'none' });
+  } else {
+    // Where a new task belongs depends on each list's filters and ordering
+    queryClient.invalidateQueries({ queryKey: ['tasks'] });
+  }
+  queryClient.invalidateQueries({ queryKey: ['tasks', 'stats'] });
+};
+
+/**
+ * Keep task queries current from the server's event stream (GET /tasks/events/).
+ * The browser reconnects on its own and resumes from the last event it saw;
+ * a `reset` event means events were missed, so everything is refetched.
+ */
+export const useTaskEvents = (enabled = true) => {
+  const queryClient = useQueryClient();
+
+  useEffect(() => {
+    if (!enabled || typeof EventSource === 'undefined') {
+      return;
+    }
+    const source = new EventSource(`${apiClient.defaults.baseURL}/tasks/events/`, { withCredentials: true });
+    const listen = (type: TaskEventType) => (event: MessageEvent) => {
+      applyTaskEvent(queryClient, type, JSON.parse(event.data));
+    };
+
+    source.addEventListener('created', listen('created'));
+    source.addEventListener('updated', listen('updated'));
+    source.addEventListener('deleted', listen('deleted'));
+    source.addEventListener('reset', () => {
+      queryClient.invalidateQueries({ queryKey: ['tasks'] });
+      queryClient.invalidateQueries({ queryKey: ['task'] });
+    });
+    source.onerror = () => {
+      // The stream is disabled (404) or the session ended: stop retrying
+      if (source.readyState === EventSource.CLOSED) {
+        source.close();
+      }
+    };
+    return () => source.close();
+  }, [enabled, queryClient]);
+};
@@ -77,5 +77,24 @@ describe('tasks api client', () => {
     expect(result.id).toBe(99);
     expect(result.title).toBe(payload.title);
   });
+
+  it('revalidates with If-None-Match and reuses the body on 304', async () => {
+    const seen: (string | null)[] = [];
+    server.use(
+      http.get('*/tasks/', ({ request }) => {
+        const ifNoneMatch = request.headers.get('If-None-Match');
+        seen.push(ifNoneMatch);
+        if (ifNoneMatch === '"v1"') {
+          return new HttpResponse(null, { status: 304, headers: { ETag: '"v1"' } });
+        }
+        return HttpResponse.json(mockTasks, { headers: { ETag: '"v1"' } });
+      }),
+    );
+
+    const first = await getTasks({ status: 'In Progress' });
+    const second = await getTasks({ status: 'In Progress' });
+    expect(seen).toEqual([null, '"v1"']);
+    expect(second).toEqual(first);
+  });
 });
 
@@ -1,13 +1,23 @@
 import { apiClient } from './client';
-import type { Task, TaskCreateRequest, TaskUpdateRequest, TaskListParams } from './types';
+import type { CursorPage, Task, TaskChanges, TaskCreateRequest, TaskUpdateRequest, TaskListParams, TaskStats } from './types';
 
-export type { Task, TaskCreateRequest, TaskUpdateRequest, TaskListParams };
+export type { CursorPage, Task, TaskChanges, TaskCreateRequest, TaskUpdateRequest, TaskListParams, TaskStats };
 
 /**
- * Get list of tasks with optional filtering
+ * Get list of tasks with optional filtering.
+ * Uses the legacy unpaginated shape until the task table moves to cursor pages.
  */
 export const getTasks = async (params?: TaskListParams): Promise<Task[]> => {
-  const response = await apiClient.get<Task[]>('/tasks/', { params });
+  const response = await apiClient.get<Task[]>('/tasks/', { params: { ...params, paginate: false } });
+  return response.data;
+};
+
+/**
+ * Get one cursor page of tasks. Pass the `cursor` from a previous page's
+ * `next`/`previous` link to move through the list.
+ */
+export const getTaskPage = async (params?: TaskListParams): Promise<CursorPage<Task>> => {
+  const response = await apiClient.get<CursorPage<Task>>('/tasks/', { params });
   return response.data;
 };
 
@@ -19,6 +29,23 @@ export const getTask = async (id: number): Promise<Task> => {
   return response.data;
 };
 
+/**
+ * Get dashboard statistics (counts by status, overdue, workload per assignee)
+ */
+export const getTaskStats = async (): Promise<TaskStats> => {
+  const response = await apiClient.get<TaskStats>('/tasks/stats/');
+  return response.data;
+};
+
+/**
+ * Get tasks changed and ids of tasks removed since a sync token. Without a
+ * token (or when `reset` is true) reload the list, then sync from `token`.
+ */
+export const getTaskChanges = async (since?: string): Promise<TaskChanges> => {
+  const response = await apiClient.get<TaskChanges>('/tasks/changes/', { params: since ? { since } : undefined });
+  return response.data;
+};
+
 /**
  * Create a new task
  */
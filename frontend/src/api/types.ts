@@ -12,6 +12,7 @@ export interface Task {
   description: string;
   status: 'Todo' | 'In Progress' | 'Done';
   deadline: string | null;
+  is_overdue?: boolean;
   assignee: number | null;
   assignee_username?: string;
   assignee_email?: string;
@@ -33,14 +34,53 @@ export interface TaskUpdateRequest extends Partial<TaskCreateRequest> {}
 export interface TaskListParams {
   status?: 'Todo' | 'In Progress' | 'Done';
   assignee?: number;
+  overdue?: boolean;
+  /** Also list Done tasks moved to the archive */
+  include_archived?: boolean;
   search?: string;
   ordering?: string;
+  cursor?: string;
+  page_size?: number;
+}
+
+export interface CursorPage<T> {
+  next: string | null;
+  previous: string | null;
+  page_size: number;
+  results: T[];
 }
 
 export interface PaginatedResponse<T> {
-  count: number;
+  /** Null with ?count=none; an estimate when count_exact is false */
+  count: number | null;
+  count_exact: boolean;
   current_page: number;
-  total_pages: number;
+  total_pages: number | null;
   page_size: number;
+  has_next: boolean;
   results: T[];
 }
+
+export type TaskStatusCounts = Record<Task['status'], number>;
+
+export interface TaskWorkload {
+  assignee: number | null;
+  assignee_username: string | null;
+  total: number;
+  by_status: TaskStatusCounts;
+}
+
+export interface TaskStats {
+  total: number;
+  by_status: TaskStatusCounts;
+  overdue: number;
+  by_assignee: TaskWorkload[];
+}
+
+export interface TaskChanges {
+  token: string;
+  reset: boolean;
+  has_more: boolean;
+  upserts: Task[];
+  removals: number[];
+}
@@ -18,6 +18,8 @@ export interface GetUsersParams {
   page_size?: number;
   search?: string;
   ordering?: string;
+  /** How the total is found: exact, estimate (planner estimate or cached count) or none */
+  count?: 'exact' | 'estimate' | 'none';
 }
 
 export type UserChoice = Pick<User, 'id' | 'username' | 'role' | 'is_active'>;
@@ -68,3 +70,12 @@ export const getUserChoices = async (): Promise<UserChoice[]> => {
   const response = await apiClient.get<UserChoice[]>('/users/choices/');
   return response.data;
 };
+
+/**
+ * Up to USER_CHOICES_TYPEAHEAD_LIMIT active users whose username starts with `q`
+ * (Admin/Manager)
+ */
+export const searchUserChoices = async (q: string): Promise<UserChoice[]> => {
+  const response = await apiClient.get<UserChoice[]>('/users/choices/', { params: { q } });
+  return response.data;
+};
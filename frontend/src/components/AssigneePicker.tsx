@@ -0,0 +1,73 @@
+import { useState } from 'react';
+import type { ReactNode } from 'react';
+import { useQuery } from '@tanstack/react-query';
+import { searchUserChoices } from '../api/users';
+import { useDebouncedValue } from '../hooks/useDebouncedValue';
+import type { UserChoice } from '../api/users';
+import { Input } from './ui/input';
+import { Select } from './ui/select';
+
+interface AssigneePickerProps {
+  id?: string;
+  value: string;
+  onChange: (value: string) => void;
+  /** Options listed before the matching users, e.g. "Unassigned" */
+  children?: ReactNode;
+  /** The currently selected user, kept as an option when it does not match the search */
+  selected?: Pick<UserChoice, 'id' | 'username'> | null;
+  enabled?: boolean;
+}
+
+/**
+ * Assignee select backed by the /users/choices/?q= typeahead, so only a page of
+ * matching users is fetched instead of every user in the organisation.
+ */
+export function AssigneePicker({ id, value, onChange, children, selected, enabled = true }: AssigneePickerProps) {
+  const [search, setSearch] = useState('');
+  // The user picked from an earlier search, kept as an option once later searches no longer match it
+  const [picked, setPicked] = useState<UserChoice | null>(null);
+  const query = useDebouncedValue(search.trim());
+
+  const { data: matches = [] } = useQuery<UserChoice[]>({
+    queryKey: ['user-choices', query],
+    queryFn: () => searchUserChoices(query),
+    enabled,
+    staleTime: 60 * 1000,
+    placeholderData: (previousData) => previousData,
+  });
+
+  const isListed = (userId: number) => matches.some((user) => user.id === userId);
+  const showPicked = picked && String(picked.id) === value && !isListed(picked.id);
+  const showSelected = selected && !isListed(selected.id) && !(showPicked && picked?.id === selected.id);
+
+  const handleChange = (next: string) => {
+    setPicked(matches.find((user) => String(user.id) === next) ?? null);
+    onChange(next);
+  };
+
+  return (
+    <div className="flex gap-2">
+      <Input
+        aria-label="Search users"
+        placeholder="Search users..."
+        value={search}
+        onChange={(e) => setSearch(e.target.value)}
+        disabled={!enabled}
+      />
+      <Select id={id} value={value} onChange={(e) => handleChange(e.target.value)} disabled={!enabled}>
+        {children}
+        {showSelected && <option value={selected.id}>{selected.username}</option>}
+        {showPicked && (
+          <option value={picked.id}>
+            {picked.username} ({picked.role})
+          </option>
+        )}
+        {matches.map((user) => (
+          <option key={user.id} value={user.id}>
+            {user.username} ({user.role})
+          </option>
+        ))}
+      </Select>
+    </div>
+  );
+}
@@ -1,7 +1,6 @@
 import { useState } from 'react';
-import { useQuery } from '@tanstack/react-query';
 import type { Task, TaskCreateRequest, TaskUpdateRequest } from '../api/types';
-import { getUserChoices } from '../api/users';
+import { AssigneePicker } from './AssigneePicker';
 import { Button } from './ui/button';
 import { Input } from './ui/input';
 import { Label } from './ui/label';
@@ -25,13 +24,6 @@ export function TaskForm({ task, onSubmit, onCancel, isLoading, userRole }: Task
   );
   const [assignee, setAssignee] = useState<string>(task?.assignee?.toString() || '');
 
-  const { data: userChoices = [] } = useQuery({
-    queryKey: ['user-choices'],
-    queryFn: getUserChoices,
-    enabled: userRole === 'Admin' || userRole === 'Manager', // Only fetch for Admin/Manager
-    staleTime: 5 * 60 * 1000,
-  });
-
   const handleSubmit = (e: React.FormEvent) => {
     e.preventDefault();
     onSubmit({
@@ -83,18 +75,18 @@ export function TaskForm({ task, onSubmit, onCancel, isLoading, userRole }: Task
       {(userRole === 'Admin' || userRole === 'Manager') && (
         <div className="space-y-2">
           <Label htmlFor="assignee">Assignee</Label>
-          <Select
+          <AssigneePicker
             id="assignee"
             value={assignee}
-            onChange={(e) => setAssignee(e.target.value)}
+            onChange={setAssignee}
+            selected={
+              task?.assignee && task.assignee_username
+                ? { id: task.assignee, username: task.assignee_username }
+                : null
+            }
           >
             <option value="">Unassigned</option>
-            {userChoices.map((user) => (
-              <option key={user.id} value={user.id}>
-                {user.username} ({user.role})
-              </option>
-            ))}
-          </Select>
+          </AssigneePicker>
         </div>
       )}
 
@@ -1,5 +1,6 @@
 import { useQuery } from '@tanstack/react-query';
 import { authMe } from '../api/auth';
+import { getTaskStats } from '../api/tasks';
 import { Header } from '../components/Header';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
 
@@ -9,6 +10,12 @@ export function Dashboard() {
     queryFn: authMe,
   });
 
+  const { data: stats, isLoading: statsLoading } = useQuery({
+    queryKey: ['tasks', 'stats'],
+    queryFn: getTaskStats,
+    enabled: !!authData?.user,
+  });
+
   if (isLoading) {
     return (
       <div className="min-h-screen">
@@ -89,12 +96,54 @@ export function Dashboard() {
                 <CardDescription>Task overview</CardDescription>
               </CardHeader>
               <CardContent>
-                <p className="text-muted-foreground text-sm">
-                  Task statistics will appear here once tasks are implemented.
-                </p>
+                {statsLoading || !stats ? (
+                  <p className="text-muted-foreground text-sm">Loading statistics...</p>
+                ) : (
+                  <div className="space-y-3">
+                    <div className="flex items-baseline justify-between">
+                      <p className="text-sm font-medium text-muted-foreground">Total</p>
+                      <p className="text-2xl font-bold">{stats.total}</p>
+                    </div>
+                    {Object.entries(stats.by_status).map(([status, count]) => (
+                      <div key={status} className="flex items-baseline justify-between">
+                        <p className="text-sm text-muted-foreground">{status}</p>
+                        <p className="text-base font-semibold">{count}</p>
+                      </div>
+                    ))}
+                    <div className="flex items-baseline justify-between">
+                      <p className="text-sm text-muted-foreground">Overdue</p>
+                      <p className={`text-base font-semibold ${stats.overdue ? 'text-red-600 dark:text-red-400' : ''}`}>
+                        {stats.overdue}
+                      </p>
+                    </div>
+                  </div>
+                )}
               </CardContent>
             </Card>
 
+            {user.role !== 'Member' && stats && (
+              <Card>
+                <CardHeader>
+                  <CardTitle>Workload</CardTitle>
+                  <CardDescription>Tasks per assignee</CardDescription>
+                </CardHeader>
+                <CardContent className="space-y-2">
+                  {stats.by_assignee.length === 0 ? (
+                    <p className="text-muted-foreground text-sm">No tasks yet.</p>
+                  ) : (
+                    stats.by_assignee.map((entry) => (
+                      <div key={entry.assignee ?? 'unassigned'} className="flex items-baseline justify-between">
+                        <p className="text-sm">{entry.assignee_username ?? 'Unassigned'}</p>
+                        <p className="text-sm text-muted-foreground">
+                          {entry.total} ({entry.by_status['Done']} done)
+                        </p>
+                      </div>
+                    ))
+                  )}
+                </CardContent>
+              </Card>
+            )}
+
             <Card>
               <CardHeader>
                 <CardTitle>Recent Activity</CardTitle>
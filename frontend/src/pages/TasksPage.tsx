@@ -3,6 +3,7 @@ import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { Link } from '@tanstack/react-router';
 import { Header } from '../components/Header';
 import { getTasks, createTask, updateTask, deleteTask } from '../api/tasks';
+import { useTaskEvents } from '../api/taskEvents';
 import type { Task, TaskCreateRequest, TaskUpdateRequest } from '../api/types';
 import { authMe } from '../api/auth';
 import { Button } from '../components/ui/button';
@@ -14,8 +15,7 @@ import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogDescription, Di
 import { TaskForm } from '../components/TaskForm';
 import { Plus, Search, Edit2, Trash2 } from 'lucide-react';
 import { format } from 'date-fns';
-import { getUserChoices } from '../api/users';
-import type { UserChoice } from '../api/users';
+import { AssigneePicker } from '../components/AssigneePicker';
 
 export function TasksPage() {
   const queryClient = useQueryClient();
@@ -31,13 +31,7 @@ export function TasksPage() {
   });
 
   const user = authData?.user;
-
-  const { data: userChoices = [] } = useQuery<UserChoice[]>({
-    queryKey: ['user-choices'],
-    queryFn: getUserChoices,
-    enabled: user?.role === 'Admin' || user?.role === 'Manager',
-    staleTime: 5 * 60 * 1000,
-  });
+  useTaskEvents(!!user);
 
   const assigneeParam =
     assigneeFilter === 'mine'
@@ -118,8 +112,6 @@ export function TasksPage() {
     return null;
   }
 
-  const assigneeOptions =
-    user.role === 'Admin' || user.role === 'Manager' ? userChoices : [];
   const totalTasks = tasks.length;
 
   return (
@@ -171,25 +163,16 @@ export function TasksPage() {
                     <option value="In Progress">In Progress</option>
                     <option value="Done">Done</option>
                   </Select>
-                  <Select
-                    value={assigneeFilter}
-                    onChange={(e) => setAssigneeFilter(e.target.value)}
-                    disabled={
-                      user.role !== 'Member' && assigneeOptions.length === 0
-                    }
-                  >
-                    <option value="">
-                      {user.role === 'Member' ? 'Assigned to me' : 'All Assignees'}
-                    </option>
-                    {user.role !== 'Member' && (
+                  {user.role === 'Member' ? (
+                    <Select value={assigneeFilter} onChange={(e) => setAssigneeFilter(e.target.value)}>
+                      <option value="">Assigned to me</option>
+                    </Select>
+                  ) : (
+                    <AssigneePicker value={assigneeFilter} onChange={setAssigneeFilter}>
+                      <option value="">All Assignees</option>
                       <option value="mine">My Tasks</option>
-                    )}
-                    {assigneeOptions.map((assignee) => (
-                      <option key={assignee.id} value={assignee.id}>
-                        {assignee.username} ({assignee.role})
-                      </option>
-                    ))}
-                  </Select>
+                    </AssigneePicker>
+                  )}
                 </div>
               </div>
             </CardContent>
@@ -12,12 +12,14 @@ import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from '.
 import { Input } from '../components/ui/input';
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogDescription, DialogClose } from '../components/ui/dialog';
 import { UserForm } from '../components/UserForm';
+import { useDebouncedValue } from '../hooks/useDebouncedValue';
 import { Plus, Search, Edit2, Trash2, Shield, User as UserIcon, Users } from 'lucide-react';
 
 export function UsersPage() {
   const navigate = useNavigate();
   const queryClient = useQueryClient();
   const [searchQuery, setSearchQuery] = useState('');
+  const search = useDebouncedValue(searchQuery.trim());
   const [page, setPage] = useState(1);
   const pageSize = 10;
   const [isCreateDialogOpen, setIsCreateDialogOpen] = useState(false);
@@ -37,12 +39,14 @@ export function UsersPage() {
   }
 
   const { data: usersResponse, isLoading } = useQuery({
-    queryKey: ['users', page, searchQuery],
+    queryKey: ['users', page, search],
     queryFn: () =>
       getUsers({
         page,
         page_size: pageSize,
-        search: searchQuery || undefined,
+        search: search || undefined,
+        // Large directories report an estimated total rather than counting every match
+        count: 'estimate',
       }),
     enabled: user?.role === 'Admin', // Only fetch if Admin
     placeholderData: (previousData) => previousData,
@@ -96,6 +100,8 @@ export function UsersPage() {
   const users = usersResponse?.results ?? [];
   const totalUsers = usersResponse?.count ?? 0;
   const totalPages = usersResponse?.total_pages ?? 1;
+  const countPrefix = usersResponse && !usersResponse.count_exact ? 'About ' : '';
+  const hasNext = usersResponse?.has_next ?? false;
 
   const getRoleBadgeColor = (role: User['role']) => {
     switch (role) {
@@ -166,7 +172,7 @@ export function UsersPage() {
             <CardHeader>
               <CardTitle>Users</CardTitle>
               <CardDescription>
-                {totalUsers} user{totalUsers !== 1 ? 's' : ''} found
+                {countPrefix}{totalUsers} user{totalUsers !== 1 ? 's' : ''} found
               </CardDescription>
             </CardHeader>
             <CardContent>
@@ -235,7 +241,7 @@ export function UsersPage() {
 
                   <div className="flex flex-col gap-3 sm:flex-row sm:items-center sm:justify-between">
                     <p className="text-sm text-muted-foreground">
-                      Page {page} of {totalPages} • Showing up to {pageSize} users per page
+                      Page {page} of {countPrefix.toLowerCase()}{totalPages} • Showing up to {pageSize} users per page
                     </p>
                     <div className="flex gap-2">
                       <Button
@@ -249,8 +255,8 @@ export function UsersPage() {
                       <Button
                         variant="outline"
                         size="sm"
-                        disabled={page >= totalPages || isLoading}
-                        onClick={() => setPage((prev) => Math.min(prev + 1, totalPages))}
+                        disabled={!hasNext || isLoading}
+                        onClick={() => setPage((prev) => prev + 1)}
                       >
                         Next
                       </Button>